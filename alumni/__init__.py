@@ -0,0 +1,5 @@
+"""Alumni Management System.
+
+The package imports nothing on its own; subsystems such as mail, import/export
+and reports are loaded by the code paths that need them.
+"""
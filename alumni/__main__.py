@@ -0,0 +1,8 @@
+import sys
+
+if len(sys.argv) > 1:
+    from alumni.cli import main
+    sys.exit(main())
+else:
+    from alumni.menus import run
+    run()
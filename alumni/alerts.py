@@ -0,0 +1,398 @@
+"""Job alert subscriptions and the digest batch job.
+
+Alumni and students save search terms or skills. A digest run reads the
+active postings of the last DIGEST_LOOKBACK_DAYS days, indexes their words
+once, and matches every distinct saved term against that index. It never runs
+a query per subscriber. Each subscriber with matches gets one email listing
+the postings they have not been sent yet.
+
+Deliveries are recorded per subscriber and posting in
+``job_alert_deliveries`` once the server accepts the email, in short
+transactions while the run is still sending. A subscriber whose
+email failed gets the same postings on the next run, and a posting committed
+after a later one is still picked up, since no job_id watermark is involved.
+
+A posting matches a saved term when every word of the term starts a word of
+the posting's title or description, so "dev" matches "Developer". Skill alerts
+are stored under the canonical skill name and also match its aliases, so a
+"JS" alert matches "JavaScript" postings and a "javascript" alert matches "JS".
+"""
+import bisect
+import html
+import logging
+import re
+import secrets
+import threading
+import time
+from datetime import datetime
+
+from alumni.cache import normalize_query
+from alumni.db import database_connection, run_in_transaction
+from alumni.jobs import ACTIVE_JOB_CONDITION
+from alumni.skills import canonical_skill_name, skill_aliases
+from alumni.validation import validate_email
+
+ALERT_KINDS = ("search", "skill")
+DIGEST_LOCK_NAME = "alumni_job_alert_digest"
+# Postings listed in one digest; the rest are summarized by a count
+DIGEST_MAX_POSTINGS = 25
+# Postings older than this are no longer alerted, and their deliveries are pruned
+DIGEST_LOOKBACK_DAYS = 7
+DELIVERY_INSERT_BATCH = 5000
+# Accepted digests recorded per transaction while a run is still sending
+DELIVERY_RECORD_BATCH = 500
+VERIFICATION_CODE_DIGITS = 6
+
+_WORD = re.compile(r"\w+")
+
+def subscribe_job_alert(email, term, kind="search"):
+    """Save a search term or skill for ``email``; returns True if it was added."""
+    if kind not in ALERT_KINDS:
+        raise ValueError(f"Unknown alert kind: {kind}")
+    term = canonical_skill_name(term) if kind == "skill" else normalize_query(term)
+    if not validate_email(email) or not term:
+        print("A valid email and a non-empty term are required.")
+        return False
+    try:
+        with database_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("""
+                INSERT IGNORE INTO job_alert_subscriptions (email, kind, term, created_at)
+                VALUES (%s, %s, %s, NOW())
+            """, (email, kind, term))
+            connection.commit()
+            added = cursor.rowcount > 0
+            logging.info("Job alert %s '%s' for %s %s", kind, term, email, "added" if added else "already exists")
+            print("Job alert saved." if added else "You already have this job alert.")
+            return added
+    except Exception as e:
+        logging.error("Failed to save job alert: %s", e)
+        print("An error occurred while saving the job alert.")
+        return False
+
+def unsubscribe_job_alert(email, subscription_id):
+    """Remove one of the job alerts of ``email``."""
+    try:
+        with database_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("DELETE FROM job_alert_subscriptions WHERE subscription_id = %s AND email = %s",
+                           (subscription_id, email))
+            connection.commit()
+            if cursor.rowcount:
+                print("Job alert removed.")
+            else:
+                print("Job alert not found.")
+            return cursor.rowcount > 0
+    except Exception as e:
+        logging.error("Failed to remove job alert: %s", e)
+        print("An error occurred while removing the job alert.")
+        return False
+
+def list_job_alerts(email):
+    """Return the (subscription_id, kind, term) job alerts of ``email``."""
+    try:
+        with database_connection(read_only=True) as connection:
+            cursor = connection.cursor()
+            cursor.execute("""
+                SELECT subscription_id, kind, term FROM job_alert_subscriptions
+                WHERE email = %s ORDER BY subscription_id
+            """, (email,))
+            return cursor.fetchall()
+    except Exception as e:
+        logging.error("Failed to list job alerts: %s", e)
+        return []
+
+def send_alert_verification_code(email):
+    """
+    Email a one-time code proving that the caller reads ``email``.
+
+    :return: The code, or None if it could not be sent.
+    """
+    from alumni.mail import send_templated_email
+
+    if not validate_email(email):
+        print("Please enter a valid email address.")
+        return None
+    code = "".join(secrets.choice("0123456789") for _ in range(VERIFICATION_CODE_DIGITS))
+    if not send_templated_email("alert_verification", email, {"code": code}):
+        logging.error("Failed to send a job alert verification code to %s", email)
+        print("The verification code could not be sent. Please try again later.")
+        return None
+    logging.info("Job alert verification code sent to %s", email)
+    return code
+
+def skill_spellings(aliases):
+    """Map each canonical skill name to every spelling that stands for it, itself included."""
+    spellings = {}
+    for alias, canonical in aliases.items():
+        spellings.setdefault(canonical, {canonical}).add(alias)
+    return spellings
+
+class PostingIndex:
+    """Inverted index from the words of job postings to their IDs."""
+
+    def __init__(self, postings):
+        """:param postings: Rows whose first three columns are job_id, title and description."""
+        self._postings = {}
+        for row in postings:
+            text = normalize_query(f"{row[1]} {row[2] or ''}")
+            for word in set(_WORD.findall(text)):
+                self._postings.setdefault(word, []).append(row[0])
+        self._words = sorted(self._postings)
+        self._prefix_matches = {}
+
+    def _with_prefix(self, prefix):
+        """Return the IDs of postings with a word starting with ``prefix``."""
+        matches = self._prefix_matches.get(prefix)
+        if matches is None:
+            matches = set()
+            start = bisect.bisect_left(self._words, prefix)
+            for word in self._words[start:]:
+                if not word.startswith(prefix):
+                    break
+                matches.update(self._postings[word])
+            self._prefix_matches[prefix] = matches
+        return matches
+
+    def match(self, term):
+        """Return the IDs of postings matching every word of ``term``."""
+        words = _WORD.findall(normalize_query(term))
+        if not words:
+            return set()
+        # Intersect starting from the rarest word
+        candidates = sorted((self._with_prefix(word) for word in words), key=len)
+        matches = set(candidates[0])
+        for other in candidates[1:]:
+            matches &= other
+            if not matches:
+                break
+        return matches
+
+def format_posting(posting):
+    job_id, title, _, company, location = posting[:5]
+    return f"- {title} at {company or 'an undisclosed company'} ({location or 'location not given'}), job ID {job_id}"
+
+def format_posting_html(posting):
+    job_id, title, _, company, location = posting[:5]
+    return (f"<li><strong>{html.escape(title)}</strong> at {html.escape(company or 'an undisclosed company')} "
+            f"({html.escape(location or 'location not given')}), job ID {job_id}</li>")
+
+def build_digests(postings, subscriptions, delivered=frozenset(), aliases=None):
+    """
+    Match postings against every subscription in one pass.
+
+    Each distinct term is matched once and its matches sorted once; subscribers
+    with a single alert share that list, and only subscribers with several
+    matching alerts or earlier deliveries pay for a merge.
+
+    :param postings: (job_id, title, description, company, location) rows.
+    :param subscriptions: (email, kind, term, first_name) rows.
+    :param delivered: (email, job_id) pairs already sent, left out of the digests.
+    :param aliases: Skill alias map for skill alerts, default skill_aliases().
+    :return: (digests, distinct_terms), where digests maps each email to its
+             first name and matching job IDs in ascending order.
+    """
+    index = PostingIndex(postings)
+    if aliases is None:
+        aliases = skill_aliases()
+    spellings = skill_spellings(aliases)
+    delivered_to = {}
+    for email, job_id in delivered:
+        delivered_to.setdefault(email, set()).add(job_id)
+    term_matches = {}
+    matched = {}
+    for email, kind, term, first_name in subscriptions:
+        if kind == "skill":
+            term = canonical_skill_name(term, aliases)
+        key = (kind == "skill", term)
+        matches = term_matches.get(key)
+        if matches is None:
+            if kind == "skill":
+                matches = set().union(*(index.match(spelling) for spelling in spellings.get(term, {term})))
+            else:
+                matches = index.match(term)
+            matches = term_matches[key] = sorted(matches)
+        if matches:
+            matched.setdefault(email, (first_name, []))[1].append(matches)
+    digests = {}
+    for email, (first_name, lists) in matched.items():
+        sent = delivered_to.get(email)
+        if len(lists) == 1 and not sent:
+            job_ids = lists[0]
+        else:
+            job_ids = sorted(set().union(*lists).difference(sent or ()))
+        if job_ids:
+            digests[email] = {"first_name": first_name, "job_ids": job_ids}
+    return digests, len(term_matches)
+
+def digest_rows(digests, postings):
+    """Yield the job_alert template fields of every digest."""
+    by_id = {posting[0]: posting for posting in postings}
+    # Subscribers of the same alerts get the same listing; format it once
+    listings = {}
+    for email, digest in digests.items():
+        job_ids = digest["job_ids"]
+        key = (tuple(job_ids[:DIGEST_MAX_POSTINGS]), len(job_ids))
+        listing = listings.get(key)
+        if listing is None:
+            listed = [by_id[job_id] for job_id in key[0]]
+            more = len(job_ids) - len(listed)
+            lines = [format_posting(posting) for posting in listed]
+            job_list_html = "<ul>" + "".join(format_posting_html(posting) for posting in listed) + "</ul>"
+            if more:
+                lines.append(f"... and {more} more.")
+                job_list_html += f"<p>... and {more} more.</p>"
+            listing = listings[key] = ("\n".join(lines), job_list_html)
+        yield {
+            "email": email,
+            "first_name": digest["first_name"] or "there",
+            "job_count": len(job_ids),
+            "job_list": listing[0],
+            "job_list_html": listing[1],
+        }
+
+def record_deliveries(cursor, digests, recipients):
+    """Record the postings of the digests the server accepted for ``recipients``; returns the rows written."""
+    rows = [(email, job_id) for email in recipients for job_id in digests[email]["job_ids"]]
+    for start in range(0, len(rows), DELIVERY_INSERT_BATCH):
+        cursor.executemany("""
+            INSERT IGNORE INTO job_alert_deliveries (email, job_id, delivered_at) VALUES (%s, %s, NOW())
+        """, rows[start:start + DELIVERY_INSERT_BATCH])
+    return len(rows)
+
+class DeliveryRecorder:
+    """
+    ``on_sent`` callback recording accepted digests in transactions of ``batch_size`` recipients.
+
+    A batch that cannot be recorded is logged and retried with the next one;
+    ``flush()`` records whatever is left once sending is over.
+    """
+
+    def __init__(self, digests, batch_size=DELIVERY_RECORD_BATCH):
+        self.digests = digests
+        self.batch_size = batch_size
+        self.recorded = 0
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def __call__(self, email):
+        with self._lock:
+            self._pending.append(email)
+            if len(self._pending) < self.batch_size:
+                return
+            batch, self._pending = self._pending, []
+        try:
+            self._record(batch)
+        except Exception as e:
+            logging.error("Failed to record %s job alert deliveries, retrying with the next batch: %s", len(batch), e)
+            with self._lock:
+                self._pending.extend(batch)
+
+    def _record(self, batch):
+        rows = run_in_transaction(record_deliveries, self.digests, batch)
+        with self._lock:
+            self.recorded += rows
+
+    def flush(self):
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if batch:
+            self._record(batch)
+        return self.recorded
+
+def record_run(cursor, started_at, metrics, match_seconds, send_seconds):
+    """Prune deliveries of postings no longer alerted and record the run's metrics."""
+    cursor.execute("""
+        DELETE FROM job_alert_deliveries WHERE delivered_at < NOW() - INTERVAL %s DAY
+    """, (DIGEST_LOOKBACK_DAYS + 1,))
+    cursor.execute("""
+        INSERT INTO job_alert_runs (started_at, last_job_id, postings, subscriptions, digests,
+                                    sent, failed, match_seconds, send_seconds)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """, (started_at, metrics["last_job_id"], metrics["postings"], metrics["subscriptions"], metrics["digests"],
+          metrics["sent"], metrics["failed"], match_seconds, send_seconds))
+
+def run_job_alert_digest(parallel=1, dry_run=False):
+    """
+    Email every subscriber the recent postings matching their alerts that they have not been sent.
+
+    The run holds a MySQL advisory lock so overlapping runs do not send
+    duplicates, records which postings each subscriber was sent in
+    ``job_alert_deliveries`` as the emails go out and its metrics in
+    ``job_alert_runs``. No transaction stays open while emails are sent. With
+    ``dry_run`` nothing is sent or recorded.
+
+    :return: Dict of run metrics.
+    """
+    from alumni.mail import get_email_config, send_bulk
+    from alumni.templates import render_batch
+
+    started_at = datetime.now()
+    # The advisory lock belongs to this connection's session, so it stays open for the run
+    with database_connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute("SELECT GET_LOCK(%s, 0)", (DIGEST_LOCK_NAME,))
+        if not cursor.fetchone()[0]:
+            raise RuntimeError("Another job alert digest run is in progress")
+        try:
+            cursor.execute(f"""
+                SELECT job_id, title, description, company, location FROM job_postings
+                WHERE posted_date >= CURDATE() - INTERVAL %s DAY AND {ACTIVE_JOB_CONDITION}
+                ORDER BY job_id
+            """, (DIGEST_LOOKBACK_DAYS,))
+            postings = cursor.fetchall()
+            delivered = set()
+            if postings:
+                cursor.execute("SELECT email, job_id FROM job_alert_deliveries WHERE job_id >= %s", (postings[0][0],))
+                delivered = set(cursor.fetchall())
+            cursor.execute("""
+                SELECT job_alert_subscriptions.email, job_alert_subscriptions.kind,
+                       job_alert_subscriptions.term, alumni.first_name
+                FROM job_alert_subscriptions
+                LEFT JOIN alumni ON alumni.email = job_alert_subscriptions.email
+            """)
+            subscriptions = cursor.fetchall()
+            # End the read transaction; the lock is kept until RELEASE_LOCK
+            connection.commit()
+
+            match_started = time.perf_counter()
+            digests, distinct_terms = build_digests(postings, subscriptions, delivered) if postings else ({}, 0)
+            match_seconds = time.perf_counter() - match_started
+
+            sent = failed = 0
+            # Postings are only marked delivered for the subscribers whose email went out
+            recorder = DeliveryRecorder(digests, DELIVERY_RECORD_BATCH)
+            send_started = time.perf_counter()
+            if digests and not dry_run:
+                email_config = get_email_config()
+                if email_config:
+                    messages = render_batch("job_alert", email_config[2], digest_rows(digests, postings))
+                    try:
+                        sent, failed = send_bulk(messages, email_config, parallel=parallel, on_sent=recorder)
+                    finally:
+                        recorder.flush()
+                else:
+                    logging.error("Email configuration not found.")
+                    failed = len(digests)
+            send_seconds = time.perf_counter() - send_started
+
+            metrics = {
+                "postings": len(postings),
+                "subscriptions": len(subscriptions),
+                "distinct_terms": distinct_terms,
+                "digests": len(digests),
+                "sent": sent,
+                "failed": failed,
+                "match_seconds": round(match_seconds, 4),
+                "send_seconds": round(send_seconds, 4),
+                "messages_per_second": round(sent / send_seconds, 1) if sent and send_seconds else 0.0,
+                "last_job_id": postings[-1][0] if postings else 0,
+            }
+            if not dry_run:
+                metrics["deliveries"] = recorder.recorded
+                run_in_transaction(record_run, started_at, metrics, match_seconds, send_seconds)
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (DIGEST_LOCK_NAME,))
+            cursor.fetchone()
+    logging.info("Job alert digest run: %s", metrics)
+    return metrics
@@ -0,0 +1,135 @@
+"""Job history analytics. pandas and numpy are only needed here, so they are
+imported on first use."""
+import logging
+from datetime import datetime
+
+from alumni.db import database_connection
+
+JOB_HISTORY_CHUNK_SIZE = 100_000
+JOB_HISTORY_COLUMNS = ["alumnus_id", "graduation_year", "company_name", "position", "start_date", "end_date"]
+TENURE_BUCKETS_MONTHS = (0, 6, 12, 24, 36, 60, 120)
+
+def load_job_history_frame(chunk_size=JOB_HISTORY_CHUNK_SIZE):
+    """
+    Load job_history joined with alumni.graduation_year into a pandas DataFrame.
+
+    Rows are fetched in chunks of ``chunk_size`` and converted to columns per chunk,
+    so the full result set never exists as Python tuples at once.
+    """
+    import pandas as pd
+
+    chunks = []
+    with database_connection(read_only=True) as connection:
+        cursor = connection.cursor()
+        cursor.execute("""
+            SELECT h.alumnus_id, a.graduation_year, h.company_name, h.position, h.start_date, h.end_date
+            FROM job_history h
+            JOIN alumni a ON a.id = h.alumnus_id
+        """)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            chunk = pd.DataFrame.from_records(rows, columns=JOB_HISTORY_COLUMNS)
+            chunk["graduation_year"] = pd.to_numeric(chunk["graduation_year"], errors="coerce").astype("Int32")
+            chunk["start_date"] = pd.to_datetime(chunk["start_date"], errors="coerce")
+            chunk["end_date"] = pd.to_datetime(chunk["end_date"], errors="coerce")
+            chunks.append(chunk)
+        cursor.close()
+
+    if not chunks:
+        return pd.DataFrame(columns=JOB_HISTORY_COLUMNS)
+    frame = pd.concat(chunks, ignore_index=True)
+    # Employer and position names repeat heavily, categories keep them compact
+    frame["company_name"] = frame["company_name"].str.strip().astype("category")
+    frame["position"] = frame["position"].str.strip().astype("category")
+    logging.info("Loaded %s job history rows for analytics.", len(frame))
+    return frame
+
+def tenure_distribution(frame, buckets=TENURE_BUCKETS_MONTHS, as_of=None):
+    """Count job history entries per tenure bucket (in months); open-ended jobs run until ``as_of``."""
+    import numpy as np
+    import pandas as pd
+
+    as_of = pd.Timestamp(as_of or datetime.now())
+    tenure_days = (frame["end_date"].fillna(as_of) - frame["start_date"]).dt.days
+    tenure_months = tenure_days / 30.4375
+    edges = list(buckets) + [np.inf]
+    labels = [f"{low}-{high} months" for low, high in zip(buckets, buckets[1:])] + [f"{buckets[-1]}+ months"]
+    bucketed = pd.cut(tenure_months, bins=edges, labels=labels, right=False)
+    counts = bucketed.value_counts(sort=False)
+    return pd.DataFrame({"jobs": counts, "share": counts / max(counts.sum(), 1)})
+
+def top_employers_by_cohort(frame, top=5):
+    """Return the ``top`` employers per graduation year, ranked by distinct alumni employed."""
+    alumni_per_employer = (
+        frame.dropna(subset=["graduation_year", "company_name"])
+        .groupby(["graduation_year", "company_name"], observed=True)["alumnus_id"]
+        .nunique()
+        .rename("alumni")
+        .reset_index()
+        .sort_values(["graduation_year", "alumni"], ascending=[True, False])
+    )
+    return alumni_per_employer.groupby("graduation_year", observed=True).head(top).reset_index(drop=True)
+
+def career_transitions(frame, column="company_name", top=20):
+    """
+    Count moves between consecutive jobs of the same alumnus.
+
+    :param column: "company_name" for employer changes or "position" for role changes.
+    """
+    ordered = frame.dropna(subset=["start_date"]).sort_values(["alumnus_id", "start_date"])
+    current = ordered[column].astype("object")
+    previous = current.groupby(ordered["alumnus_id"]).shift()
+    moved = previous.notna() & current.notna() & (previous != current)
+    transitions = (
+        ordered.loc[moved]
+        .assign(**{"from": previous[moved], "to": current[moved]})
+        .groupby(["from", "to"])
+        .size()
+        .rename("transitions")
+        .sort_values(ascending=False)
+        .head(top)
+    )
+    return transitions.reset_index()
+
+def time_to_first_job(frame, graduation_month=7):
+    """
+    Months from graduation (``graduation_month`` of the graduation year) to each alumnus's first job,
+    summarised per graduation cohort. Negative values are jobs started before graduating.
+    """
+    first_jobs = (
+        frame.dropna(subset=["start_date", "graduation_year"])
+        .groupby("alumnus_id")
+        .agg(graduation_year=("graduation_year", "first"), first_start=("start_date", "min"))
+    )
+    months = (
+        (first_jobs["first_start"].dt.year - first_jobs["graduation_year"].astype("int64")) * 12
+        + (first_jobs["first_start"].dt.month - graduation_month)
+    )
+    summary = months.groupby(first_jobs["graduation_year"]).agg(["count", "median", "mean"])
+    summary["within_6_months"] = (months <= 6).groupby(first_jobs["graduation_year"]).mean()
+    return summary.rename(columns={"count": "alumni", "median": "median_months", "mean": "mean_months"})
+
+def generate_job_history_analytics():
+    """Print tenure, employer, transition and time-to-first-job analytics."""
+    try:
+        frame = load_job_history_frame()
+        if frame.empty:
+            print("No job history recorded yet.")
+            return
+        print("Tenure Distribution:")
+        print(tenure_distribution(frame).to_string())
+        print("\nTop Employers per Graduation Year:")
+        print(top_employers_by_cohort(frame).to_string(index=False))
+        print("\nMost Common Career Transitions:")
+        print(career_transitions(frame).to_string(index=False))
+        print("\nTime to First Job (months):")
+        print(time_to_first_job(frame).to_string())
+        logging.info("Job history analytics generated successfully.")
+    except ImportError as e:
+        logging.error("Job history analytics unavailable: %s", e)
+        print("Job history analytics require pandas and numpy (pip install pandas numpy).")
+    except Exception as e:
+        logging.error("Failed to generate job history analytics: %s", e)
+        print("An error occurred while generating job history analytics.")
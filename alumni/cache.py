@@ -0,0 +1,251 @@
+"""Query-result cache for hot read paths such as skill and job searches.
+
+Entries are bounded by count (least recently used first out) and by age, and
+carry tags so writers can invalidate exactly the results they affect. By default
+the cache lives in process memory. Set a ``path`` in the ``[cache]`` config
+section (or ALUMNI_CACHE_PATH) to share it between worker processes through a
+local SQLite file.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from alumni.config import load_cache_settings, load_db_settings
+
+MISS = object()
+
+def normalize_query(text):
+    """Normalize a search term the way the case-insensitive database collation compares it."""
+    return " ".join((text or "").split()).casefold()
+
+class MemoryCacheStore:
+    """In-process LRU store."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._invalidated_at = 0.0
+
+    def generation(self):
+        return self._generation
+
+    def invalidated_at(self):
+        return self._invalidated_at
+
+    def get(self, key, now):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISS
+            if entry[0] <= now:
+                del self._entries[key]
+                return MISS
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, tags, expires_at):
+        with self._lock:
+            self._entries[key] = (expires_at, value, tuple(tags))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, match):
+        with self._lock:
+            self._generation += 1
+            self._invalidated_at = time.time()
+            doomed = [key for key, (_, _, tags) in self._entries.items() if any(match(tag) for tag in tags)]
+            for key in doomed:
+                del self._entries[key]
+        return len(doomed)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._invalidated_at = time.time()
+            self._entries.clear()
+
+class SqliteCacheStore:
+    """LRU store in a SQLite file shared by every process that opens the same path."""
+
+    EVICT_EVERY = 64
+
+    def __init__(self, path, max_entries):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._sets = 0
+        connection = self._connection()
+        connection.executescript("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL, last_access REAL NOT NULL);
+            CREATE TABLE IF NOT EXISTS cache_tags (
+                tag TEXT NOT NULL, key TEXT NOT NULL, PRIMARY KEY (tag, key));
+            CREATE INDEX IF NOT EXISTS cache_tags_key ON cache_tags (key);
+            CREATE INDEX IF NOT EXISTS cache_entries_access ON cache_entries (last_access);
+            CREATE TABLE IF NOT EXISTS cache_meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+            INSERT OR IGNORE INTO cache_meta (name, value) VALUES ('generation', 0);
+            INSERT OR IGNORE INTO cache_meta (name, value) VALUES ('invalidated_at', 0);
+        """)
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # Loaded only when the shared cache is configured
+            import sqlite3
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def generation(self):
+        return self._connection().execute("SELECT value FROM cache_meta WHERE name = 'generation'").fetchone()[0]
+
+    def invalidated_at(self):
+        return self._connection().execute("SELECT value FROM cache_meta WHERE name = 'invalidated_at'").fetchone()[0]
+
+    def get(self, key, now):
+        connection = self._connection()
+        row = connection.execute("SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return MISS
+        if row[1] <= now:
+            connection.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+            return MISS
+        connection.execute("UPDATE cache_entries SET last_access = ? WHERE key = ?", (now, key))
+        import pickle
+        return pickle.loads(row[0])
+
+    def set(self, key, value, tags, expires_at):
+        import pickle
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute("INSERT OR REPLACE INTO cache_entries (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                               (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), expires_at, time.time()))
+            connection.execute("DELETE FROM cache_tags WHERE key = ?", (key,))
+            connection.executemany("INSERT OR IGNORE INTO cache_tags (tag, key) VALUES (?, ?)", [(tag, key) for tag in tags])
+            self._sets += 1
+            if self._sets % self.EVICT_EVERY == 0:
+                connection.execute("""
+                    DELETE FROM cache_entries WHERE key IN (
+                        SELECT key FROM cache_entries ORDER BY last_access DESC LIMIT -1 OFFSET ?)
+                """, (self.max_entries,))
+                connection.execute("DELETE FROM cache_tags WHERE key NOT IN (SELECT key FROM cache_entries)")
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+    def invalidate(self, match):
+        connection = self._connection()
+        connection.create_function("tag_matches", 1, lambda tag: bool(match(tag)), deterministic=True)
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute("UPDATE cache_meta SET value = value + 1 WHERE name = 'generation'")
+            connection.execute("UPDATE cache_meta SET value = ? WHERE name = 'invalidated_at'", (time.time(),))
+            removed = connection.execute(
+                "DELETE FROM cache_entries WHERE key IN (SELECT key FROM cache_tags WHERE tag_matches(tag))").rowcount
+            connection.execute("DELETE FROM cache_tags WHERE key NOT IN (SELECT key FROM cache_entries)")
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return removed
+
+    def clear(self):
+        connection = self._connection()
+        connection.executescript(f"""
+            BEGIN IMMEDIATE;
+            UPDATE cache_meta SET value = value + 1 WHERE name = 'generation';
+            UPDATE cache_meta SET value = {time.time()!r} WHERE name = 'invalidated_at';
+            DELETE FROM cache_entries;
+            DELETE FROM cache_tags;
+            COMMIT;
+        """)
+
+class QueryCache:
+    """Cache of query results keyed on normalized parameters, with hit/miss counters."""
+
+    def __init__(self, store, ttl_seconds, settle_seconds=0.0):
+        """
+        :param settle_seconds: Results computed this soon after an invalidation are
+                               not stored, since a lagging read replica may not
+                               have the write that caused it yet.
+        """
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.settle_seconds = settle_seconds
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key, compute, tags):
+        """Return the cached value for ``key`` or store and return ``compute()``."""
+        key = json.dumps(key, default=str)
+        now = time.time()
+        value = self.store.get(key, now)
+        if value is not MISS:
+            self.hits += 1
+            return value
+        self.misses += 1
+        generation = self.store.generation()
+        value = compute()
+        # An invalidation while computing may have made the value stale already
+        settled = self.settle_seconds <= 0 or now - self.store.invalidated_at() >= self.settle_seconds
+        if self.store.generation() == generation and settled:
+            self.store.set(key, value, tags, now + self.ttl_seconds)
+        return value
+
+    def invalidate(self, match):
+        """Drop every entry with a tag for which ``match(tag)`` is true."""
+        return self.store.invalidate(match)
+
+    def invalidate_tags(self, *tags):
+        wanted = set(tags)
+        return self.invalidate(wanted.__contains__)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / total if total else 0.0}
+
+_query_cache = None
+_query_cache_lock = threading.Lock()
+
+def get_query_cache():
+    """Return the process-wide query cache, built from the cache settings on first use."""
+    global _query_cache
+    with _query_cache_lock:
+        if _query_cache is None:
+            settings = load_cache_settings()
+            if settings["path"]:
+                store = SqliteCacheStore(settings["path"], settings["max_entries"])
+            else:
+                store = MemoryCacheStore(settings["max_entries"])
+            _query_cache = QueryCache(store, settings["ttl_seconds"], replica_settle_seconds())
+        return _query_cache
+
+def replica_settle_seconds():
+    """Return the replica lag bound when read replicas are configured, else 0."""
+    settings = load_db_settings()
+    return max(settings["max_replica_lag"], 0.0) if settings["replicas"].strip() else 0.0
+
+def skill_tag(skill_name):
+    return "skill:" + normalize_query(skill_name)
+
+def invalidate_skill_searches(*skill_names):
+    """Drop cached alumni-by-skill results for the given skills."""
+    return get_query_cache().invalidate_tags(*(skill_tag(name) for name in skill_names))
+
+def invalidate_job_searches(*texts):
+    """Drop cached job searches whose term occurs in any of ``texts`` (e.g. a new posting's title and description)."""
+    haystacks = [normalize_query(text) for text in texts if text]
+    def match(tag):
+        return tag.startswith("jobs:") and any(tag[len("jobs:"):] in haystack for haystack in haystacks)
+    return get_query_cache().invalidate(match)
+
+def invalidate_all_job_searches():
+    return get_query_cache().invalidate(lambda tag: tag.startswith("jobs:"))
@@ -0,0 +1,34 @@
+"""Change notifications for tables written by the application.
+
+Writers call mark_data_changed() after committing; caches and precomputed views
+register a listener with on_data_changed() or compare table_version() values.
+"""
+import logging
+import threading
+
+_lock = threading.Lock()
+_table_versions = {}
+_listeners = []
+
+def mark_data_changed(*tables):
+    """Record a committed write to the given tables and notify listeners."""
+    with _lock:
+        for table in tables:
+            _table_versions[table] = _table_versions.get(table, 0) + 1
+        listeners = list(_listeners)
+    for listener in listeners:
+        try:
+            listener(tables)
+        except Exception as e:
+            logging.error("Data change listener %s failed: %s", listener, e)
+
+def table_version(table):
+    """Return a counter that increases with every recorded write to ``table``."""
+    with _lock:
+        return _table_versions.get(table, 0)
+
+def on_data_changed(listener):
+    """Register ``listener(tables)`` to be called after every recorded write; usable as a decorator."""
+    with _lock:
+        _listeners.append(listener)
+    return listener
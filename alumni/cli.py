@@ -0,0 +1,254 @@
+"""Non-interactive command line interface for scheduled jobs and pipelines.
+
+    python -m alumni import FILE [--batch-size N] [--parallel N]
+    python -m alumni export TABLE [--format csv|json|jsonl] [--output FILE] [--chunk-size N]
+    python -m alumni report NAME [--format text|json|csv] [--refresh]
+    python -m alumni invite EVENT_ID --from-file FILE [--parallel N]
+    python -m alumni archive-jobs [--batch-size N]
+    python -m alumni close-job JOB_ID [--filled]
+    python -m alumni job-alerts [--parallel N] [--dry-run]
+    python -m alumni worker [--processes N] [--once]
+    python -m alumni tasks [--id N | --cancel N | --list [--status S]]
+    python -m alumni normalize-skills [--dry-run]
+    python -m alumni skill-alias ALIAS SKILL
+    python -m alumni related-skills [--top-k N] [--min-support N]
+
+Any command accepts ``--profile`` (or ``--profile-mode cprofile``) before its
+name to write a profile of the run (see alumni.profiling).
+
+Summaries are printed as JSON on stdout (on stderr when stdout carries exported
+data); errors are printed as JSON on stderr. Exit codes: 0 success, 1 failure,
+2 usage error, 3 finished but skipped or failed some items.
+"""
+import argparse
+import csv
+import json
+import logging
+import sys
+
+from alumni.logs import configure_logging, log_context
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_USAGE = 2
+EXIT_PARTIAL = 3
+
+REPORT_ALIASES = {"stats": "alumni_statistics", "events": "event_participation"}
+
+class UsageError(Exception):
+    """A command argument was rejected after parsing."""
+
+def print_json(payload, stream=None):
+    print(json.dumps(payload, default=str), file=stream or sys.stdout)
+
+def read_emails(path):
+    """Read emails from a file with one per line, or a CSV file with an ``email`` column."""
+    with open(path, mode='r', newline='', encoding='utf-8') as file:
+        rows = [row for row in csv.reader(file) if row]
+    if not rows:
+        return []
+    header = [cell.strip().lower() for cell in rows[0]]
+    if "email" in header:
+        column = header.index("email")
+        return [row[column] for row in rows[1:] if len(row) > column]
+    return [row[0] for row in rows]
+
+def cmd_import(args):
+    from alumni.transfer import import_alumni_csv
+    stats = import_alumni_csv(args.file, batch_size=args.batch_size, parallel=args.parallel)
+    print_json(stats)
+    return EXIT_PARTIAL if stats["invalid"] or stats["failed_batches"] else EXIT_OK
+
+def cmd_export(args):
+    from alumni.transfer import EXPORTABLE_TABLES, export_table
+    if args.table not in EXPORTABLE_TABLES:
+        raise UsageError(f"Table cannot be exported: {args.table} (choose from {', '.join(EXPORTABLE_TABLES)})")
+    if args.output:
+        with open(args.output, mode='w', newline='', encoding='utf-8') as file:
+            rows = export_table(args.table, file, args.format, args.chunk_size)
+        print_json({"table": args.table, "rows": rows, "output": args.output})
+    else:
+        rows = export_table(args.table, sys.stdout, args.format, args.chunk_size)
+        print_json({"table": args.table, "rows": rows}, sys.stderr)
+    return EXIT_OK
+
+def cmd_report(args):
+    from alumni.reports import REPORT_RENDERERS, REPORTS, get_report, refresh_report
+    name = REPORT_ALIASES.get(args.name, args.name)
+    if name not in REPORTS:
+        raise UsageError(f"Unknown report: {args.name} (choose from {', '.join(list(REPORT_ALIASES) + list(REPORTS))})")
+    snapshot = refresh_report(name) if args.refresh else get_report(name)
+    print(REPORT_RENDERERS[args.format](snapshot))
+    return EXIT_OK
+
+def cmd_invite(args):
+    from alumni.events import invite_attendees
+    stats = invite_attendees(args.event_id, read_emails(args.from_file), parallel=args.parallel)
+    print_json(dict(stats, event_id=args.event_id))
+    return EXIT_PARTIAL if stats["invalid"] or stats["unknown"] or stats["failed"] else EXIT_OK
+
+def cmd_archive_jobs(args):
+    from alumni.jobs import archive_job_postings
+    print_json({"archived": archive_job_postings(args.batch_size)})
+    return EXIT_OK
+
+def cmd_close_job(args):
+    from alumni.jobs import close_job_posting
+    closed = close_job_posting(args.job_id, "filled" if args.filled else "closed")
+    print_json({"job_id": args.job_id, "closed": closed})
+    return EXIT_OK if closed else EXIT_ERROR
+
+def cmd_job_alerts(args):
+    from alumni.alerts import run_job_alert_digest
+    metrics = run_job_alert_digest(parallel=args.parallel, dry_run=args.dry_run)
+    print_json(metrics)
+    return EXIT_PARTIAL if metrics["failed"] else EXIT_OK
+
+def cmd_worker(args):
+    from alumni.tasks import run_worker, run_worker_processes
+    if args.once:
+        print_json({"ran": run_worker(once=True)})
+    elif args.processes > 1:
+        run_worker_processes(args.processes)
+    else:
+        try:
+            run_worker()
+        except KeyboardInterrupt:
+            pass
+    return EXIT_OK
+
+def cmd_tasks(args):
+    from alumni.tasks import cancel_task, get_task, list_tasks, queue_stats
+    if args.cancel is not None:
+        if not cancel_task(args.cancel):
+            raise UsageError(f"Task {args.cancel} does not exist or is no longer queued")
+        print_json({"cancelled": args.cancel})
+    elif args.id is not None:
+        task = get_task(args.id)
+        if task is None:
+            raise UsageError(f"Unknown task: {args.id}")
+        print_json(task)
+    elif args.list or args.status:
+        print_json(list_tasks(args.status, args.limit))
+    else:
+        print_json(queue_stats())
+    return EXIT_OK
+
+def cmd_normalize_skills(args):
+    from alumni.skills import normalize_skills
+    print_json(normalize_skills(dry_run=args.dry_run))
+    return EXIT_OK
+
+def cmd_skill_alias(args):
+    from alumni.skills import add_skill_alias
+    try:
+        metrics = add_skill_alias(args.alias, args.skill)
+    except ValueError as e:
+        raise UsageError(str(e)) from None
+    print_json(dict(metrics, alias=args.alias, skill=args.skill))
+    return EXIT_OK
+
+def cmd_related_skills(args):
+    from alumni.skills import refresh_related_skills
+    print_json(refresh_related_skills(top_k=args.top_k, min_support=args.min_support))
+    return EXIT_OK
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1: {value}")
+    return number
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="alumni", description="Alumni Management System batch commands.")
+    parser.add_argument("--profile", action="store_const", const="sample",
+                        help="profile the command and write a stack file and summary")
+    parser.add_argument("--profile-mode", dest="profile", choices=("sample", "cprofile"),
+                        help="profile with the given profiler instead of sampling")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subcommands.add_parser("import", help="import alumni from a CSV file")
+    import_parser.add_argument("file")
+    import_parser.add_argument("--batch-size", "--chunk-size", dest="batch_size", type=positive_int, default=1000)
+    import_parser.add_argument("--parallel", type=positive_int, default=1, help="number of concurrent database connections")
+    import_parser.set_defaults(handler=cmd_import)
+
+    export_parser = subcommands.add_parser("export", help="export a table")
+    export_parser.add_argument("table")
+    export_parser.add_argument("--format", choices=("csv", "json", "jsonl"), default="csv")
+    export_parser.add_argument("--output", help="write to this file instead of stdout")
+    export_parser.add_argument("--chunk-size", type=positive_int, default=5000)
+    export_parser.set_defaults(handler=cmd_export)
+
+    report_parser = subcommands.add_parser("report", help="print a report")
+    report_parser.add_argument("name", help="report name, or 'stats' / 'events'")
+    report_parser.add_argument("--format", choices=("text", "json", "csv"), default="text")
+    report_parser.add_argument("--refresh", action="store_true", help="recompute instead of serving the latest snapshot")
+    report_parser.set_defaults(handler=cmd_report)
+
+    invite_parser = subcommands.add_parser("invite", help="invite alumni to an event")
+    invite_parser.add_argument("event_id", type=int)
+    invite_parser.add_argument("--from-file", required=True, help="file with one email per line or an 'email' CSV column")
+    invite_parser.add_argument("--parallel", type=positive_int, default=1, help="number of concurrent SMTP sessions")
+    invite_parser.set_defaults(handler=cmd_invite)
+
+    archive_parser = subcommands.add_parser("archive-jobs", help="archive expired and closed job postings")
+    archive_parser.add_argument("--batch-size", type=positive_int, default=500, help="postings moved per transaction")
+    archive_parser.set_defaults(handler=cmd_archive_jobs)
+
+    close_parser = subcommands.add_parser("close-job", help="take a job posting off the listings before it expires")
+    close_parser.add_argument("job_id", type=positive_int)
+    close_parser.add_argument("--filled", action="store_true", help="record the position as filled rather than closed")
+    close_parser.set_defaults(handler=cmd_close_job)
+
+    alerts_parser = subcommands.add_parser("job-alerts", help="email job alert digests of recent postings each subscriber has not been sent")
+    alerts_parser.add_argument("--parallel", type=positive_int, default=1, help="number of concurrent SMTP sessions")
+    alerts_parser.add_argument("--dry-run", action="store_true", help="match and report without sending or recording the run")
+    alerts_parser.set_defaults(handler=cmd_job_alerts)
+
+    worker_parser = subcommands.add_parser("worker", help="run background tasks until interrupted")
+    worker_parser.add_argument("--processes", type=positive_int, default=1, help="number of worker processes")
+    worker_parser.add_argument("--once", action="store_true", help="exit once no task is ready")
+    worker_parser.set_defaults(handler=cmd_worker)
+
+    tasks_parser = subcommands.add_parser("tasks", help="show background task queue statistics or tasks")
+    tasks_parser.add_argument("--id", type=int, help="show one task")
+    tasks_parser.add_argument("--cancel", type=int, metavar="ID", help="cancel a task that has not started")
+    tasks_parser.add_argument("--list", action="store_true", help="list the most recent tasks")
+    tasks_parser.add_argument("--status", choices=("queued", "running", "done", "failed", "cancelled"))
+    tasks_parser.add_argument("--limit", type=positive_int, default=20)
+    tasks_parser.set_defaults(handler=cmd_tasks)
+
+    normalize_parser = subcommands.add_parser("normalize-skills", help="merge skills stored under different spellings")
+    normalize_parser.add_argument("--dry-run", action="store_true", help="report the merges without applying them")
+    normalize_parser.set_defaults(handler=cmd_normalize_skills)
+
+    alias_parser = subcommands.add_parser("skill-alias", help="make ALIAS another name for SKILL and merge it")
+    alias_parser.add_argument("alias")
+    alias_parser.add_argument("skill")
+    alias_parser.set_defaults(handler=cmd_skill_alias)
+
+    related_parser = subcommands.add_parser("related-skills", help="recompute related skill suggestions")
+    related_parser.add_argument("--top-k", type=positive_int, default=20, help="related skills kept per skill")
+    related_parser.add_argument("--min-support", type=positive_int, default=2, help="alumni that must list both skills")
+    related_parser.set_defaults(handler=cmd_related_skills)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    configure_logging()
+    from alumni.profiling import profile_run
+    with log_context(), profile_run(args.command, args.profile):
+        try:
+            return args.handler(args)
+        except UsageError as e:
+            print_json({"error": str(e)}, sys.stderr)
+            return EXIT_USAGE
+        except Exception as e:
+            logging.error("Command %s failed: %s", args.command, e)
+            print_json({"error": str(e)}, sys.stderr)
+            return EXIT_ERROR
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""Achievements, messages and connections between alumni."""
+import logging
+
+from alumni.db import database_connection
+from alumni.directory import get_directory
+from alumni.ratelimit import get_message_buffer, get_rate_limiter, is_overloaded
+
+def display_achievements():
+    """
+    Display achievements of alumni.
+    """
+    try:
+        with database_connection(read_only=True) as connection:
+            cursor = connection.cursor()
+
+            # Retrieve all achievements
+            select_query = "SELECT * FROM alumni_achievements ORDER BY date_posted DESC"
+            cursor.execute(select_query)
+
+            achievements = cursor.fetchall()
+            for achievement in achievements:
+                print(achievement)  # Format and display each achievement as needed
+
+            logging.info("Achievements displayed successfully.")
+    except Exception as e:
+        logging.error("Failed to display achievements: %s", e)
+        print("An error occurred while displaying achievements.")
+
+    return achievements
+
+def alumni_exist(*emails):
+    """True when every email belongs to an alumnus; the directory answers first, the primary confirms misses."""
+    directory = get_directory()
+    missing = {email for email in emails if directory.get_by_email(email) is None}
+    if not missing:
+        return True
+    # Alumni registered since the directory's last refresh
+    with database_connection() as connection:
+        cursor = connection.cursor()
+        placeholders = ", ".join(["%s"] * len(missing))
+        cursor.execute(f"SELECT COUNT(*) FROM alumni WHERE email IN ({placeholders})", tuple(missing))
+        return cursor.fetchone()[0] == len(missing)
+
+def deliver_message(sender_email, receiver_email, message):
+    """
+    Store a message unless the sender or receiver is over their rate limit.
+
+    Both addresses are checked before the message is accepted, since a queued
+    message is reported as sent before it is written.
+
+    :return: "sent", "rate_limited", "unknown_alumnus" when either address
+             belongs to no alumnus, or "busy" when the write path is saturated.
+    """
+    wait = get_rate_limiter().acquire(("message_sender", sender_email), ("message_receiver", receiver_email))
+    if wait:
+        logging.warning("Message from %s to %s rate limited for %.1fs", sender_email, receiver_email, wait)
+        return "rate_limited"
+    if not alumni_exist(sender_email, receiver_email):
+        logging.warning("Message from %s to %s refused, unknown alumnus", sender_email, receiver_email)
+        return "unknown_alumnus"
+    if not get_message_buffer().submit(sender_email, receiver_email, message):
+        logging.warning("Message from %s to %s refused, message buffer is full", sender_email, receiver_email)
+        return "busy"
+    logging.info("Message sent from %s to %s", sender_email, receiver_email)
+    return "sent"
+
+def send_message_to_alumnus(sender_email, receiver_email, message):
+    """
+    Send a message from one alumnus to another.
+    """
+    try:
+        outcome = deliver_message(sender_email, receiver_email, message)
+        if outcome == "sent":
+            print("Message sent successfully.")
+        elif outcome == "rate_limited":
+            print("You are sending messages too quickly. Please try again later.")
+        elif outcome == "unknown_alumnus":
+            print("No alumnus is registered with that email.")
+        else:
+            print("Messaging is busy right now. Please try again shortly.")
+        return outcome == "sent"
+    except Exception as e:
+        logging.error("Failed to send message: %s", e)
+        print("An error occurred while sending the message.")
+        return False
+
+def view_received_messages(email):
+    """
+    View messages received by an alumnus.
+    """
+    try:
+        with database_connection(read_only=True) as connection:
+            cursor = connection.cursor()
+            query = "SELECT sender_email, message FROM alumni_messages WHERE receiver_email = %s"
+            cursor.execute(query, (email,))
+            messages = cursor.fetchall()
+            print("Received Messages:")
+            for sender, message in messages:
+                print(f"From {sender}: {message}")
+    except Exception as e:
+        logging.error("Error viewing messages: %s", e)
+        print("An error occurred while viewing messages.")
+
+def connect_with_alumnus(requester_email, target_email):
+    """
+    Send a connection request to another alumnus.
+    """
+    if is_overloaded():
+        logging.warning("Connection request from %s refused under backpressure", requester_email)
+        print("The system is busy right now. Please try again shortly.")
+        return False
+    wait = get_rate_limiter().acquire(("connection_sender", requester_email), ("connection_receiver", target_email))
+    if wait:
+        logging.warning("Connection request from %s to %s rate limited for %.1fs", requester_email, target_email, wait)
+        print("You have sent too many connection requests. Please try again later.")
+        return False
+    try:
+        with database_connection() as connection:
+            cursor = connection.cursor()
+            query = "INSERT INTO alumni_connections (requester_email, target_email) VALUES (%s, %s)"
+            cursor.execute(query, (requester_email, target_email))
+            connection.commit()
+            logging.info("Connection request sent from %s to %s", requester_email, target_email)
+            print("Connection request sent successfully.")
+            return True
+    except Exception as e:
+        logging.error("Failed to send connection request: %s", e)
+        print("An error occurred while sending the connection request.")
+        return False
@@ -0,0 +1,135 @@
+"""Settings read from a config file and the environment, so batch runs never prompt."""
+import configparser
+import os
+
+CONFIG_ENV_VAR = "ALUMNI_CONFIG"
+DEFAULT_CONFIG_PATHS = ("alumni.ini", os.path.join(os.path.expanduser("~"), ".alumni.ini"))
+
+DEFAULT_DB_SETTINGS = {
+    "host": "localhost",
+    "port": 3306,
+    "user": "root",
+    "password": None,
+    "database": "AlumniDB",
+    # Comma-separated host[:port] read replicas sharing the primary's credentials
+    "replicas": "",
+    # Seconds of replication lag above which a replica is skipped; negative disables the check
+    "max_replica_lag": 5.0,
+    "replica_check_seconds": 5.0,
+    # Seconds after a user's write during which their reads stay on the primary
+    "sticky_seconds": 10.0,
+}
+DB_ENV_VARS = {
+    "host": "ALUMNI_DB_HOST",
+    "port": "ALUMNI_DB_PORT",
+    "user": "ALUMNI_DB_USER",
+    "password": "ALUMNI_DB_PASSWORD",
+    "database": "ALUMNI_DB_NAME",
+    "replicas": "ALUMNI_DB_REPLICAS",
+}
+
+DEFAULT_CACHE_SETTINGS = {
+    "path": None,
+    "max_entries": 1024,
+    "ttl_seconds": 300.0,
+}
+CACHE_ENV_VARS = {
+    "path": "ALUMNI_CACHE_PATH",
+    "max_entries": "ALUMNI_CACHE_MAX_ENTRIES",
+    "ttl_seconds": "ALUMNI_CACHE_TTL",
+}
+
+DEFAULT_RATE_LIMIT_SETTINGS = {
+    "messages_per_minute": 10.0,
+    "message_burst": 20,
+    "inbox_per_minute": 30.0,
+    "inbox_burst": 60,
+    "connections_per_hour": 30.0,
+    "connection_burst": 10,
+    "incoming_connections_per_hour": 90.0,
+    "incoming_connection_burst": 30,
+    "buffer_max_pending": 5000,
+    "buffer_batch_size": 200,
+    "buffer_flush_seconds": 0.2,
+    "persist_seconds": 30.0,
+}
+RATE_LIMIT_ENV_VARS = {
+    "messages_per_minute": "ALUMNI_MESSAGES_PER_MINUTE",
+    "connections_per_hour": "ALUMNI_CONNECTIONS_PER_HOUR",
+    "buffer_max_pending": "ALUMNI_MESSAGE_BUFFER_MAX",
+}
+
+DEFAULT_TASK_SETTINGS = {
+    "path": "alumni_tasks.sqlite3",
+    "in_process_workers": 1,
+    "max_attempts": 5,
+    "backoff_seconds": 10.0,
+    "poll_seconds": 1.0,
+    "retention_days": 7,
+}
+TASK_ENV_VARS = {
+    "path": "ALUMNI_TASKS_PATH",
+    "in_process_workers": "ALUMNI_TASK_WORKERS",
+}
+
+DEFAULT_PROFILE_SETTINGS = {
+    "mode": "",
+    "directory": "profiles",
+    "sample_interval": 0.005,
+    "top": 30,
+}
+PROFILE_ENV_VARS = {
+    "mode": "ALUMNI_PROFILE",
+    "directory": "ALUMNI_PROFILE_DIR",
+    "sample_interval": "ALUMNI_PROFILE_INTERVAL",
+}
+
+def read_config_file(path=None):
+    """Parse the config file at ``path``, $ALUMNI_CONFIG, ./alumni.ini or ~/.alumni.ini, first found wins."""
+    parser = configparser.ConfigParser()
+    path = path or os.environ.get(CONFIG_ENV_VAR)
+    for candidate in ([path] if path else DEFAULT_CONFIG_PATHS):
+        if os.path.exists(candidate):
+            parser.read(candidate, encoding='utf-8')
+            break
+    return parser
+
+def load_settings(section, defaults, env_vars, path=None):
+    """
+    Return the settings of one config ``section``.
+
+    ``defaults`` are overridden by the section in the config file, which is
+    overridden by the environment variables named in ``env_vars``. Values are
+    converted to the type of their non-None default.
+    """
+    settings = dict(defaults)
+    parser = read_config_file(path)
+    if parser.has_section(section):
+        settings.update((key, value) for key, value in parser.items(section) if key in settings)
+    for key, env_var in env_vars.items():
+        if env_var in os.environ:
+            settings[key] = os.environ[env_var]
+    for key, default in defaults.items():
+        if default is not None and settings[key] is not None:
+            settings[key] = type(default)(settings[key])
+    return settings
+
+def load_db_settings(path=None):
+    """Return the database settings from the ``[database]`` section and ALUMNI_DB_* variables."""
+    return load_settings("database", DEFAULT_DB_SETTINGS, DB_ENV_VARS, path)
+
+def load_cache_settings(path=None):
+    """Return the query cache settings from the ``[cache]`` section and ALUMNI_CACHE_* variables."""
+    return load_settings("cache", DEFAULT_CACHE_SETTINGS, CACHE_ENV_VARS, path)
+
+def load_rate_limit_settings(path=None):
+    """Return the messaging limits from the ``[ratelimit]`` section and ALUMNI_*_PER_* variables."""
+    return load_settings("ratelimit", DEFAULT_RATE_LIMIT_SETTINGS, RATE_LIMIT_ENV_VARS, path)
+
+def load_task_settings(path=None):
+    """Return the background task queue settings from the ``[tasks]`` section and ALUMNI_TASK* variables."""
+    return load_settings("tasks", DEFAULT_TASK_SETTINGS, TASK_ENV_VARS, path)
+
+def load_profile_settings(path=None):
+    """Return the profiling settings from the ``[profiling]`` section and ALUMNI_PROFILE* variables."""
+    return load_settings("profiling", DEFAULT_PROFILE_SETTINGS, PROFILE_ENV_VARS, path)
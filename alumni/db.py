@@ -0,0 +1,281 @@
+"""Database connections and transactions.
+
+mysql.connector is imported on the first connection. Other modules catch driver
+errors with ``except db.Error``, which resolves the driver class lazily.
+
+Read-only code paths ask for ``database_connection(read_only=True)``. When
+replicas are configured, these reads go round-robin to a replica that is
+reachable and within ``max_replica_lag`` seconds of the primary. Otherwise they
+use the primary. A user who has just used the primary (set with
+``set_current_user``) keeps reading from it for ``sticky_seconds``, so they
+see their own writes.
+"""
+import contextvars
+import itertools
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from alumni.config import load_db_settings
+from alumni.profiling import phase, timed_connection
+
+def __getattr__(name):
+    if name == "Error":
+        return _driver().Error
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def _driver():
+    import mysql.connector
+    return mysql.connector
+
+_current_user = contextvars.ContextVar("alumni_db_user", default=None)
+_last_primary_use = {}
+_last_primary_use_lock = threading.Lock()
+_last_primary_use_pruned = 0.0
+_replica_router = None
+_router_lock = threading.Lock()
+
+def set_current_user(user):
+    """Attribute this context's primary connections to ``user`` for read-your-writes routing."""
+    _current_user.set(user)
+
+def reads_from_primary(user=None):
+    """True while ``user`` (default: the current user) is inside their sticky window."""
+    user = _current_user.get() if user is None else user
+    last_use = _last_primary_use.get(user)
+    return last_use is not None and time.monotonic() - last_use < get_db_settings()["sticky_seconds"]
+
+def _record_primary_use(user):
+    """Start ``user``'s sticky window, dropping the windows that have ended at most once per window."""
+    global _last_primary_use_pruned
+    now = time.monotonic()
+    sticky_seconds = get_db_settings()["sticky_seconds"]
+    with _last_primary_use_lock:
+        _last_primary_use[user] = now
+        if now - _last_primary_use_pruned >= sticky_seconds:
+            for expired in [name for name, last_use in _last_primary_use.items() if now - last_use >= sticky_seconds]:
+                del _last_primary_use[expired]
+            _last_primary_use_pruned = now
+
+@contextmanager
+def database_connection(read_only=False):
+    """
+    Yield a connection that is closed afterwards.
+
+    :param read_only: Allow the connection to come from a replica.
+    """
+    connection = None
+    try:
+        if read_only and not reads_from_primary():
+            router = get_replica_router()
+            if router is not None:
+                connection = router.connect(get_db_settings())
+        if connection is None:
+            connection = connect_to_db()
+            user = _current_user.get()
+            if not read_only and user is not None:
+                _record_primary_use(user)
+        yield timed_connection(connection)
+    except _driver().Error as err:
+        logging.error("Database operation failed: %s", err)
+        raise
+    finally:
+        if connection:
+            connection.close()
+
+db_settings = None
+
+def get_db_settings():
+    """Return the database settings, loading them from the config file and environment once."""
+    global db_settings
+    if db_settings is None:
+        db_settings = load_db_settings()
+    return db_settings
+
+def connect_to_db():
+    """Establish a connection to the MySQL database."""
+    settings = get_db_settings()
+    if settings["password"] is None:
+        logging.error("Database password not set")
+        raise ValueError("Database password is not set.")
+
+    try:
+        with phase("db.connect"):
+            connection = _driver().connect(
+                host=settings["host"],
+                port=settings["port"],
+                user=settings["user"],
+                password=settings["password"],
+                database=settings["database"]
+            )
+        return connection
+    except _driver().Error as err:
+        logging.error("Failed to connect to database: %s", err)
+        raise
+
+def replica_lag(connection):
+    """Return how many seconds the server behind ``connection`` lags its source, or None if it is not replicating."""
+    cursor = connection.cursor(dictionary=True)
+    try:
+        try:
+            cursor.execute("SHOW REPLICA STATUS")
+        except _driver().Error:
+            # MySQL before 8.0.22
+            cursor.execute("SHOW SLAVE STATUS")
+        channels = cursor.fetchall()
+    finally:
+        cursor.close()
+    lags = [channel.get("Seconds_Behind_Source", channel.get("Seconds_Behind_Master")) for channel in channels]
+    if not lags or any(lag is None for lag in lags):
+        return None
+    return float(max(lags))
+
+class ReplicaRouter:
+    """Round-robin over replica endpoints, skipping those that are down or lagging."""
+
+    def __init__(self, endpoints, max_lag=5.0, check_seconds=5.0):
+        """
+        :param endpoints: (host, port) pairs.
+        :param max_lag: Largest acceptable lag in seconds; negative skips the lag check.
+        :param check_seconds: How long a health or lag check result is trusted.
+        """
+        self.endpoints = list(endpoints)
+        self.max_lag = max_lag
+        self.check_seconds = check_seconds
+        self._health = {}
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+
+    def connect(self, settings):
+        """Return a connection to the next healthy replica, or None if there is none."""
+        start = next(self._turn)
+        for offset in range(len(self.endpoints)):
+            endpoint = self.endpoints[(start + offset) % len(self.endpoints)]
+            now = time.monotonic()
+            with self._lock:
+                checked_at, healthy, _ = self._health.get(endpoint, (None, True, None))
+            due = checked_at is None or now - checked_at >= self.check_seconds
+            if not healthy and not due:
+                continue
+            try:
+                with phase("db.connect"):
+                    connection = _driver().connect(host=endpoint[0], port=endpoint[1], user=settings["user"],
+                                                   password=settings["password"], database=settings["database"])
+            except _driver().Error as err:
+                logging.warning("Replica %s:%s unavailable, skipping it: %s", endpoint[0], endpoint[1], err)
+                self._record(endpoint, now, False, None)
+                continue
+            if due and self.max_lag >= 0:
+                try:
+                    lag = replica_lag(connection)
+                except _driver().Error as err:
+                    logging.warning("Could not read the lag of replica %s:%s: %s", endpoint[0], endpoint[1], err)
+                    lag = None
+                healthy = lag is not None and lag <= self.max_lag
+                self._record(endpoint, now, healthy, lag)
+                if not healthy:
+                    logging.warning("Replica %s:%s lag is %s seconds, reading from the primary", endpoint[0], endpoint[1], lag)
+                    connection.close()
+                    continue
+            elif due:
+                self._record(endpoint, now, True, None)
+            return connection
+        return None
+
+    def _record(self, endpoint, checked_at, healthy, lag):
+        with self._lock:
+            self._health[endpoint] = (checked_at, healthy, lag)
+
+    def status(self):
+        """Return the last known health and lag of every replica."""
+        with self._lock:
+            return [{
+                "host": host,
+                "port": port,
+                "healthy": self._health.get((host, port), (None, True, None))[1],
+                "lag_seconds": self._health.get((host, port), (None, True, None))[2],
+            } for host, port in self.endpoints]
+
+def parse_replicas(value, default_port):
+    """Parse ``"host[:port],host[:port]"`` into (host, port) pairs."""
+    endpoints = []
+    for item in (value or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        host, _, port = item.rpartition(":") if ":" in item else (item, "", "")
+        endpoints.append((host, int(port) if port else default_port))
+    return endpoints
+
+def get_replica_router():
+    """Return the process-wide ReplicaRouter, or None when no replicas are configured."""
+    global _replica_router
+    with _router_lock:
+        if _replica_router is None:
+            settings = get_db_settings()
+            endpoints = parse_replicas(settings["replicas"], settings["port"])
+            _replica_router = ReplicaRouter(endpoints, settings["max_replica_lag"], settings["replica_check_seconds"]) if endpoints else False
+        return _replica_router or None
+
+# MySQL error codes that mean the transaction was rolled back and is safe to retry
+DEADLOCK_ERROR_CODES = (1205, 1213)  # ER_LOCK_WAIT_TIMEOUT, ER_LOCK_DEADLOCK
+
+@contextmanager
+def transaction():
+    """Open a connection and yield a cursor whose work is committed as one unit.
+
+    The transaction is rolled back if the block raises, and the cursor and
+    connection are always released.
+    """
+    with database_connection() as connection:
+        cursor = connection.cursor()
+        try:
+            yield cursor
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
+def run_in_transaction(work, *args, retries=3, backoff=0.05):
+    """
+    Run ``work(cursor, *args)`` inside a transaction, retrying on deadlocks.
+
+    :param work: Callable receiving the transaction cursor; its return value is returned.
+    :param retries: Number of extra attempts after a deadlock or lock wait timeout.
+    :param backoff: Base delay in seconds, doubled (with jitter) on every retry.
+    """
+    attempt = 0
+    while True:
+        try:
+            with transaction() as cursor:
+                return work(cursor, *args)
+        except _driver().Error as err:
+            if err.errno not in DEADLOCK_ERROR_CODES or attempt >= retries:
+                raise
+            delay = backoff * (2 ** attempt) * (1 + random.random())
+            attempt += 1
+            logging.warning("Transaction deadlocked, retrying in %.3fs (attempt %s/%s): %s", delay, attempt, retries, err)
+            time.sleep(delay)
+
+def lock_alumnus_id(cursor, email):
+    """Return the ID of the alumnus with the given email, locking the row until commit."""
+    cursor.execute("SELECT id FROM alumni WHERE email = %s FOR UPDATE", (email,))
+    result = cursor.fetchone()
+    return result[0] if result else None
+
+# Prompt for the database password when none is configured
+def set_db_password():
+    settings = get_db_settings()
+    while True:
+        try:
+            settings["password"] = input("Enter Database password:")
+            mydb = connect_to_db()
+            if mydb.is_connected():
+                mydb.close()
+                break
+        except _driver().Error as err:
+            print(f'Connection failed: {err}')
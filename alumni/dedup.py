@@ -0,0 +1,258 @@
+"""Offline detection and merging of duplicate alumni records.
+
+Records are only compared within blocks that share a blocking key, then merged
+into the oldest record of each duplicate group.
+"""
+import logging
+import re
+import time
+from collections import defaultdict
+
+from alumni.cache import invalidate_all_job_searches, invalidate_skill_searches
+from alumni.changes import mark_data_changed
+from alumni.db import database_connection, run_in_transaction
+from alumni.names import name_index, name_ngrams, normalize_name
+from alumni.records import searches_listing_alumnus
+
+# A pair matches with an identical name and graduation year (the name block), or
+# with the same email local part and a similar name (the email block). Name and
+# year alone are shared by different people, so a pair must also have the same
+# email local part, the same job or DEDUP_MIN_SHARED_SKILLS skills in common.
+DEDUP_MATCH_THRESHOLD = 0.8
+DEDUP_NAME_WEIGHT = 0.5
+DEDUP_YEAR_WEIGHT = 0.3
+DEDUP_EMAIL_WEIGHT = 0.45
+DEDUP_JOB_WEIGHT = 0.1
+DEDUP_MIN_SHARED_SKILLS = 2
+DEDUP_MAX_BLOCK_SIZE = 50
+DEDUP_CHUNK_SIZE = 50_000
+
+# Tables whose rows point at an alumnus, by ID or by email
+ALUMNUS_ID_REFERENCES = [
+    ("job_history", "alumnus_id"),
+    ("job_postings", "alumnus_id"),
+    ("job_postings_archive", "alumnus_id"),
+    ("alumni_achievements", "alumnus_id"),
+    ("event_attendance", "alumnus_id"),
+]
+# ID references without a unique key where both records may have the same row:
+# the duplicate's rows matching one of the kept record's on these columns are dropped
+ALUMNUS_ID_OVERLAPS = {"event_attendance": ("event_id",)}
+ALUMNUS_EMAIL_REFERENCES = [
+    ("alumni_messages", "sender_email"),
+    ("alumni_messages", "receiver_email"),
+    ("alumni_connections", "requester_email"),
+    ("alumni_connections", "target_email"),
+    ("event_invitations", "attendee_email"),
+    ("event_rsvps", "attendee_email"),
+    ("events", "organizer_email"),
+    ("job_alert_subscriptions", "email"),
+]
+# Email references under a unique key: rows the kept record already has are dropped
+ALUMNUS_EMAIL_UNIQUE = {"event_invitations", "job_alert_subscriptions"}
+# Tables a merge writes, for change notifications
+DEDUP_CHANGED_TABLES = tuple(dict.fromkeys(
+    ["alumni", "alumni_skills", "alumni_merges"]
+    + [table for table, _ in ALUMNUS_ID_REFERENCES + ALUMNUS_EMAIL_REFERENCES]))
+
+def email_local_key(email):
+    """Normalize the local part of an email: drop +tags and separators (j.doe+x@ -> jdoe)."""
+    local = (email or "").split("@", 1)[0].casefold().split("+", 1)[0]
+    return re.sub(r"[._-]", "", local)
+
+def dedup_blocking_keys(record):
+    """Yield the blocking keys of an (id, first_name, last_name, email, graduation_year, current_job) record."""
+    _, first_name, last_name, email, graduation_year, _ = record
+    first, last = normalize_name(first_name), normalize_name(last_name)
+    if first or last:
+        yield ("name", first, last, (graduation_year or "").strip())
+    local = email_local_key(email)
+    if local:
+        yield ("email", local)
+
+def name_similarity(a, b):
+    grams_a, grams_b = name_ngrams(normalize_name(a)), name_ngrams(normalize_name(b))
+    if not grams_a or not grams_b:
+        return 0.0
+    return len(grams_a & grams_b) / len(grams_a | grams_b)
+
+def score_duplicate_pair(a, b):
+    """Score how likely two alumni records describe the same person, from 0 to 1."""
+    score = DEDUP_NAME_WEIGHT * name_similarity(f"{a[1]} {a[2]}", f"{b[1]} {b[2]}")
+    if a[4] and a[4] == b[4]:
+        score += DEDUP_YEAR_WEIGHT
+    if email_local_key(a[3]) and email_local_key(a[3]) == email_local_key(b[3]):
+        score += DEDUP_EMAIL_WEIGHT
+    if a[5] and normalize_name(a[5]) == normalize_name(b[5]):
+        score += DEDUP_JOB_WEIGHT
+    return min(score, 1.0)
+
+def corroborated_by_record(a, b):
+    """True if two records share an email local part or a job, evidence independent of name and year."""
+    local = email_local_key(a[3])
+    return bool(local and local == email_local_key(b[3])) or bool(a[5] and normalize_name(a[5]) == normalize_name(b[5]))
+
+def load_skill_ids(cursor, alumni_ids):
+    """Return the skill IDs of each of ``alumni_ids``."""
+    skill_ids = defaultdict(set)
+    alumni_ids = sorted(alumni_ids)
+    for start in range(0, len(alumni_ids), DEDUP_CHUNK_SIZE):
+        chunk = alumni_ids[start:start + DEDUP_CHUNK_SIZE]
+        placeholders = ", ".join(["%s"] * len(chunk))
+        cursor.execute(f"SELECT alumnus_id, skill_id FROM alumni_skills WHERE alumnus_id IN ({placeholders})", tuple(chunk))
+        for alumnus_id, skill_id in cursor.fetchall():
+            skill_ids[alumnus_id].add(skill_id)
+    return skill_ids
+
+def find_duplicate_alumni(threshold=DEDUP_MATCH_THRESHOLD, max_block_size=DEDUP_MAX_BLOCK_SIZE):
+    """
+    Return (keep_id, duplicate_id, score) tuples for likely duplicate alumni.
+
+    Only records sharing a blocking key are compared; blocks larger than
+    ``max_block_size`` (very common names) are skipped rather than compared pairwise.
+    A pair scoring above ``threshold`` is only a match with evidence beyond
+    name and graduation year: the same email local part, the same job or
+    shared skills. Duplicate groups are merged transitively into their lowest ID.
+    """
+    records = {}
+    blocks = defaultdict(list)
+    with database_connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute("SELECT id, first_name, last_name, email, graduation_year, current_job FROM alumni")
+        while True:
+            rows = cursor.fetchmany(DEDUP_CHUNK_SIZE)
+            if not rows:
+                break
+            for record in rows:
+                records[record[0]] = record
+                for key in dedup_blocking_keys(record):
+                    blocks[key].append(record[0])
+        cursor.close()
+
+    pair_scores = {}
+    skipped = 0
+    for ids in blocks.values():
+        if len(ids) < 2:
+            continue
+        if len(ids) > max_block_size:
+            skipped += 1
+            continue
+        for i, a in enumerate(ids):
+            for b in ids[i + 1:]:
+                pair = (a, b) if a < b else (b, a)
+                if pair not in pair_scores:
+                    pair_scores[pair] = score_duplicate_pair(records[pair[0]], records[pair[1]])
+    if skipped:
+        logging.warning("Skipped %s oversized dedup blocks (more than %s records).", skipped, max_block_size)
+
+    # Union-find so chains of matches collapse into one group
+    parent = {}
+    def find(x):
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    matches = {pair: score for pair, score in pair_scores.items() if score >= threshold}
+    # Pairs matched on name and year alone need shared skills
+    unconfirmed = [pair for pair in matches if not corroborated_by_record(records[pair[0]], records[pair[1]])]
+    if unconfirmed:
+        with database_connection() as connection:
+            cursor = connection.cursor()
+            skill_ids = load_skill_ids(cursor, {member for pair in unconfirmed for member in pair})
+            cursor.close()
+        for a, b in unconfirmed:
+            if len(skill_ids[a] & skill_ids[b]) < DEDUP_MIN_SHARED_SKILLS:
+                del matches[(a, b)]
+    for a, b in matches:
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    best_score = {}
+    for (a, b), score in matches.items():
+        for member in (a, b):
+            best_score[member] = max(best_score.get(member, 0), score)
+    duplicates = [(find(member), member, best_score[member]) for member in best_score if find(member) != member]
+    logging.info("Compared %s candidate pairs across %s alumni, found %s duplicates.", len(pair_scores), len(records), len(duplicates))
+    return sorted(duplicates)
+
+def merge_duplicate_alumnus(keep_id, duplicate_id, score=None):
+    """Move everything owned by ``duplicate_id`` onto ``keep_id`` and delete the duplicate, in one transaction."""
+    def merge(cursor):
+        cursor.execute("SELECT id, email, current_job FROM alumni WHERE id IN (%s, %s) ORDER BY id FOR UPDATE", (keep_id, duplicate_id))
+        rows = {row[0]: row for row in cursor.fetchall()}
+        if keep_id not in rows or duplicate_id not in rows:
+            return False
+        keep_email, duplicate_email = rows[keep_id][1], rows[duplicate_id][1]
+        # Cached skill searches embed both rows: the duplicate disappears and the kept row may change
+        duplicate_skills, has_postings = searches_listing_alumnus(cursor, duplicate_id)
+        affected[:] = [duplicate_skills + searches_listing_alumnus(cursor, keep_id)[0], has_postings]
+
+        # Skills: move links that do not exist yet, then drop the rest
+        cursor.execute("UPDATE IGNORE alumni_skills SET alumnus_id = %s WHERE alumnus_id = %s", (keep_id, duplicate_id))
+        cursor.execute("DELETE FROM alumni_skills WHERE alumnus_id = %s", (duplicate_id,))
+        for table, column in ALUMNUS_ID_REFERENCES:
+            if table in ALUMNUS_ID_OVERLAPS:
+                same_row = " AND ".join(f"kept.{key} = duplicate.{key}" for key in ALUMNUS_ID_OVERLAPS[table])
+                cursor.execute(f"""
+                    DELETE duplicate FROM {table} duplicate
+                    JOIN {table} kept ON {same_row} AND kept.{column} = %s
+                    WHERE duplicate.{column} = %s
+                """, (keep_id, duplicate_id))
+            cursor.execute(f"UPDATE {table} SET {column} = %s WHERE {column} = %s", (keep_id, duplicate_id))
+        for table, column in ALUMNUS_EMAIL_REFERENCES:
+            if table in ALUMNUS_EMAIL_UNIQUE:
+                cursor.execute(f"UPDATE IGNORE {table} SET {column} = %s WHERE {column} = %s", (keep_email, duplicate_email))
+                cursor.execute(f"DELETE FROM {table} WHERE {column} = %s", (duplicate_email,))
+            else:
+                cursor.execute(f"UPDATE {table} SET {column} = %s WHERE {column} = %s", (keep_email, duplicate_email))
+        # Connections between the two records are now self-connections
+        cursor.execute("DELETE FROM alumni_connections WHERE requester_email = target_email")
+
+        if not rows[keep_id][2] and rows[duplicate_id][2]:
+            cursor.execute("UPDATE alumni SET current_job = %s WHERE id = %s", (rows[duplicate_id][2], keep_id))
+        cursor.execute(
+            "INSERT INTO alumni_merges (kept_id, merged_id, merged_email, score, merged_at) VALUES (%s, %s, %s, %s, NOW())",
+            (keep_id, duplicate_id, duplicate_email, score),
+        )
+        cursor.execute("DELETE FROM alumni WHERE id = %s", (duplicate_id,))
+        return True
+
+    affected = []
+    merged = run_in_transaction(merge)
+    if merged:
+        skill_names, has_postings = affected
+        invalidate_skill_searches(*skill_names)
+        if has_postings:
+            invalidate_all_job_searches()
+        name_index.remove(duplicate_id)
+        logging.info("Merged duplicate alumnus %s into %s.", duplicate_id, keep_id)
+    return merged
+
+def merge_duplicates(duplicates):
+    """Merge (keep_id, duplicate_id, score) tuples and notify listeners of every table written; returns the merge count."""
+    merged = 0
+    for keep_id, duplicate_id, score in duplicates:
+        try:
+            if merge_duplicate_alumnus(keep_id, duplicate_id, score):
+                merged += 1
+        except Exception as e:
+            logging.error("Failed to merge alumnus %s into %s: %s", duplicate_id, keep_id, e)
+    if merged:
+        mark_data_changed(*DEDUP_CHANGED_TABLES)
+    return merged
+
+def run_deduplication(threshold=DEDUP_MATCH_THRESHOLD, dry_run=True):
+    """
+    Find duplicate alumni; returns the duplicates found.
+
+    Merging deletes the duplicate records, so it only happens when called
+    with ``dry_run=False``.
+    """
+    start = time.perf_counter()
+    duplicates = find_duplicate_alumni(threshold)
+    merged = 0 if dry_run else merge_duplicates(duplicates)
+    logging.info("Deduplication finished in %.1fs: %s found, %s merged.", time.perf_counter() - start, len(duplicates), merged)
+    return duplicates
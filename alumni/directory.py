@@ -0,0 +1,253 @@
+"""Compact, read-mostly in-memory snapshot of the alumni table.
+
+Columns are stored separately: IDs and graduation years in typed arrays, names
+and jobs as interned strings shared between rows. Rows are exposed through
+``__slots__`` views, and email and ID hash indexes serve lookups without a
+database round trip. The snapshot is loaded in bulk once and then refreshed
+incrementally: rows changed since the last refresh are fetched by
+``updated_at``/``id``, and deletions are reconciled only when the row count
+disagrees with the table.
+"""
+import logging
+import sys
+import threading
+import time
+from array import array
+from datetime import timedelta
+
+from alumni.changes import on_data_changed
+from alumni.db import database_connection
+
+DIRECTORY_CHUNK_SIZE = 50_000
+DIRECTORY_REFRESH_SECONDS = 60
+DIRECTORY_COLUMNS = "id, first_name, last_name, email, graduation_year, current_job"
+
+def _intern(value):
+    return sys.intern(value) if value else ""
+
+def _year(value):
+    value = (value or "").strip()
+    return int(value) if value.isdigit() and int(value) < 32768 else 0
+
+class AlumnusRecord:
+    """
+    Read-only view of one directory row; iterates like the matching alumni table tuple.
+
+    The view holds the alumnus ID rather than a row position, since compaction
+    and reloads move rows; fields of an alumnus since deleted raise LookupError.
+    """
+
+    __slots__ = ("_directory", "_id")
+
+    def __init__(self, directory, alumnus_id):
+        self._directory = directory
+        self._id = alumnus_id
+
+    def _field(self, column):
+        directory = self._directory
+        with directory._lock:
+            index = directory._by_id.get(self._id)
+            if index is None:
+                raise LookupError(f"Alumnus {self._id} is no longer in the directory")
+            return getattr(directory, column)[index]
+
+    @property
+    def id(self):
+        return self._id
+
+    @property
+    def first_name(self):
+        return self._field("first_names")
+
+    @property
+    def last_name(self):
+        return self._field("last_names")
+
+    @property
+    def email(self):
+        return self._field("emails")
+
+    @property
+    def graduation_year(self):
+        year = self._field("years")
+        return str(year) if year else None
+
+    @property
+    def current_job(self):
+        return self._field("jobs") or None
+
+    def as_tuple(self):
+        return (self.id, self.first_name, self.last_name, self.email, self.graduation_year, self.current_job)
+
+    def __iter__(self):
+        return iter(self.as_tuple())
+
+    def __repr__(self):
+        return repr(self.as_tuple())
+
+class AlumniDirectory:
+    """Column-oriented alumni snapshot with ID and email indexes."""
+
+    def __init__(self, refresh_seconds=DIRECTORY_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self.ids = array('q')
+        self.years = array('h')
+        self.first_names = []
+        self.last_names = []
+        self.emails = []
+        self.jobs = []
+        self._by_id = {}
+        self._by_email = {}
+        self._lock = threading.RLock()
+        self._max_id = 0
+        self._refreshed_at = None
+        self._refreshed_time = 0.0
+        self.dirty = True
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def _store(self, row):
+        alumnus_id, first_name, last_name, email, graduation_year, current_job = row
+        index = self._by_id.get(alumnus_id)
+        if index is None:
+            index = len(self.ids)
+            self.ids.append(alumnus_id)
+            self.years.append(_year(graduation_year))
+            self.first_names.append(_intern(first_name))
+            self.last_names.append(_intern(last_name))
+            self.emails.append(email)
+            self.jobs.append(_intern(current_job))
+            self._by_id[alumnus_id] = index
+            self._max_id = max(self._max_id, alumnus_id)
+        else:
+            old_email = self.emails[index]
+            if old_email != email:
+                self._by_email.pop(old_email, None)
+            self.years[index] = _year(graduation_year)
+            self.first_names[index] = _intern(first_name)
+            self.last_names[index] = _intern(last_name)
+            self.emails[index] = email
+            self.jobs[index] = _intern(current_job)
+        self._by_email[email] = index
+
+    def _remove(self, alumnus_id):
+        index = self._by_id.pop(alumnus_id, None)
+        if index is None:
+            return
+        self._by_email.pop(self.emails[index], None)
+        # Leave a tombstone; compaction reclaims the slot later
+        self.ids[index] = 0
+        self.emails[index] = self.first_names[index] = self.last_names[index] = self.jobs[index] = ""
+
+    def _compact(self):
+        live = [index for index in range(len(self.ids)) if self.ids[index]]
+        self.ids = array('q', (self.ids[i] for i in live))
+        self.years = array('h', (self.years[i] for i in live))
+        self.first_names = [self.first_names[i] for i in live]
+        self.last_names = [self.last_names[i] for i in live]
+        self.emails = [self.emails[i] for i in live]
+        self.jobs = [self.jobs[i] for i in live]
+        self._by_id = {alumnus_id: index for index, alumnus_id in enumerate(self.ids)}
+        self._by_email = {email: index for index, email in enumerate(self.emails)}
+
+    def load(self, chunk_size=DIRECTORY_CHUNK_SIZE):
+        """Replace the snapshot with the full alumni table."""
+        fresh = AlumniDirectory(self.refresh_seconds)
+        with database_connection() as connection:
+            cursor = connection.cursor()
+            # The watermark is the database clock, which updated_at is written with
+            cursor.execute("SELECT NOW()")
+            started = cursor.fetchone()[0]
+            cursor.execute(f"SELECT {DIRECTORY_COLUMNS} FROM alumni ORDER BY id")
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                for row in rows:
+                    fresh._store(row)
+            cursor.close()
+        with self._lock:
+            for name in ("ids", "years", "first_names", "last_names", "emails", "jobs", "_by_id", "_by_email", "_max_id"):
+                setattr(self, name, getattr(fresh, name))
+            self._mark_refreshed(started)
+        logging.info("Alumni directory loaded with %s alumni.", len(self))
+
+    def refresh(self):
+        """Apply rows inserted or updated since the last refresh and drop deleted rows."""
+        if self._refreshed_at is None:
+            return self.load()
+        with database_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("SELECT NOW()")
+            started = cursor.fetchone()[0]
+            # updated_at has one second resolution, so look back one extra second
+            cursor.execute(f"SELECT {DIRECTORY_COLUMNS} FROM alumni WHERE updated_at >= %s OR id > %s",
+                           (self._refreshed_at - timedelta(seconds=1), self._max_id))
+            changed = cursor.fetchall()
+            cursor.execute("SELECT COUNT(*) FROM alumni")
+            table_count = cursor.fetchone()[0]
+            with self._lock:
+                for row in changed:
+                    self._store(row)
+                if table_count != len(self._by_id):
+                    cursor.execute("SELECT id FROM alumni")
+                    existing = {row[0] for row in cursor.fetchall()}
+                    for alumnus_id in [alumnus_id for alumnus_id in self._by_id if alumnus_id not in existing]:
+                        self._remove(alumnus_id)
+                if len(self.ids) > 1.25 * len(self._by_id) + 1000:
+                    self._compact()
+                self._mark_refreshed(started)
+            cursor.close()
+
+    def _mark_refreshed(self, started):
+        self._refreshed_at = started
+        self._refreshed_time = time.monotonic()
+        self.dirty = False
+
+    def refresh_if_stale(self):
+        if self._refreshed_at is None or self.dirty or time.monotonic() - self._refreshed_time > self.refresh_seconds:
+            self.refresh()
+
+    def get(self, alumnus_id):
+        """Return the record with ``alumnus_id``, or None."""
+        self.refresh_if_stale()
+        return AlumnusRecord(self, alumnus_id) if alumnus_id in self._by_id else None
+
+    def get_by_email(self, email):
+        """Return the record with ``email``, or None."""
+        self.refresh_if_stale()
+        with self._lock:
+            index = self._by_email.get(email)
+            return AlumnusRecord(self, self.ids[index]) if index is not None else None
+
+    def records(self):
+        """Return views of all alumni in ID order."""
+        self.refresh_if_stale()
+        with self._lock:
+            return [AlumnusRecord(self, alumnus_id) for alumnus_id in sorted(self._by_id)]
+
+    def memory_usage(self):
+        """Approximate bytes held by the columns and indexes, counting each distinct string once."""
+        with self._lock:
+            total = sum(sys.getsizeof(container) for container in (
+                self.ids, self.years, self.first_names, self.last_names, self.emails, self.jobs, self._by_id, self._by_email))
+            strings = {id(value): value for column in (self.first_names, self.last_names, self.emails, self.jobs) for value in column}
+            return total + sum(sys.getsizeof(value) for value in strings.values())
+
+_directory = None
+_directory_lock = threading.Lock()
+
+def get_directory():
+    """Return the process-wide alumni directory, loading it on first use."""
+    global _directory
+    with _directory_lock:
+        if _directory is None:
+            _directory = AlumniDirectory()
+            _directory.load()
+        return _directory
+
+@on_data_changed
+def mark_directory_dirty(tables):
+    if "alumni" in tables and _directory is not None:
+        _directory.dirty = True
@@ -0,0 +1,186 @@
+"""Events, attendance, invitations and RSVPs."""
+import logging
+
+from alumni import db
+from alumni.changes import mark_data_changed
+from alumni.db import database_connection, run_in_transaction
+from alumni.validation import validate_email, validate_event_description, validate_event_name
+
+def add_event(event_name, event_date, description):
+    """Add a new alumni event."""
+    if not validate_event_name(event_name):
+        logging.error("Invalid event name format.")
+        print("Invalid event name format. Please re-enter the event name.")
+        return
+    if not validate_event_description(description):
+        logging.error("Invalid event description.")
+        print("Invalid event description. Please re-enter the description.")
+        return
+    try:
+        with database_connection() as connection:
+            cursor = connection.cursor()
+            query = "INSERT INTO events (event_name, event_date, description) VALUES (%s, %s, %s)"
+            cursor.execute(query, (event_name, event_date, description))
+            connection.commit()
+            mark_data_changed("events")
+            logging.info("Event added successfully.")
+    except db.Error as db_err:
+        logging.error("Database error fetching all alumni: %s", db_err)
+        return []
+    except Exception as e:
+        logging.error("Failed to add event: %s", e)
+        print("An error occurred while adding the event.")
+
+def mark_attendance(alumnus_id, event_id):
+    """Mark attendance for an event."""
+    try:
+        with database_connection() as connection:
+            cursor = connection.cursor()
+            query = "INSERT INTO event_attendance (alumnus_id, event_id) VALUES (%s, %s)"
+            cursor.execute(query, (alumnus_id, event_id))
+            connection.commit()
+            mark_data_changed("event_attendance")
+            logging.info("Attendance marked successfully.")
+    except db.Error as db_err:
+        logging.error("Database error fetching all alumni: %s", db_err)
+        return []
+    except Exception as e:
+        logging.error("Failed to mark attendance: %s", e)
+        print("An error occurred while marking attendance.")
+
+def create_event(event_name, event_date, description, organizer_email):
+    """
+    Create a new alumni event.
+    """
+    try:
+        with database_connection() as connection:
+            cursor = connection.cursor()
+            query = "INSERT INTO events (event_name, event_date, description, organizer_email) VALUES (%s, %s, %s, %s)"
+            cursor.execute(query, (event_name, event_date, description, organizer_email))
+            connection.commit()
+            mark_data_changed("events")
+            logging.info("Event '%s' created successfully", event_name)
+            print("Event created successfully.")
+    except Exception as e:
+        logging.error("Failed to create event: %s", e)
+        print("An error occurred while creating the event.")
+
+INVITATION_CHUNK_SIZE = 1000
+INVITATION_FIELDS = ("email", "first_name", "last_name", "event_id", "event_name", "event_date", "description")
+
+def invite_attendees(event_id, attendee_emails, parallel=1):
+    """
+    Record invitations for an event in one transaction, then email them on ``parallel`` threads.
+
+    Emails that are malformed or do not belong to an alumnus are skipped. Each
+    invitation is personalized from a query joining the invitee and the event.
+    Invitations already sent are not sent again and each accepted email is
+    marked sent, so a retried run only emails the invitees it missed.
+    Returns a dict with the invited, skipped, sent and failed counts.
+    """
+    from alumni.mail import get_email_config, send_bulk
+    from alumni.templates import render_batch
+
+    emails = list(dict.fromkeys(email.strip() for email in attendee_emails if email.strip()))
+    stats = {"invited": 0, "invalid": 0, "unknown": 0, "already_sent": 0, "sent": 0, "failed": 0}
+    candidates = [email for email in emails if validate_email(email)]
+    stats["invalid"] = len(emails) - len(candidates)
+
+    def record_invitations(cursor):
+        recipients, already_sent = [], 0
+        for i in range(0, len(candidates), INVITATION_CHUNK_SIZE):
+            chunk = candidates[i:i + INVITATION_CHUNK_SIZE]
+            placeholders = ", ".join(["%s"] * len(chunk))
+            cursor.execute(f"""
+                SELECT alumni.email, alumni.first_name, alumni.last_name,
+                       events.event_id, events.event_name, events.event_date, events.description,
+                       event_invitations.sent_at
+                FROM alumni LEFT JOIN events ON events.event_id = %s
+                LEFT JOIN event_invitations
+                  ON event_invitations.event_id = events.event_id AND event_invitations.attendee_email = alumni.email
+                WHERE alumni.email IN ({placeholders})
+            """, (event_id,) + tuple(chunk))
+            rows = cursor.fetchall()
+            if rows and rows[0][3] is None:
+                raise ValueError(f"Event not found: {event_id}")
+            for row in rows:
+                if row[-1] is None:
+                    recipients.append(dict(zip(INVITATION_FIELDS, row)))
+                else:
+                    already_sent += 1
+        if recipients:
+            cursor.executemany("INSERT IGNORE INTO event_invitations (event_id, attendee_email) VALUES (%s, %s)",
+                               [(event_id, recipient["email"]) for recipient in recipients])
+        return recipients, already_sent
+
+    recipients, stats["already_sent"] = run_in_transaction(record_invitations) if candidates else ([], 0)
+    stats["invited"] = len(recipients)
+    stats["unknown"] = len(candidates) - len(recipients) - stats["already_sent"]
+
+    email_config = get_email_config()
+    if email_config:
+        sent = []
+        messages = render_batch("invitation", email_config[2], recipients)
+        stats["sent"], stats["failed"] = send_bulk(messages, email_config, parallel=parallel, on_sent=sent.append)
+        if sent:
+            run_in_transaction(mark_invitations_sent, event_id, sent)
+    else:
+        logging.error("Email configuration not found.")
+        stats["failed"] = len(recipients)
+    logging.info("Invitations for event ID %s: %s", event_id, stats)
+    return stats
+
+def mark_invitations_sent(cursor, event_id, emails):
+    """Record that the invitations of ``emails`` to the event were accepted by the mail server."""
+    for i in range(0, len(emails), INVITATION_CHUNK_SIZE):
+        chunk = emails[i:i + INVITATION_CHUNK_SIZE]
+        placeholders = ", ".join(["%s"] * len(chunk))
+        cursor.execute(f"""
+            UPDATE event_invitations SET sent_at = NOW()
+            WHERE event_id = %s AND attendee_email IN ({placeholders})
+        """, (event_id,) + tuple(chunk))
+
+def send_event_invitations(event_id, attendee_emails):
+    """
+    Queue invitations to a list of attendees for an event; returns the task ID.
+    """
+    try:
+        from alumni.tasks import enqueue
+        task_id = enqueue("events.invite", {"event_id": event_id, "emails": list(attendee_emails)})
+        print(f"Invitations queued as task {task_id}.")
+        return task_id
+    except Exception as e:
+        logging.error("Failed to queue invitations for event ID %s: %s", event_id, e)
+        print("An error occurred while sending invitations.")
+
+def handle_event_rsvp(event_id, attendee_email, rsvp_status):
+    """
+    Handle RSVP response for an event.
+    """
+    try:
+        with database_connection() as connection:
+            cursor = connection.cursor()
+            query = """
+                INSERT INTO event_rsvps (event_id, attendee_email, rsvp_status) 
+                VALUES (%s, %s, %s)
+                ON DUPLICATE KEY UPDATE rsvp_status = VALUES(rsvp_status);
+            """
+            cursor.execute(query, (event_id, attendee_email, rsvp_status))
+            connection.commit()
+            logging.info("RSVP status updated for event ID %s by %s", event_id, attendee_email)
+            print("RSVP status updated successfully.")
+            cursor.execute("""
+                SELECT alumni.first_name, alumni.last_name, events.event_name, events.event_date
+                FROM alumni JOIN events ON events.event_id = %s
+                WHERE alumni.email = %s
+            """, (event_id, attendee_email))
+            row = cursor.fetchone()
+        if row:
+            from alumni.tasks import enqueue
+            enqueue("email.templated", {"template": "rsvp_confirmation", "recipient": attendee_email, "fields": {
+                "first_name": row[0], "last_name": row[1], "event_name": row[2],
+                "event_date": row[3], "rsvp_status": rsvp_status,
+            }})
+    except Exception as e:
+        logging.error("Failed to update RSVP for event ID %s: %s", event_id, e)
+        print("An error occurred while updating the RSVP.")
@@ -0,0 +1,250 @@
+"""Job postings.
+
+Postings expire ``expires_in_days`` after they are posted, and the alumnus who
+posted one can close it earlier or mark it filled. Default queries only read
+active postings, and a background archiver moves expired, closed and filled ones
+to ``job_postings_archive`` so the live table stays the size of the active set.
+"""
+import logging
+import threading
+
+from alumni.cache import get_query_cache, invalidate_all_job_searches, invalidate_job_searches, normalize_query
+from alumni.changes import mark_data_changed
+from alumni.db import database_connection, run_in_transaction
+
+JOB_POSTING_DAYS = 60
+# Expired postings stay in job_postings this long before they are archived
+ARCHIVE_GRACE_DAYS = 30
+ARCHIVE_BATCH_SIZE = 500
+
+JOB_POSTING_COLUMNS = "job_id, alumnus_id, title, description, company, location, posted_date, expires_at, status"
+ACTIVE_JOB_CONDITION = "status = 'active' AND (expires_at IS NULL OR expires_at >= CURDATE())"
+# Statuses a posting can be closed with before it expires
+JOB_CLOSED_STATUSES = ("closed", "filled")
+
+job_archiver = None
+
+def post_job(user_email, title, description, company, location, expires_in_days=JOB_POSTING_DAYS):
+    """
+    Post a new job opportunity by an alumnus.
+
+    :param user_email: Email of the alumnus posting the job.
+    :param title: Job title.
+    :param description: Job description.
+    :param company: Company offering the job.
+    :param location: Location of the job.
+    :param expires_in_days: Days the posting stays listed.
+    """
+    try:
+        with database_connection() as connection:
+            cursor = connection.cursor()
+            # Retrieve alumnus_id based on email
+            cursor.execute("SELECT id FROM alumni WHERE email = %s", (user_email,))
+            alumnus_id_result = cursor.fetchone()
+            if alumnus_id_result:
+                alumnus_id = alumnus_id_result[0]
+
+                # Insert job posting
+                job_insert_query = """
+                    INSERT INTO job_postings (alumnus_id, title, description, company, location, posted_date, expires_at)
+                    VALUES (%s, %s, %s, %s, %s, NOW(), CURDATE() + INTERVAL %s DAY)
+                """
+                cursor.execute(job_insert_query, (alumnus_id, title, description, company, location, expires_in_days))
+
+                connection.commit()
+                mark_data_changed("job_postings")
+                invalidate_job_searches(title, description)
+                logging.info("Job '%s' posted successfully by alumnus ID %s.", title, alumnus_id)
+                print("Job posted successfully.")
+            else:
+                logging.error("Alumnus not found.")
+                print("Error: Alumnus not found.")
+    except Exception as e:
+        logging.error("Failed to post job: %s", e)
+        print("An error occurred while posting the job.")
+
+def close_job_posting(job_id, status="closed", user_email=None):
+    """
+    Take an active job posting off the listings before it expires.
+
+    :param job_id: ID of the posting.
+    :param status: "closed" or "filled".
+    :param user_email: When given, only a posting by this alumnus is closed.
+    :return: True if the posting was closed.
+    """
+    if status not in JOB_CLOSED_STATUSES:
+        logging.error("Invalid job posting status: %s", status)
+        print(f"Invalid status, choose from {', '.join(JOB_CLOSED_STATUSES)}.")
+        return False
+
+    def close(cursor):
+        query = "SELECT job_postings.title, job_postings.description FROM job_postings"
+        params = (job_id,)
+        if user_email is not None:
+            query += " JOIN alumni ON alumni.id = job_postings.alumnus_id AND alumni.email = %s"
+            params = (user_email, job_id)
+        cursor.execute(query + " WHERE job_postings.job_id = %s AND job_postings.status = 'active' FOR UPDATE", params)
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        cursor.execute("UPDATE job_postings SET status = %s WHERE job_id = %s", (status, job_id))
+        return row
+
+    try:
+        closed = run_in_transaction(close)
+        if closed is None:
+            logging.warning("No active job posting %s to close for %s.", job_id, user_email or "admin")
+            print("No active job posting with that ID was found.")
+            return False
+        mark_data_changed("job_postings")
+        invalidate_job_searches(*closed)
+        logging.info("Job posting %s marked %s.", job_id, status)
+        print(f"Job posting marked {status}.")
+        return True
+    except Exception as e:
+        logging.error("Failed to close job posting %s: %s", job_id, e)
+        print("An error occurred while closing the job posting.")
+        return False
+
+def search_jobs(search_term, limit=None, offset=0):
+    """
+    Search the active job postings based on a search term.
+
+    :param search_term: The term to search in job titles and descriptions.
+    :param limit: Maximum number of postings to return, all if None.
+    :param offset: Number of matching postings to skip.
+    """
+    term = normalize_query(search_term)
+
+    def run_query():
+        with database_connection(read_only=True) as connection:
+            cursor = connection.cursor()
+
+            # Search for jobs
+            search_query = f"""
+                SELECT * FROM job_postings
+                WHERE {ACTIVE_JOB_CONDITION} AND (title LIKE %s OR description LIKE %s)
+                ORDER BY job_id
+            """
+            like_term = f'%{term}%'
+            params = (like_term, like_term)
+            if limit is not None:
+                search_query += " LIMIT %s OFFSET %s"
+                params += (limit, offset)
+            cursor.execute(search_query, params)
+            return cursor.fetchall()
+
+    jobs = []
+    try:
+        jobs = get_query_cache().get_or_compute(("jobs", term, limit, offset), run_query, tags=("jobs:" + term,))
+        for job in jobs:
+            print(job)  # Format and display each job as needed
+
+        logging.info("Search completed for jobs with term '%s'.", search_term)
+    except Exception as e:
+        logging.error("Failed to search jobs: %s", e)
+        print("An error occurred while searching for jobs.")
+
+    return jobs
+
+def get_job_postings(include_archived=False):
+    """
+    Fetch job postings from the database.
+
+    :param include_archived: Also return expired and archived postings.
+    """
+    if include_archived:
+        query = f"""
+            SELECT {JOB_POSTING_COLUMNS} FROM job_postings
+            UNION ALL
+            SELECT {JOB_POSTING_COLUMNS} FROM job_postings_archive
+            ORDER BY job_id
+        """
+    else:
+        query = f"SELECT {JOB_POSTING_COLUMNS} FROM job_postings WHERE {ACTIVE_JOB_CONDITION} ORDER BY job_id"
+    try:
+        with database_connection(read_only=True) as connection:
+            cursor = connection.cursor()
+            cursor.execute(query)
+            jobs = cursor.fetchall()
+            return jobs  # Format as needed, e.g., a list of dictionaries
+    except Exception as e:
+        logging.error("Failed to fetch job postings: %s", e)
+        return []
+
+def _archive_batch(cursor, batch_size):
+    """Move up to ``batch_size`` stale postings to the archive; returns the number moved."""
+    cursor.execute("""
+        SELECT job_id FROM job_postings
+        WHERE status <> 'active'
+           OR expires_at < CURDATE() - INTERVAL %s DAY
+           OR (expires_at IS NULL AND posted_date < CURDATE() - INTERVAL %s DAY)
+        ORDER BY job_id
+        LIMIT %s
+        FOR UPDATE
+    """, (ARCHIVE_GRACE_DAYS, JOB_POSTING_DAYS + ARCHIVE_GRACE_DAYS, batch_size))
+    job_ids = [row[0] for row in cursor.fetchall()]
+    if not job_ids:
+        return 0
+    placeholders = ", ".join(["%s"] * len(job_ids))
+    cursor.execute(f"""
+        INSERT INTO job_postings_archive ({JOB_POSTING_COLUMNS}, archived_at)
+        SELECT job_id, alumnus_id, title, description, company, location, posted_date, expires_at,
+               IF(status = 'active', 'expired', status), NOW()
+        FROM job_postings WHERE job_id IN ({placeholders})
+    """, job_ids)
+    cursor.execute(f"DELETE FROM job_postings WHERE job_id IN ({placeholders})", job_ids)
+    return len(job_ids)
+
+def archive_job_postings(batch_size=ARCHIVE_BATCH_SIZE):
+    """
+    Move expired and closed postings to ``job_postings_archive``.
+
+    Each batch is copied and deleted in its own transaction, so locks are held
+    briefly and an interrupted run leaves every posting in exactly one table.
+
+    :return: The number of postings archived.
+    """
+    archived = 0
+    while True:
+        moved = run_in_transaction(_archive_batch, batch_size)
+        archived += moved
+        if moved < batch_size:
+            break
+    if archived:
+        mark_data_changed("job_postings")
+        invalidate_all_job_searches()
+        logging.info("Archived %s job postings.", archived)
+    return archived
+
+class JobArchiver:
+    """Background thread that archives stale job postings periodically."""
+
+    def __init__(self, interval_seconds=3600, batch_size=ARCHIVE_BATCH_SIZE):
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="job-archiver", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                archive_job_postings(self.batch_size)
+            except Exception as e:
+                logging.error("Failed to archive job postings: %s", e)
+            self._stop.wait(self.interval_seconds)
+
+def start_job_archiver(interval_seconds=3600):
+    """Start the background job archiver once per process."""
+    global job_archiver
+    if job_archiver is None:
+        job_archiver = JobArchiver(interval_seconds=interval_seconds)
+        job_archiver.start()
+    return job_archiver
@@ -0,0 +1,265 @@
+"""Precomputed landing views shown on the student menu's first screen.
+
+Each view (latest postings, featured alumni, upcoming events, recent
+achievements) is a short list computed by one bounded query and kept in
+memory. A background builder recomputes a view when one of its tables is
+written (see alumni.changes) or when it reaches its refresh cadence, which
+also picks up writes made by other processes. Readers never query the
+database once the page is warm: they get the current snapshot, and a stale
+view is served while its rebuild runs.
+
+A snapshot carries a version that increases whenever its content changes and
+an ETag derived from the content, so a caller holding the previous ETag can
+tell that nothing changed without comparing rows.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+
+from alumni.changes import on_data_changed
+from alumni.db import database_connection
+from alumni.jobs import ACTIVE_JOB_CONDITION
+
+LANDING_REFRESH_SECONDS = 120
+LANDING_ITEMS = 5
+FEATURED_ALUMNI_DAYS = 365
+
+LANDING_VIEWS = {}
+_landing_page = None
+_landing_lock = threading.Lock()
+
+def define_landing_view(name, title, tables, row_format, refresh_seconds=None):
+    """
+    Register a landing view computed by the decorated ``compute(cursor, limit)``.
+
+    :param tables: Tables the view reads; writes to them trigger a rebuild.
+    :param row_format: ``str.format`` pattern applied to each row for display.
+    :param refresh_seconds: Maximum view age, defaults to LANDING_REFRESH_SECONDS.
+    """
+    def register(compute):
+        LANDING_VIEWS[name] = {
+            "name": name,
+            "title": title,
+            "tables": tuple(tables),
+            "row_format": row_format,
+            "refresh_seconds": refresh_seconds or LANDING_REFRESH_SECONDS,
+            "compute": compute,
+        }
+        return compute
+    return register
+
+@define_landing_view("latest_postings", "Latest Job Postings", tables=("job_postings",),
+                     row_format="{1} at {2} ({3}), job ID {0}")
+def compute_latest_postings(cursor, limit):
+    cursor.execute(f"""
+        SELECT job_id, title, COALESCE(company, 'an undisclosed company'), COALESCE(location, 'location not given')
+        FROM job_postings WHERE {ACTIVE_JOB_CONDITION}
+        ORDER BY job_id DESC LIMIT %s
+    """, (limit,))
+    return cursor.fetchall()
+
+@define_landing_view("featured_alumni", "Featured Alumni", tables=("alumni", "alumni_achievements"),
+                     row_format="{0} {1}, {2} ({3} recent achievements)")
+def compute_featured_alumni(cursor, limit):
+    # Alumni with the most achievements over the past year, most recently active first
+    cursor.execute("""
+        SELECT alumni.first_name, alumni.last_name, COALESCE(alumni.current_job, 'alumnus'), COUNT(*)
+        FROM alumni_achievements
+        JOIN alumni ON alumni.id = alumni_achievements.alumnus_id
+        WHERE alumni_achievements.date_posted >= CURDATE() - INTERVAL %s DAY
+        GROUP BY alumni.id, alumni.first_name, alumni.last_name, alumni.current_job
+        ORDER BY COUNT(*) DESC, MAX(alumni_achievements.date_posted) DESC
+        LIMIT %s
+    """, (FEATURED_ALUMNI_DAYS, limit))
+    return cursor.fetchall()
+
+@define_landing_view("upcoming_events", "Upcoming Events", tables=("events",),
+                     row_format="{2}: {1} (event ID {0})")
+def compute_upcoming_events(cursor, limit):
+    cursor.execute("""
+        SELECT event_id, event_name, event_date FROM events
+        WHERE event_date >= CURDATE()
+        ORDER BY event_date, event_id LIMIT %s
+    """, (limit,))
+    return cursor.fetchall()
+
+@define_landing_view("recent_achievements", "Recent Achievements", tables=("alumni", "alumni_achievements"),
+                     row_format="{3}: {0} {1} - {2}")
+def compute_recent_achievements(cursor, limit):
+    cursor.execute("""
+        SELECT COALESCE(alumni.first_name, ''), COALESCE(alumni.last_name, ''), alumni_achievements.title,
+               alumni_achievements.date_posted
+        FROM alumni_achievements
+        LEFT JOIN alumni ON alumni.id = alumni_achievements.alumnus_id
+        ORDER BY alumni_achievements.date_posted DESC, alumni_achievements.achievement_id DESC
+        LIMIT %s
+    """, (limit,))
+    return cursor.fetchall()
+
+def _etag(payload):
+    digest = hashlib.sha1(json.dumps(payload, default=str, sort_keys=True).encode("utf-8")).hexdigest()
+    return f'"{digest[:20]}"'
+
+class LandingPage:
+    """In-memory landing views, rebuilt in the background when their tables change."""
+
+    def __init__(self, limit=LANDING_ITEMS, poll_seconds=30, debounce_seconds=1):
+        self.limit = limit
+        self.poll_seconds = poll_seconds
+        self.debounce_seconds = debounce_seconds
+        self.version = 0
+        self.etag = None
+        self._views = {}
+        self._dirty = set(LANDING_VIEWS)
+        self._lock = threading.Lock()
+        self._changed = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def mark_dirty(self, tables):
+        """Mark the views reading any of ``tables`` for rebuilding and wake the builder."""
+        with self._lock:
+            for name, definition in LANDING_VIEWS.items():
+                if set(tables) & set(definition["tables"]):
+                    self._dirty.add(name)
+        self._changed.set()
+
+    def due_views(self, now=None):
+        """Return the names of views that are missing, dirty or past their refresh cadence."""
+        now = now or time.monotonic()
+        with self._lock:
+            return [name for name, definition in LANDING_VIEWS.items()
+                    if name in self._dirty or name not in self._views
+                    or now - self._views[name]["built_at"] >= definition["refresh_seconds"]]
+
+    def rebuild(self, names=None):
+        """
+        Recompute the given views (default: the due ones) on one primary connection; returns their names.
+
+        A replica could still be missing the change that marked a view dirty.
+        """
+        names = self.due_views() if names is None else list(names)
+        if not names:
+            return []
+        with self._lock:
+            self._dirty.difference_update(names)
+        built = {}
+        try:
+            with database_connection() as connection:
+                cursor = connection.cursor()
+                for name in names:
+                    rows = [list(row) for row in LANDING_VIEWS[name]["compute"](cursor, self.limit)]
+                    built[name] = {"rows": rows, "built_at": time.monotonic()}
+        except Exception:
+            # Rebuild these views on the next pass
+            with self._lock:
+                self._dirty.update(name for name in names if name not in built)
+            raise
+        finally:
+            if built:
+                self._publish(built)
+        return names
+
+    def _publish(self, built):
+        with self._lock:
+            self._views.update(built)
+            etag = _etag({name: view["rows"] for name, view in self._views.items()})
+            if etag != self.etag:
+                self.etag = etag
+                self.version += 1
+
+    def snapshot(self, if_none_match=None):
+        """
+        Return the current views without querying the database, building them only if never built.
+
+        :param if_none_match: The ETag of a snapshot the caller already has.
+        :return: Dict with ``version``, ``etag`` and ``views``; ``views`` is None
+                 when ``if_none_match`` matches the current ETag.
+        """
+        with self._lock:
+            missing = [name for name in LANDING_VIEWS if name not in self._views]
+        if missing:
+            self.rebuild(missing)
+        if self.due_views():
+            self._changed.set()
+        with self._lock:
+            if if_none_match is not None and if_none_match == self.etag:
+                return {"version": self.version, "etag": self.etag, "views": None}
+            return {
+                "version": self.version,
+                "etag": self.etag,
+                "views": [
+                    {"name": name, "title": definition["title"], "row_format": definition["row_format"],
+                     "rows": self._views[name]["rows"]}
+                    for name, definition in LANDING_VIEWS.items() if name in self._views
+                ],
+            }
+
+    def start(self):
+        """Build every view in a background thread and keep them fresh."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="landing-builder", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._changed.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.rebuild()
+            except Exception as e:
+                logging.error("Failed to rebuild landing views: %s", e)
+            if self._changed.wait(self.poll_seconds):
+                self._changed.clear()
+                # Let a burst of writes settle before recomputing
+                self._stop.wait(self.debounce_seconds)
+
+def get_landing_page():
+    """Return the process-wide landing page, without building it."""
+    global _landing_page
+    with _landing_lock:
+        if _landing_page is None:
+            _landing_page = LandingPage()
+        return _landing_page
+
+def warm_landing_page():
+    """Build the landing views in the background once, so the first student screen is served from memory."""
+    page = get_landing_page()
+    page.start()
+    return page
+
+@on_data_changed
+def mark_landing_views_dirty(tables):
+    if _landing_page is not None:
+        _landing_page.mark_dirty(tables)
+
+def render_landing(snapshot):
+    lines = []
+    for view in snapshot["views"]:
+        lines.append(f"\n{view['title']}:")
+        if not view["rows"]:
+            lines.append("  Nothing yet.")
+        for row in view["rows"]:
+            lines.append("  " + view["row_format"].format(*row))
+    return "\n".join(lines)
+
+def show_landing(if_none_match=None):
+    """
+    Print the landing views unless they are unchanged since ``if_none_match``.
+
+    :return: The ETag of the views now on screen.
+    """
+    try:
+        snapshot = get_landing_page().snapshot(if_none_match)
+    except Exception as e:
+        logging.error("Failed to load landing views: %s", e)
+        return if_none_match
+    if snapshot["views"] is not None:
+        print(render_landing(snapshot))
+    return snapshot["etag"]
@@ -0,0 +1,188 @@
+"""Queue-backed structured logging.
+
+Callers only enqueue records; a QueueListener thread formats them as JSON lines
+and writes them to a size-rotated file.
+
+Run ``python -m alumni.logs [--calls N]`` to measure the caller-side cost of a
+log call against a synchronous file handler.
+"""
+import atexit
+import contextvars
+import logging
+import logging.handlers
+import json
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+LOG_FILE = 'alumni_system.log'
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+LOG_SAMPLE_BURST = 20
+LOG_SAMPLE_EVERY = 100
+LOG_SAMPLE_WINDOW_SECONDS = 60
+
+correlation_id = contextvars.ContextVar("correlation_id", default=None)
+log_listener = None
+_stop_registered = False
+
+@contextmanager
+def log_context(request_id=None):
+    """Tag every record logged inside the block with a correlation ID."""
+    token = correlation_id.set(request_id or os.urandom(6).hex())
+    try:
+        yield correlation_id.get()
+    finally:
+        correlation_id.reset(token)
+
+class JsonLogFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "correlation_id": getattr(record, "correlation_id", None),
+            "thread": record.threadName,
+        }
+        if getattr(record, "suppressed", 0):
+            entry["suppressed"] = record.suppressed
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class SamplingFilter(logging.Filter):
+    """
+    Thin out repetitive records from ``min_level`` up to ``max_level``.
+
+    Per message template, the first ``burst`` records of every ``window`` seconds
+    pass, then one in ``every``. Passed records carry the number suppressed since
+    the previous one. Only warnings are sampled by default: INFO records such as
+    audit lines always pass, and errors are never sampled.
+    """
+
+    def __init__(self, min_level=logging.WARNING, max_level=logging.WARNING, burst=LOG_SAMPLE_BURST,
+                 every=LOG_SAMPLE_EVERY, window=LOG_SAMPLE_WINDOW_SECONDS):
+        super().__init__()
+        self.min_level = min_level
+        self.max_level = max_level
+        self.burst = burst
+        self.every = every
+        self.window = window
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def filter(self, record):
+        if not self.min_level <= record.levelno <= self.max_level:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            state = self._counts.get(record.msg)
+            if state is None or now - state[0] >= self.window:
+                state = self._counts[record.msg] = [now, 0, 0]
+            state[1] += 1
+            if state[1] <= self.burst or (state[1] - self.burst) % self.every == 0:
+                record.suppressed = state[2]
+                state[2] = 0
+                return True
+            state[2] += 1
+            return False
+
+class ContextQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that defers message formatting to the listener thread."""
+
+    def prepare(self, record):
+        # The stock prepare() formats the message on the calling thread; only
+        # capture the context-local correlation ID here.
+        record.correlation_id = correlation_id.get()
+        return record
+
+def configure_logging(filename=LOG_FILE, level=logging.INFO):
+    """Route root logging through a queue to a rotating JSON log file."""
+    global log_listener, _stop_registered
+    stop_logging()
+
+    file_handler = logging.handlers.RotatingFileHandler(filename, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8')
+    file_handler.setFormatter(JsonLogFormatter())
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = ContextQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter())
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+
+    log_listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    log_listener.start()
+    if not _stop_registered:
+        atexit.register(stop_logging)
+        _stop_registered = True
+    return log_listener
+
+def stop_logging():
+    """Flush queued records and stop the listener thread."""
+    global log_listener
+    if log_listener is not None:
+        log_listener.stop()
+        log_listener = None
+
+def benchmark_logging(calls=100_000):
+    """
+    Measure the caller-side cost of one log call, in microseconds.
+
+    Compares the queued pipeline with a synchronous file handler, and a call
+    below the logger level that is discarded before any formatting.
+    """
+    import tempfile
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        logger = logging.getLogger("alumni.benchmark")
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        row = {"email": "someone@example.com", "first_name": "Some", "last_name": "One", "graduation_year": "2020"}
+
+        sync_handler = logging.FileHandler(os.path.join(directory, "sync.log"), encoding='utf-8')
+        sync_handler.setFormatter(JsonLogFormatter())
+        log_queue = queue.SimpleQueue()
+        async_handler = logging.handlers.RotatingFileHandler(os.path.join(directory, "async.log"), maxBytes=LOG_MAX_BYTES, backupCount=1, encoding='utf-8')
+        async_handler.setFormatter(JsonLogFormatter())
+        listener = logging.handlers.QueueListener(log_queue, async_handler)
+
+        def timed(handler, log_call):
+            logger.handlers = [handler]
+            start = time.perf_counter()
+            for _ in range(calls):
+                log_call("Duplicate entry skipped: %s", row)
+            return (time.perf_counter() - start) / calls * 1e6
+
+        results["synchronous_file"] = timed(sync_handler, logger.info)
+        listener.start()
+        results["queued"] = timed(ContextQueueHandler(log_queue), logger.info)
+        listener.stop()
+        results["discarded"] = timed(ContextQueueHandler(log_queue), logger.debug)
+        sync_handler.close()
+        async_handler.close()
+        logger.handlers = []
+    return results
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure the caller-side cost of a log call.")
+    parser.add_argument("--calls", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    results = benchmark_logging(args.calls)
+    print(json.dumps({name: round(micros, 3) for name, micros in results.items()}, indent=2))
+
+if __name__ == "__main__":
+    main()
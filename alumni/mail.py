@@ -0,0 +1,189 @@
+"""Email configuration and delivery."""
+import logging
+import smtplib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+
+from alumni.db import database_connection
+from alumni.profiling import phase
+from alumni.templates import render_batch
+
+# Messages sent over one SMTP connection before it is replaced
+SMTP_BATCH_SIZE = 500
+
+def get_email_config():
+    """Retrieve email configuration from the database."""
+    try:
+        with database_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("SELECT host, port, email_address, email_password FROM email_config LIMIT 1")
+            config = cursor.fetchone()
+            return config
+    except Exception as e:
+        logging.error("Error retrieving email config: %s", e)
+        return None
+    
+def insert_email_config(host, port, email_address, email_password):
+    try:
+        with database_connection() as connection:
+            cursor = connection.cursor()
+            query = """
+                INSERT INTO email_config (host, port, email_address, email_password) 
+                VALUES (%s, %s, %s, %s)
+            """
+            cursor.execute(query, (host, port, email_address, email_password))
+            connection.commit()
+            print("Email configuration inserted successfully.")
+    except Exception as e:
+        print(f"Failed to insert email configuration: {e}")
+
+def send_email(recipient, subject, body, email_config=None):
+    """Send a plain text email; returns True on success. Pass ``email_config`` to skip the lookup."""
+    email_config = email_config or get_email_config()
+    if not email_config:
+        logging.error("Email configuration not found.")
+        return False
+
+    try:
+        # Create MIME message
+        msg = MIMEMultipart()
+        msg['From'] = email_config[2]
+        msg['To'] = recipient
+        msg['Subject'] = subject
+        msg.attach(MIMEText(body, 'plain'))
+
+        # Connect to server and send email
+        server = open_smtp(email_config)
+        with phase("smtp.send"):
+            server.send_message(msg)
+        server.quit()
+
+        logging.info("Email sent to %s", recipient)
+        return True
+    except smtplib.SMTPException as e:
+        logging.error("SMTP error occurred: %s", e)
+    except Exception as e:
+        logging.error("Failed to send email: %s", e)
+    return False
+
+def open_smtp(email_config):
+    """Return a logged-in SMTP connection for ``email_config``."""
+    with phase("smtp.connect"):
+        server = smtplib.SMTP(email_config[0], email_config[1])
+        server.starttls()
+        server.login(email_config[2], email_config[3])
+    return server
+
+def send_messages(messages, email_config, unavailable=None, on_sent=None):
+    """
+    Send pre-rendered (recipient, message bytes) pairs over one SMTP connection.
+
+    A message of ``None`` counts as failed. The connection is reopened once if
+    the server drops it. When the server cannot be reached or refuses the
+    login, the rest of the batch is not attempted and ``unavailable`` (a
+    threading.Event shared by the batches of one send) is set so the other
+    batches stop too. ``on_sent(recipient)`` is called after each message
+    the server accepts. Returns the number of messages sent.
+    """
+    sent = 0
+    server = None
+    try:
+        for recipient, message in messages:
+            if unavailable is not None and unavailable.is_set():
+                break
+            if message is None:
+                continue
+            for attempt in range(2):
+                if server is None:
+                    try:
+                        server = open_smtp(email_config)
+                    except (smtplib.SMTPException, OSError) as e:
+                        # Every later message would fail the same way
+                        logging.error("Cannot connect or log in to SMTP server %s, stopping the batch: %s", email_config[0], e)
+                        if unavailable is not None:
+                            unavailable.set()
+                        return sent
+                try:
+                    with phase("smtp.send"):
+                        server.sendmail(email_config[2], [recipient], message)
+                    sent += 1
+                    if on_sent is not None:
+                        on_sent(recipient)
+                    break
+                except smtplib.SMTPServerDisconnected as e:
+                    server = None
+                    if attempt:
+                        logging.error("Failed to send email to %s: %s", recipient, e)
+                except smtplib.SMTPException as e:
+                    logging.error("SMTP error sending to %s: %s", recipient, e)
+                    break
+    except Exception as e:
+        logging.error("Failed to send emails: %s", e)
+    finally:
+        if server is not None:
+            try:
+                server.quit()
+            except smtplib.SMTPException:
+                pass
+    return sent
+
+def send_bulk(messages, email_config=None, parallel=1, batch_size=SMTP_BATCH_SIZE, on_sent=None):
+    """
+    Send an iterable of (recipient, message bytes) in batches sharing one SMTP connection each.
+
+    Messages are consumed lazily, so a large campaign is rendered while it is
+    being sent. Batches go out on ``parallel`` threads. Sending stops once the
+    server cannot be reached or refuses the login. ``on_sent(recipient)`` is
+    called for every message the server accepts. Returns (sent, failed).
+    """
+    email_config = email_config or get_email_config()
+    messages = iter(messages)
+    if not email_config:
+        logging.error("Email configuration not found.")
+        return 0, sum(1 for _ in messages)
+
+    def batches():
+        while True:
+            batch = list(islice(messages, batch_size))
+            if not batch:
+                return
+            yield batch
+
+    unavailable = threading.Event()
+    sent = total = 0
+    if parallel > 1:
+        with ThreadPoolExecutor(max_workers=parallel) as executor:
+            pending = []
+            for batch in batches():
+                total += len(batch)
+                if unavailable.is_set():
+                    break
+                pending.append(executor.submit(send_messages, batch, email_config, unavailable, on_sent))
+                # Bound the rendered messages held in memory
+                if len(pending) >= parallel * 2:
+                    sent += pending.pop(0).result()
+            sent += sum(future.result() for future in pending)
+    else:
+        for batch in batches():
+            total += len(batch)
+            if unavailable.is_set():
+                break
+            sent += send_messages(batch, email_config, unavailable, on_sent)
+    if unavailable.is_set():
+        # Unsent messages count as failed
+        total += sum(1 for _ in messages)
+    return sent, total - sent
+
+def send_templated_email(template, recipient, fields, email_config=None):
+    """Render ``template`` for one recipient and send it; returns True on success."""
+    email_config = email_config or get_email_config()
+    if not email_config:
+        logging.error("Email configuration not found.")
+        return False
+    sent, _ = send_bulk(render_batch(template, email_config[2], [dict(fields, email=recipient)]), email_config)
+    if sent:
+        logging.info("Email '%s' sent to %s", template, recipient)
+    return bool(sent)
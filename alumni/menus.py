@@ -0,0 +1,405 @@
+"""Interactive menus.
+
+Import/export, reports, analytics, deduplication, the directory, landing
+views, related skills, task workers and profiling are imported when their
+menu entry or startup step runs, so importing the menus stays cheap.
+"""
+import threading
+
+from alumni.db import get_db_settings, set_current_user, set_db_password
+from alumni.events import add_event, handle_event_rsvp, mark_attendance
+from alumni.jobs import JOB_POSTING_DAYS, close_job_posting, get_job_postings, post_job, start_job_archiver
+from alumni.logs import configure_logging, log_context
+from alumni.names import fuzzy_search_alumni_by_name
+from alumni.profile import add_skill_to_profile, remove_skill_from_profile, update_alumnus_profile, update_job_history, view_job_history
+from alumni.records import (add_alumnus, add_skill, alumnus_login, delete_alumnus, register_alumnus,
+                            search_alumni_by_skill, update_alumnus)
+
+roles = {
+    "admin": "adminpwd",  
+    "student": "studentpwd",
+}
+
+current_role = None
+
+def login():
+    """Handle user login."""
+    global current_role
+    while True:
+        role_input = input("Are you a 'student' or an 'admin'? ").lower()
+        if role_input in roles:
+            password = input("Enter password: ")
+            if password == roles[role_input]:
+                current_role = role_input
+                break
+            else:
+                print("Incorrect password, try again.")
+        else:
+            print("Invalid role, try again.")
+
+def admin_menu():
+    """Display the admin menu."""
+    while True:
+        print("\nAdmin Menu")
+        print("1. Add Alumnus")
+        print("2. List All Alumni")
+        print("3. Update Alumnus")
+        print("4. Delete Alumnus")
+        print("5. Add Skill")
+        print("6. Search by Name")
+        print("7. Search by Skill")
+        print("8. Add Event")
+        print("9. Mark Attendance")
+        print("10. Batch Import Alumni Data")
+        print("11. Batch Export Alumni Data")
+        print("12. Generate Report")
+        print("13. Handle Event RSVP")
+        print("14. Job History Analytics")
+        print("15. Find and Merge Duplicate Alumni")
+        print("16. Background Task Status")
+        print("17. Exit")
+
+        choice = input("Enter your choice: ")
+
+        if choice == '1':
+            first_name = str(input("Enter First Name: "))
+            last_name = str(input("Enter Last Name: "))
+            email = str(input("Enter Email: "))
+            graduation_year = str(int(input("Enter Graduation Year: ")))
+            current_job = str(input("Enter Current Job: "))
+            add_alumnus(first_name, last_name, email, graduation_year, current_job)
+            print("Alumnus added successfully!")
+
+        elif choice == '2':
+            from alumni.directory import get_directory
+            for record in get_directory().records():
+                print(record)
+
+        elif choice == '3':
+            id = int(input("Enter the ID of the alumnus to update: "))
+            first_name = str(input("Enter new First Name (or press Enter to skip): "))
+            last_name = str(input("Enter new Last Name (or press Enter to skip): "))
+            email = str(input("Enter new Email (or press Enter to skip): "))
+            graduation_year = str(input("Enter new Graduation Year (or press Enter to skip): "))
+            current_job = str(input("Enter new Current Job (or press Enter to skip): "))
+
+            update_alumnus(id, first_name or None, last_name or None, email or None, int(graduation_year) if graduation_year else None, current_job or None)
+            print("Alumnus updated successfully!")
+
+        elif choice == '4':
+            id = int(input("Enter the ID of the alumnus to delete: "))
+            delete_alumnus(id)
+            print("Alumnus deleted successfully!")
+
+
+        elif choice == '5':
+            skill_name = str(input("Enter Skill Name: "))
+            add_skill(skill_name)
+            print("Skill added successfully!")
+
+        elif choice == '6':
+            name = input("Enter Name to Search: ")
+            results = fuzzy_search_alumni_by_name(name)
+            for result in results:
+                print(result)
+
+        elif choice == '7':
+            skill_name = str(input("Enter Skill to Search: "))
+            results = search_alumni_by_skill(skill_name)
+            for result in results:
+                print(result)
+
+        elif choice == '8':
+            event_name = input("Enter Event Name: ")
+            event_date = input("Enter Event Date (YYYY-MM-DD): ")
+            description = input("Enter Event Description: ")
+            add_event(event_name, event_date, description)
+            print("Event added successfully!")
+
+        elif choice == '9':
+            alumnus_id = int(input("Enter Alumnus ID: "))
+            event_id = int(input("Enter Event ID: "))
+            mark_attendance(alumnus_id, event_id)
+            print("Attendance marked successfully!")
+
+        elif choice == '10':
+            from alumni.transfer import batch_import
+            file_path = input("Enter the path of the CSV file to import: ")
+            batch_import(file_path)
+
+        elif choice == '11':
+            from alumni.transfer import batch_export
+            file_path = input("Enter the path to export the CSV file: ")
+            batch_export(file_path)
+        
+        elif choice == '12':
+            from alumni.reports import generate_report
+            generate_report()
+        
+        elif choice == '13':
+            event_id = input("Enter Event ID: ")
+            attendee_email = input("Enter Attendee Email: ")
+            rsvp_status = input("Enter RSVP Status (Yes/No/Maybe): ")
+            handle_event_rsvp(event_id, attendee_email, rsvp_status)
+        
+        elif choice == '14':
+            from alumni.analytics import generate_job_history_analytics
+            generate_job_history_analytics()
+
+        elif choice == '15':
+            from alumni.dedup import merge_duplicates, run_deduplication
+            duplicates = run_deduplication()
+            for keep_id, duplicate_id, score in duplicates:
+                print(f"Alumnus {duplicate_id} duplicates {keep_id} (score {score:.2f})")
+            if duplicates and input(f"Merge {len(duplicates)} duplicates? (y/n): ").lower() == 'y':
+                merged = merge_duplicates(duplicates)
+                print(f"Merged {merged} of {len(duplicates)} duplicates.")
+            elif not duplicates:
+                print("No duplicates found.")
+
+        elif choice == '16':
+            from alumni.tasks import list_tasks, queue_stats
+            stats = queue_stats()
+            print(f"Queued: {stats['depth']} ready, oldest waiting {stats['oldest_queued_seconds']}s")
+            print("Tasks by status: " + ", ".join(f"{status} {count}" for status, count in stats["counts"].items()))
+            for worker in stats["workers"]:
+                print(f"Worker {worker['worker']}: {worker['tasks_done']} done, {worker['tasks_failed']} failed, "
+                      f"{worker['utilization']:.0%} busy")
+            for task in list_tasks(limit=10):
+                print(f"Task {task['task_id']} {task['name']}: {task['status']} after {task['attempts']} attempts"
+                      + (f" ({task['last_error']})" if task['last_error'] else ""))
+
+        elif choice == '17':
+            print("Exiting admin menu.")
+            break
+        
+        else:
+            print("Invalid choice. Please try again.")
+
+def admin_login():
+    """Handle admin login."""
+    global current_role
+    while True:
+        admin_pwd = input("Enter admin password: ")
+        if admin_pwd == roles['admin']:
+            current_role = 'admin'
+            break
+        else:
+            print("Incorrect password, try again.")
+
+def alumni_menu(user_email):
+    while True:
+        print("\nAlumni Menu")
+        print("1. Update Profile Information")
+        print("2. Add Skill to Profile")
+        print("3. Remove Skill from Profile")
+        print("4. View Job History")
+        print("5. Update Job History")
+        print("6. Post Job Opportunity")
+        print("7. Close or Fill Job Posting")
+        print("8. Manage Job Alerts")
+        print("9. Logout")
+
+        choice = input("Enter your choice: ")
+
+        if choice == '1':
+            update_alumnus_profile(user_email)
+        elif choice == '2':
+            skill = input("Enter the skill you want to add: ")
+            add_skill_to_profile(user_email, skill)
+            from alumni.skills import related_skills
+            suggestions = related_skills(skill, limit=5)
+            if suggestions:
+                print("Alumni with this skill also list: " + ", ".join(row[0] for row in suggestions))
+        elif choice == '3':
+            skill = input("Enter the skill you want to remove: ")
+            remove_skill_from_profile(user_email, skill)
+        elif choice == '4':
+            view_job_history(user_email)
+        elif choice == '5':
+            update_job_history(user_email)
+        elif choice == '6':
+            job_title = input("Enter job title: ")
+            job_description = input("Enter job description: ")
+            company_name = input("Enter company name: ")
+            job_location = input("Enter job location: ")
+            expires_in = input(f"Days until the posting expires [{JOB_POSTING_DAYS}]: ").strip()
+            post_job(user_email, job_title, job_description, company_name, job_location,
+                     int(expires_in) if expires_in.isdigit() else JOB_POSTING_DAYS)
+        elif choice == '7':
+            job_id = input("Enter the job ID: ").strip()
+            filled = input("Was the position filled? (y/n): ").strip().lower() == 'y'
+            if job_id.isdigit():
+                close_job_posting(int(job_id), "filled" if filled else "closed", user_email=user_email)
+            else:
+                print("Invalid job ID.")
+        elif choice == '8':
+            job_alerts_menu(user_email)
+        elif choice == '9':
+            print("Logging out.")
+            break
+        else:
+            print("Invalid choice, please try again.")
+
+_verified_alert_emails = set()
+
+def verify_alert_email(email, attempts=3):
+    """Return ``email`` once the user enters the code emailed to it, or None; verified once per session."""
+    if email in _verified_alert_emails:
+        return email
+    import hmac
+    from alumni.alerts import send_alert_verification_code
+    code = send_alert_verification_code(email)
+    if code is None:
+        return None
+    print(f"We emailed a verification code to {email}.")
+    for _ in range(attempts):
+        if hmac.compare_digest(input("Enter the code: ").strip(), code):
+            _verified_alert_emails.add(email)
+            return email
+        print("Incorrect code.")
+    return None
+
+def job_alerts_menu(email):
+    from alumni.alerts import list_job_alerts, subscribe_job_alert, unsubscribe_job_alert
+    while True:
+        print("\nYour Job Alerts")
+        for subscription_id, kind, term in list_job_alerts(email):
+            print(f"{subscription_id}. {kind}: {term}")
+        print("\n1. Add Search Term Alert")
+        print("2. Add Skill Alert")
+        print("3. Remove Alert")
+        print("4. Back")
+
+        choice = input("Enter your choice: ")
+
+        if choice == '1':
+            subscribe_job_alert(email, input("Enter search term: "), "search")
+        elif choice == '2':
+            subscribe_job_alert(email, input("Enter skill: "), "skill")
+        elif choice == '3':
+            subscription_id = input("Enter the alert number to remove: ").strip()
+            if subscription_id.isdigit():
+                unsubscribe_job_alert(email, int(subscription_id))
+            else:
+                print("Invalid alert number.")
+        elif choice == '4':
+            break
+        else:
+            print("Invalid choice, please try again.")
+
+def student_menu():
+    from alumni.landing import show_landing
+    shown_landing = None
+    while True:
+        # Reprinted only when the highlights changed since they were last shown
+        shown_landing = show_landing(shown_landing)
+        print("\nStudent Menu")
+        print("1. List All Alumni")
+        print("2. Search by Name")
+        print("3. Search by Skill")
+        print("4. View Job Postings")
+        print("5. Subscribe to Job Alerts")
+        print("6. Exit")
+
+        choice = input("Enter your choice: ")
+
+        if choice == '1':
+            from alumni.directory import get_directory
+            for record in get_directory().records():
+                print(record)
+
+        elif choice == '2':
+            name = input("Enter Name to Search: ")
+            results = fuzzy_search_alumni_by_name(name)
+            for result in results:
+                print(result)
+
+        elif choice == '3':
+            skill_name = input("Enter Skill to Search: ")
+            results = search_alumni_by_skill(skill_name)
+            for result in results:
+                print(result)
+
+        elif choice == '4':
+            print("Job Postings:")
+            # Assuming there's a function to fetch job postings
+            jobs = get_job_postings()
+            for job in jobs:
+                print(job)  # Format job posting for display
+
+        elif choice == '5':
+            email = verify_alert_email(input("Enter your email: ").strip())
+            if email:
+                job_alerts_menu(email)
+
+        elif choice == '6':
+            print("Exiting student menu.")
+            break
+        else:
+            print("Invalid choice, please try again.")
+
+_directory_warming = None
+
+def warm_directory():
+    """Load the alumni directory in the background once, so the first listing is served from memory."""
+    global _directory_warming
+    if _directory_warming is None:
+        from alumni.directory import get_directory
+        _directory_warming = threading.Thread(target=get_directory, name="directory-warmup", daemon=True)
+        _directory_warming.start()
+
+def main_menu():
+    if get_db_settings()["password"] is None:
+        set_db_password()
+    from alumni.landing import warm_landing_page
+    from alumni.reports import start_report_scheduler
+    from alumni.tasks import start_task_workers
+    start_report_scheduler()
+    start_job_archiver()
+    start_task_workers()
+    warm_directory()
+    warm_landing_page()
+
+    print("\nMain Menu")
+    print("1. Admin Login")
+    print("2. Student Login")
+    print("3. Alumni Registration")
+    print("4. Alumni Login")
+    print("5. Exit")
+
+    choice = input("Enter your choice: ")
+
+    if choice == '1':
+        admin_login()
+        set_current_user("admin")
+        admin_menu()  # Assuming admin_menu is defined elsewhere
+    elif choice == '2':
+        student_menu()  # Assuming student_menu is defined elsewhere
+    elif choice == '3':
+        register_alumnus()
+    elif choice == '4':
+        email = input("Enter your email: ")
+        if alumnus_login(email):
+            set_current_user(email)
+            alumni_menu(email)  # Pass the logged-in user's email
+        else:
+            print("Login failed")
+    elif choice == '5':
+        print("Goodbye!")
+        exit()
+    else:
+        print("Invalid choice, please try again.")
+
+def run(profile=None):
+    """
+    Run the interactive menus until the user exits.
+
+    :param profile: Profiling mode for the session ("sample" or "cprofile"); defaults to ALUMNI_PROFILE.
+    """
+    from alumni.profiling import profile_run
+    configure_logging()
+    with profile_run("menus", profile):
+        while True:
+            with log_context():
+                main_menu()
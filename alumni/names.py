@@ -0,0 +1,241 @@
+"""Typo-tolerant alumni name search backed by an in-memory trigram index.
+
+The index is loaded in bulk on the first search and then refreshed
+incrementally, like the alumni directory: rows changed since the last refresh
+are fetched by ``updated_at``/``id``, so alumni added or renamed by the CLI,
+the task workers or other processes become searchable.
+"""
+import heapq
+import logging
+import math
+import threading
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from alumni import db
+from alumni.changes import on_data_changed
+from alumni.db import database_connection
+
+NAME_NGRAM_SIZE = 3
+NAME_INDEX_REFRESH_SECONDS = 60
+FUZZY_NAME_THRESHOLD = 0.3
+FUZZY_NAME_LIMIT = 10
+
+def normalize_name(name):
+    """Lower-case a name, fold accents (José -> jose) and drop punctuation."""
+    decomposed = unicodedata.normalize("NFKD", name or "")
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    cleaned = "".join(ch if ch.isalnum() else " " for ch in stripped.casefold())
+    return " ".join(cleaned.split())
+
+def name_ngrams(normalized, n=NAME_NGRAM_SIZE):
+    """Return the set of padded character n-grams of an already normalized name."""
+    grams = set()
+    for word in normalized.split():
+        padded = " " * (n - 1) + word + " "
+        grams.update(padded[i:i + n] for i in range(len(padded) - n + 1))
+    return grams
+
+def edit_distance(a, b):
+    """Levenshtein distance between two strings."""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+class NameIndex:
+    """
+    Trigram index over alumni first and last names.
+
+    Each name field is an entry keyed ``alumnus_id * 2 + field``. Searches only
+    score entries that can still reach the Jaccard threshold: candidates are
+    drawn from the posting lists of the rarest query grams (prefix filtering)
+    and pruned by gram count before any edit distance is computed.
+    """
+
+    def __init__(self, n=NAME_NGRAM_SIZE, refresh_seconds=NAME_INDEX_REFRESH_SECONDS):
+        self.n = n
+        self.refresh_seconds = refresh_seconds
+        self.loaded = False
+        self.dirty = False
+        self._lock = threading.RLock()
+        self._postings = defaultdict(set)
+        self._entries = {}
+        self._max_id = 0
+        self._refreshed_at = None
+        self._refreshed_time = 0.0
+
+    def __len__(self):
+        return len(self._entries) // 2
+
+    def add(self, alumnus_id, first_name, last_name):
+        """Index (or re-index) the names of one alumnus."""
+        with self._lock:
+            self.remove(alumnus_id)
+            for field, name in enumerate((first_name, last_name)):
+                normalized = normalize_name(name)
+                entry = alumnus_id * 2 + field
+                self._entries[entry] = normalized
+                for gram in name_ngrams(normalized, self.n):
+                    self._postings[gram].add(entry)
+            self._max_id = max(self._max_id, alumnus_id)
+
+    def remove(self, alumnus_id):
+        with self._lock:
+            for entry in (alumnus_id * 2, alumnus_id * 2 + 1):
+                normalized = self._entries.pop(entry, None)
+                if normalized is None:
+                    continue
+                for gram in name_ngrams(normalized, self.n):
+                    posting = self._postings.get(gram)
+                    if posting is not None:
+                        posting.discard(entry)
+                        if not posting:
+                            del self._postings[gram]
+
+    def load(self, chunk_size=50_000):
+        """Rebuild the index from the alumni table."""
+        with self._lock:
+            self._postings.clear()
+            self._entries.clear()
+            self._max_id = 0
+            with database_connection() as connection:
+                cursor = connection.cursor()
+                # The watermark is the database clock, which updated_at is written with
+                cursor.execute("SELECT NOW()")
+                started = cursor.fetchone()[0]
+                cursor.execute("SELECT id, first_name, last_name FROM alumni")
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    for alumnus_id, first_name, last_name in rows:
+                        self.add(alumnus_id, first_name, last_name)
+                cursor.close()
+            self.loaded = True
+            self._mark_refreshed(started)
+        logging.info("Name index loaded with %s alumni.", len(self))
+
+    def refresh(self):
+        """Index rows inserted or updated since the last refresh and drop deleted rows."""
+        if not self.loaded:
+            return self.load()
+        with database_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("SELECT NOW()")
+            started = cursor.fetchone()[0]
+            # updated_at has one second resolution, so look back one extra second
+            cursor.execute("SELECT id, first_name, last_name FROM alumni WHERE updated_at >= %s OR id > %s",
+                           (self._refreshed_at - timedelta(seconds=1), self._max_id))
+            changed = cursor.fetchall()
+            cursor.execute("SELECT COUNT(*) FROM alumni")
+            table_count = cursor.fetchone()[0]
+            with self._lock:
+                for alumnus_id, first_name, last_name in changed:
+                    self.add(alumnus_id, first_name, last_name)
+                if table_count != len(self):
+                    cursor.execute("SELECT id FROM alumni")
+                    existing = {row[0] for row in cursor.fetchall()}
+                    for alumnus_id in {entry // 2 for entry in self._entries} - existing:
+                        self.remove(alumnus_id)
+                self._mark_refreshed(started)
+            cursor.close()
+
+    def _mark_refreshed(self, started):
+        self._refreshed_at = started
+        self._refreshed_time = time.monotonic()
+        self.dirty = False
+
+    def refresh_if_stale(self):
+        if not self.loaded or self.dirty or time.monotonic() - self._refreshed_time > self.refresh_seconds:
+            self.refresh()
+
+    def _match_token(self, token, threshold):
+        """Return {alumnus_id: score} for entries whose Jaccard similarity to ``token`` reaches ``threshold``."""
+        query_grams = name_ngrams(token, self.n)
+        size = len(query_grams)
+        if not size:
+            return {}
+        # Jaccard >= t implies an overlap of at least ceil(t * |q|) grams, so any match
+        # must share one of the |q| - overlap + 1 rarest grams.
+        min_overlap = max(1, math.ceil(threshold * size))
+        grams = sorted(query_grams, key=lambda gram: len(self._postings.get(gram, ())))
+        prefix, suffix = grams[:size - min_overlap + 1], grams[size - min_overlap + 1:]
+        candidates = Counter()
+        for gram in prefix:
+            candidates.update(self._postings.get(gram, ()))
+
+        scores = {}
+        for entry, overlap in candidates.items():
+            overlap += sum(1 for gram in suffix if entry in self._postings.get(gram, ()))
+            if overlap < min_overlap:
+                continue
+            name = self._entries[entry]
+            entry_size = len(name_ngrams(name, self.n))
+            jaccard = overlap / (size + entry_size - overlap)
+            if jaccard < threshold:
+                continue
+            edit_similarity = 1 - edit_distance(token, name) / max(len(token), len(name))
+            score = (jaccard + edit_similarity) / 2
+            alumnus_id = entry // 2
+            if score > scores.get(alumnus_id, 0):
+                scores[alumnus_id] = score
+        return scores
+
+    def search(self, query, threshold=FUZZY_NAME_THRESHOLD, limit=FUZZY_NAME_LIMIT):
+        """Return up to ``limit`` (alumnus_id, score) pairs, best first."""
+        tokens = normalize_name(query).split()
+        if not tokens:
+            return []
+        totals = Counter()
+        with self._lock:
+            for token in tokens:
+                totals.update(self._match_token(token, threshold))
+        ranked = ((score / len(tokens), alumnus_id) for alumnus_id, score in totals.items())
+        best = heapq.nlargest(limit, (item for item in ranked if item[0] >= threshold))
+        return [(alumnus_id, score) for score, alumnus_id in best]
+
+name_index = NameIndex()
+
+def index_alumnus_name(alumnus_id, first_name, last_name):
+    """Keep the name index in step with a write; a no-op until the index is loaded."""
+    if name_index.loaded:
+        name_index.add(alumnus_id, first_name, last_name)
+
+@on_data_changed
+def mark_name_index_dirty(tables):
+    if "alumni" in tables and name_index.loaded:
+        name_index.dirty = True
+
+def fuzzy_search_alumni_by_name(name, threshold=FUZZY_NAME_THRESHOLD, limit=FUZZY_NAME_LIMIT):
+    """Search alumni by name, tolerating typos and accents; results are ordered by similarity."""
+    try:
+        name_index.refresh_if_stale()
+        matches = name_index.search(name, threshold, limit)
+        if not matches:
+            print(f"No alumni found with a name similar to '{name}'.")
+            return []
+
+        ids = [alumnus_id for alumnus_id, _ in matches]
+        with database_connection(read_only=True) as connection:
+            cursor = connection.cursor()
+            placeholders = ", ".join(["%s"] * len(ids))
+            cursor.execute(f"SELECT * FROM alumni WHERE id IN ({placeholders})", tuple(ids))
+            rows = {row[0]: row for row in cursor.fetchall()}
+
+        logging.info("Fuzzy search for alumni by name '%s' completed successfully.", name)
+        return [rows[alumnus_id] for alumnus_id in ids if alumnus_id in rows]
+    except db.Error as db_err:
+        logging.error("Database error during fuzzy name search: %s", db_err)
+        return []
+    except Exception as e:
+        logging.error("Failed to fuzzy search alumni by name '%s': %s", name, e)
+        print("An error occurred during the search.")
+        return []
@@ -0,0 +1,186 @@
+"""Self-service profile, skill and job history updates for a logged-in alumnus."""
+import logging
+
+from alumni.cache import invalidate_skill_searches
+from alumni.changes import mark_data_changed
+from alumni.db import database_connection, lock_alumnus_id, run_in_transaction
+from alumni.names import index_alumnus_name, name_index
+from alumni.records import searches_listing_alumnus
+from alumni.skills import canonical_skill_name
+from alumni.validation import validate_skill_name
+
+def update_alumnus_profile(user_email):
+    """Update an alumnus's profile."""
+    new_first_name = str(input("Enter new first name (or press Enter to skip): "))
+    new_last_name = str(input("Enter new last name (or press Enter to skip): "))
+    new_graduation_year = str(input("Enter new graduation year (or press Enter to skip): "))
+    new_current_job = str(input("Enter your updated job (or press Enter to skip):"))
+
+    update_fields = []
+    values = []
+
+    if new_first_name:
+        update_fields.append("first_name = %s")
+        values.append(new_first_name)
+    if new_last_name:
+        update_fields.append("last_name = %s")
+        values.append(new_last_name)
+    if new_graduation_year:
+        update_fields.append("graduation_year = %s")
+        values.append(new_graduation_year)
+    if new_current_job:
+        update_fields.append("current_job = %s")
+        values.append(new_current_job)
+
+    if not update_fields:
+        print("No updates made.")
+        return
+
+    query = "UPDATE alumni SET " + ", ".join(update_fields) + " WHERE email = %s"
+    values.append(user_email)
+
+    def apply_update(cursor):
+        cursor.execute(query, tuple(values))
+        updated = cursor.rowcount
+        if updated:
+            cursor.execute("SELECT id, first_name, last_name FROM alumni WHERE email = %s", (user_email,))
+            row = cursor.fetchone()
+            if row:
+                affected[:] = searches_listing_alumnus(cursor, row[0])[0]
+                if name_index.loaded and (new_first_name or new_last_name):
+                    index_alumnus_name(*row)
+        return updated
+
+    affected = []
+    try:
+        if run_in_transaction(apply_update):
+            mark_data_changed("alumni")
+            # Cached skill searches embed the alumni row
+            invalidate_skill_searches(*affected)
+            logging.info("Profile of %s updated successfully.", user_email)
+            print("Profile updated successfully.")
+        else:
+            print("No changes were made to the profile.")
+    except Exception as e:
+        logging.error("Failed to update profile of %s: %s", user_email, e)
+        print("An error occurred while updating the profile.")
+
+def add_skill_to_profile(user_email, skill):
+    """Add a skill to an alumnus's profile under its canonical name."""
+    if not validate_skill_name(skill):
+        logging.error("Invalid skill name format.")
+        print("Invalid skill name format. Please re-enter the skill name.")
+        return
+    skill = canonical_skill_name(skill)
+
+    def link_skill(cursor):
+        alumnus_id = lock_alumnus_id(cursor, user_email)
+        if alumnus_id is None:
+            return False
+
+        # Upsert the skill; LAST_INSERT_ID(skill_id) makes lastrowid the existing ID on duplicates
+        cursor.execute("INSERT INTO skills (skill_name) VALUES (%s) ON DUPLICATE KEY UPDATE skill_id = LAST_INSERT_ID(skill_id)", (skill,))
+        skill_id = cursor.lastrowid
+
+        # Link skill with alumnus; the unique (alumnus_id, skill_id) key makes this idempotent
+        cursor.execute("INSERT INTO alumni_skills (alumnus_id, skill_id) VALUES (%s, %s) ON DUPLICATE KEY UPDATE skill_id = skill_id", (alumnus_id, skill_id))
+        return True
+
+    try:
+        if run_in_transaction(link_skill):
+            invalidate_skill_searches(skill)
+            logging.info("Skill '%s' added to profile of %s.", skill, user_email)
+            print("Skill added successfully.")
+        else:
+            logging.error("Alumnus not found: %s", user_email)
+            print("Error: Alumnus not found.")
+    except Exception as e:
+        logging.error("Failed to add skill '%s' to profile of %s: %s", skill, user_email, e)
+        print("An error occurred while adding the skill.")
+
+def remove_skill_from_profile(user_email, skill):
+    """Remove a skill from an alumnus's profile."""
+    skill = canonical_skill_name(skill)
+
+    def unlink_skill(cursor):
+        alumnus_id = lock_alumnus_id(cursor, user_email)
+        if alumnus_id is None:
+            return 0
+        cursor.execute("""
+            DELETE alumni_skills FROM alumni_skills
+            JOIN skills ON skills.skill_id = alumni_skills.skill_id
+            WHERE alumni_skills.alumnus_id = %s AND skills.skill_name = %s
+        """, (alumnus_id, skill))
+        return cursor.rowcount
+
+    try:
+        if run_in_transaction(unlink_skill):
+            invalidate_skill_searches(skill)
+            logging.info("Skill '%s' removed from profile of %s.", skill, user_email)
+            print("Skill removed successfully.")
+        else:
+            print("Skill not found on your profile.")
+    except Exception as e:
+        logging.error("Failed to remove skill '%s' from profile of %s: %s", skill, user_email, e)
+        print("An error occurred while removing the skill.")
+
+def view_job_history(user_email):
+    """View job history of an alumnus."""
+    try:
+        with database_connection(read_only=True) as connection:
+            cursor = connection.cursor()
+            cursor.execute("""
+                SELECT job_history.* FROM job_history
+                JOIN alumni ON alumni.id = job_history.alumnus_id
+                WHERE alumni.email = %s
+            """, (user_email,))
+            jobs = cursor.fetchall()
+
+            for job in jobs:
+                print(job)  # Format as needed
+            return jobs
+    except Exception as e:
+        logging.error("Failed to view job history of %s: %s", user_email, e)
+        print("An error occurred while viewing the job history.")
+        return []
+
+def update_job_history(user_email):
+    """Update an alumnus's job history."""
+    # Example: Add a new job record
+    # Extend this function to handle different job history updates as per your requirements
+    company_name = input("Enter company name: ")
+    position = input("Enter position: ")
+    start_date = input("Enter start date (YYYY-MM-DD): ")
+    end_date = input("Enter end date (YYYY-MM-DD) or leave blank: ")
+
+    def add_history(cursor):
+        alumnus_id = lock_alumnus_id(cursor, user_email)
+        if alumnus_id is None:
+            return False
+        # Re-submitting the same record is a no-op
+        cursor.execute("""
+            INSERT INTO job_history (alumnus_id, company_name, position, start_date, end_date)
+            SELECT %s, %s, %s, %s, %s FROM DUAL
+            WHERE NOT EXISTS (
+                SELECT 1 FROM job_history
+                WHERE alumnus_id = %s AND company_name = %s AND position = %s AND start_date = %s
+            )
+        """, (alumnus_id, company_name, position, start_date, end_date or None,
+              alumnus_id, company_name, position, start_date))
+        if cursor.rowcount == 0:
+            cursor.execute("""
+                UPDATE job_history SET end_date = %s
+                WHERE alumnus_id = %s AND company_name = %s AND position = %s AND start_date = %s
+            """, (end_date or None, alumnus_id, company_name, position, start_date))
+        return True
+
+    try:
+        if run_in_transaction(add_history):
+            logging.info("Job history of %s updated successfully.", user_email)
+            print("Job history updated successfully.")
+        else:
+            logging.error("Alumnus not found: %s", user_email)
+            print("Error: Alumnus not found.")
+    except Exception as e:
+        logging.error("Failed to update job history of %s: %s", user_email, e)
+        print("An error occurred while updating the job history.")
@@ -0,0 +1,343 @@
+"""Profiling mode for interactive sessions and batch commands.
+
+Start ``python main.py --profile`` or ``python -m alumni --profile COMMAND``,
+or set ALUMNI_PROFILE, to profile a whole run. ``--profile-mode`` or the
+variable's value picks one of two modes:
+
+- ``sample`` (the default) reads the stack of every thread each
+  ``sample_interval`` seconds. It covers background threads such as the task
+  workers, adds little overhead, and writes the stacks in the collapsed
+  format read by flamegraph.pl, speedscope and inferno (``.folded``).
+- ``cprofile`` traces every call on the thread that started the run with
+  cProfile and writes its statistics (``.pstats``).
+
+In both modes code marks its phases with ``with phase("db.query"):``. The
+database connection, query, fetch and commit, message formatting and SMTP
+are marked. Every run writes a summary with the phase timings and the
+hottest functions (``.txt``) to the ``directory`` setting, and appends one
+JSON line per run to ``history.jsonl`` there, so a regression shows up
+against earlier runs. Time spent waiting at an ``input()`` prompt is
+reported as idle and left out of the samples.
+
+When no run is active, ``phase()`` returns a shared no-op context manager.
+"""
+import builtins
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+from alumni.config import load_profile_settings
+
+PROFILE_MODES = ("sample", "cprofile")
+INPUT_PHASE = "input"
+# Stacks whose innermost Python frame is in these modules are threads waiting for work
+IDLE_MODULES = ("threading.py", "queue.py", "selectors.py")
+
+_active_run = None
+_NO_PHASE = nullcontext()
+
+class _Phase:
+    """Times one phase on the current thread, excluding the phases nested inside it."""
+
+    __slots__ = ("name", "run", "started", "nested")
+
+    def __init__(self, name, run):
+        self.name = name
+        self.run = run
+
+    def __enter__(self):
+        self.nested = 0.0
+        self.run.phase_stacks.setdefault(threading.get_ident(), []).append(self)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.started
+        ident = threading.get_ident()
+        # The stacks are gone if the run stopped while this phase was open
+        stack = self.run.phase_stacks.get(ident)
+        if stack:
+            stack.pop()
+            if stack:
+                stack[-1].nested += elapsed
+            else:
+                self.run.phase_stacks.pop(ident, None)
+        self.run.record_phase(self.name, elapsed, elapsed - self.nested)
+        return False
+
+def phase(name):
+    """Return a context manager timing ``name`` while a profiling run is active."""
+    run = _active_run
+    return _Phase(name, run) if run is not None else _NO_PHASE
+
+class TimedCursor:
+    """Cursor wrapper that records statement execution and row fetching as phases."""
+
+    __slots__ = ("_cursor",)
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, *args, **kwargs):
+        with phase("db.query"):
+            return self._cursor.execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        with phase("db.query"):
+            return self._cursor.executemany(*args, **kwargs)
+
+    def fetchone(self):
+        with phase("db.fetch"):
+            return self._cursor.fetchone()
+
+    def fetchmany(self, *args, **kwargs):
+        with phase("db.fetch"):
+            return self._cursor.fetchmany(*args, **kwargs)
+
+    def fetchall(self):
+        with phase("db.fetch"):
+            return self._cursor.fetchall()
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+class TimedConnection:
+    """Connection wrapper whose cursors are TimedCursors and whose commits are a phase."""
+
+    __slots__ = ("_connection",)
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def cursor(self, *args, **kwargs):
+        return TimedCursor(self._connection.cursor(*args, **kwargs))
+
+    def commit(self):
+        with phase("db.commit"):
+            return self._connection.commit()
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+def timed_connection(connection):
+    """Return ``connection`` wrapped for phase timing while a profiling run is active."""
+    return TimedConnection(connection) if _active_run is not None else connection
+
+def _frame_label(code, labels):
+    label = labels.get(code)
+    if label is None:
+        name = getattr(code, "co_qualname", code.co_name)
+        label = labels[code] = f"{os.path.basename(code.co_filename)}:{name}".replace(";", ":")
+    return label
+
+class ProfileRun:
+    """One profiled run: phase timings plus cProfile statistics or sampled stacks."""
+
+    def __init__(self, label, mode, settings):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profiling mode: {mode} (choose from {', '.join(PROFILE_MODES)})")
+        self.label = label
+        self.mode = mode
+        self.settings = settings
+        self.phases = {}
+        self.stacks = Counter()
+        self.samples = 0
+        # Open phases by thread ident; each thread only changes its own list
+        self.phase_stacks = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = None
+        self._profile = None
+        self._input = None
+
+    def current_phase(self, ident):
+        """Return the innermost open phase of the thread ``ident``, or None."""
+        stack = self.phase_stacks.get(ident)
+        try:
+            return stack[-1].name if stack else None
+        except IndexError:
+            # The thread closed its phase meanwhile
+            return None
+
+    def record_phase(self, name, seconds, self_seconds):
+        with self._lock:
+            totals = self.phases.get(name)
+            if totals is None:
+                totals = self.phases[name] = [0, 0.0, 0.0]
+            totals[0] += 1
+            totals[1] += seconds
+            totals[2] += self_seconds
+
+    def start(self):
+        global _active_run
+        self.started_at = datetime.now()
+        self._wall_started = time.perf_counter()
+        self._cpu_started = time.process_time()
+        _active_run = self
+        # Menu prompts count as idle time rather than as work
+        self._input = builtins.input
+        original_input = self._input
+
+        def timed_input(*args):
+            with phase(INPUT_PHASE):
+                return original_input(*args)
+
+        builtins.input = timed_input
+        if self.mode == "cprofile":
+            import cProfile
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._sampler = threading.Thread(target=self._sample, name="profile-sampler", daemon=True)
+            self._sampler.start()
+
+    def stop(self):
+        global _active_run
+        if self._profile is not None:
+            self._profile.disable()
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+        builtins.input = self._input
+        _active_run = None
+        self.phase_stacks.clear()
+        self.wall_seconds = time.perf_counter() - self._wall_started
+        self.cpu_seconds = time.process_time() - self._cpu_started
+
+    def _sample(self):
+        own = threading.get_ident()
+        labels = {}
+        thread_names = {}
+        interval = self.settings["sample_interval"]
+        while not self._stop.wait(interval):
+            frames = sys._current_frames()
+            if frames.keys() - thread_names.keys():
+                thread_names = {thread.ident: thread.name.replace(";", ":") for thread in threading.enumerate()}
+            for ident, frame in frames.items():
+                if ident == own or self.current_phase(ident) == INPUT_PHASE:
+                    continue
+                if os.path.basename(frame.f_code.co_filename) in IDLE_MODULES:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code, labels))
+                    frame = frame.f_back
+                stack.append(thread_names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(stack))] += 1
+                self.samples += 1
+
+    def top_functions(self, limit):
+        """Return (label, self samples, inclusive samples) of the most sampled functions."""
+        own, inclusive = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")[1:]
+            if not frames:
+                continue
+            own[frames[-1]] += count
+            for frame in set(frames):
+                inclusive[frame] += count
+        return [(label, own[label], count) for label, count in inclusive.most_common(limit)]
+
+    def summary(self):
+        """Return the summary report of the run as text."""
+        idle = self.phases.get(INPUT_PHASE, (0, 0.0, 0.0))[1]
+        active = max(self.wall_seconds - idle, 1e-9)
+        lines = [
+            f"Profile of {self.label} ({self.mode} mode), started {self.started_at.isoformat(sep=' ', timespec='seconds')}",
+            f"Wall time {self.wall_seconds:.3f}s, of which {idle:.3f}s waiting for input; CPU time {self.cpu_seconds:.3f}s",
+            "",
+            "Phases (self time excludes nested phases; threads add up, so totals can exceed wall time):",
+            f"  {'phase':<16}{'calls':>10}{'total s':>12}{'self s':>12}{'% active':>10}",
+        ]
+        for name, (calls, seconds, self_seconds) in sorted(self.phases.items(), key=lambda item: -item[1][2]):
+            if name == INPUT_PHASE:
+                continue
+            lines.append(f"  {name:<16}{calls:>10}{seconds:>12.3f}{self_seconds:>12.3f}{100 * self_seconds / active:>9.1f}%")
+        lines.append("")
+        top = self.settings["top"]
+        if self._profile is not None:
+            import io
+            import pstats
+            output = io.StringIO()
+            pstats.Stats(self._profile, stream=output).sort_stats("cumulative").print_stats(top)
+            lines.append(output.getvalue().strip())
+        else:
+            lines.append(f"Top functions over {self.samples} samples every {self.settings['sample_interval'] * 1000:g}ms:")
+            lines.append(f"  {'self %':>7}{'total %':>9}  function")
+            samples = max(self.samples, 1)
+            for label, own, inclusive in self.top_functions(top):
+                lines.append(f"  {100 * own / samples:>6.1f}%{100 * inclusive / samples:>8.1f}%  {label}")
+        return "\n".join(lines) + "\n"
+
+    def write(self):
+        """Write the stack file, the summary and a history line; returns the paths written."""
+        directory = self.settings["directory"]
+        os.makedirs(directory, exist_ok=True)
+        safe_label = "".join(char if char.isalnum() or char in "-_" else "_" for char in self.label)
+        base = os.path.join(directory, f"{self.started_at:%Y%m%d-%H%M%S}-{os.getpid()}-{safe_label}")
+        paths = {"summary": base + ".txt"}
+        if self._profile is not None:
+            paths["stats"] = base + ".pstats"
+            self._profile.dump_stats(paths["stats"])
+        else:
+            paths["stacks"] = base + ".folded"
+            with open(paths["stacks"], mode='w', encoding='utf-8') as file:
+                file.writelines(f"{stack} {count}\n" for stack, count in self.stacks.items())
+        with open(paths["summary"], mode='w', encoding='utf-8') as file:
+            file.write(self.summary())
+        entry = {
+            "label": self.label,
+            "mode": self.mode,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "wall_seconds": round(self.wall_seconds, 4),
+            "cpu_seconds": round(self.cpu_seconds, 4),
+            "phases": {name: {"calls": calls, "seconds": round(seconds, 4), "self_seconds": round(self_seconds, 4)}
+                       for name, (calls, seconds, self_seconds) in self.phases.items()},
+            "files": paths,
+        }
+        with open(os.path.join(directory, "history.jsonl"), mode='a', encoding='utf-8') as file:
+            file.write(json.dumps(entry) + "\n")
+        return paths
+
+@contextmanager
+def profile_run(label, mode=None):
+    """
+    Profile the block as one run named ``label``.
+
+    :param mode: "sample" or "cprofile"; defaults to the ``mode`` setting
+                 (ALUMNI_PROFILE), and the block runs unprofiled when that is empty.
+    :return: The ProfileRun, or None when profiling is off or already active.
+    """
+    settings = load_profile_settings()
+    mode = mode or settings["mode"].strip().lower()
+    if mode in ("1", "true", "yes", "on"):
+        mode = "sample"
+    if not mode or mode in ("0", "false", "no", "off") or _active_run is not None:
+        yield None
+        return
+    if mode not in PROFILE_MODES:
+        logging.error("Unknown profiling mode '%s', running without profiling.", mode)
+        print(f"Unknown profiling mode '{mode}' (choose from {', '.join(PROFILE_MODES)}); not profiling.", file=sys.stderr)
+        yield None
+        return
+    run = ProfileRun(label, mode, settings)
+    run.start()
+    try:
+        yield run
+    finally:
+        run.stop()
+        try:
+            paths = run.write()
+            logging.info("Profile of %s written to %s", label, paths)
+            print(f"Profile written to {', '.join(paths.values())}", file=sys.stderr)
+        except OSError as e:
+            logging.error("Failed to write the profile of %s: %s", label, e)
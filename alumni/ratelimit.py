@@ -0,0 +1,485 @@
+"""Rate limits and write coalescing for messages and connection requests.
+
+Every sender and every receiver has a token bucket per kind of request. Buckets
+live in memory and are written to ``rate_limit_buckets`` periodically so a
+restart does not hand out a fresh allowance. Message inserts go through a
+buffer that writes straight through when traffic is quiet, batches inserts
+under load, and refuses new work once it is full; ``backpressure()`` exposes
+how full it is so other writers can shed load early. A batch that fails is
+retried row by row, and rows that still fail are kept in
+``message_dead_letters`` instead of being dropped.
+
+Run ``python -m alumni.ratelimit --senders A,B --abusers C --receiver D`` to
+measure message latency for well-behaved senders while others flood the system.
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+
+from alumni.config import load_rate_limit_settings
+from alumni.db import database_connection, run_in_transaction
+
+# Fraction of the message buffer in use above which optional writes are refused
+BACKPRESSURE_HIGH_WATERMARK = 0.8
+
+_limiter = None
+_message_buffer = None
+_setup_lock = threading.Lock()
+
+class TokenBucket:
+    """Allow ``capacity`` requests at once, refilled at ``rate`` tokens per second."""
+
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity, rate, tokens=None, updated=None):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity if tokens is None else min(tokens, capacity)
+        self.updated = time.time() if updated is None else updated
+
+    def refill(self, now):
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+        return self.tokens
+
+    def wait_time(self, cost, now):
+        """Seconds until ``cost`` tokens are available, 0 if they are available now."""
+        missing = cost - self.refill(now)
+        if missing <= 0:
+            return 0.0
+        return missing / self.rate if self.rate > 0 else float("inf")
+
+    def is_full(self, now):
+        return self.refill(now) >= self.capacity
+
+class RateLimiter:
+    """Token buckets keyed by (scope, key), persisted to ``rate_limit_buckets``."""
+
+    def __init__(self, limits, persist_seconds=30.0):
+        """
+        :param limits: {scope: (capacity, tokens per second)}.
+        :param persist_seconds: Interval of the background persistence thread.
+        """
+        self.limits = dict(limits)
+        self.persist_seconds = persist_seconds
+        self.allowed = 0
+        self.limited = 0
+        self._buckets = {}
+        self._dirty = set()
+        # Saved buckets that persist() checks until they are full again
+        self._refilling = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _bucket(self, scope, key):
+        bucket = self._buckets.get((scope, key))
+        if bucket is None:
+            capacity, rate = self.limits[scope]
+            bucket = self._buckets[(scope, key)] = TokenBucket(capacity, rate)
+        return bucket
+
+    def acquire(self, *checks, cost=1):
+        """
+        Take ``cost`` tokens from every (scope, key) bucket in ``checks``, or from none.
+
+        :return: 0.0 when the request is allowed, otherwise the seconds to wait
+                 before the most depleted bucket has enough tokens.
+        """
+        now = time.time()
+        with self._lock:
+            buckets = [self._bucket(scope, key) for scope, key in checks]
+            wait = max((bucket.wait_time(cost, now) for bucket in buckets), default=0.0)
+            if wait:
+                self.limited += 1
+                return wait
+            for bucket in buckets:
+                bucket.tokens -= cost
+            self._dirty.update(checks)
+            self.allowed += 1
+            return 0.0
+
+    def load(self):
+        """Restore the buckets saved by earlier runs; refill catches up on the time since."""
+        with database_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("SELECT scope, bucket_key, tokens, updated_at FROM rate_limit_buckets")
+            rows = cursor.fetchall()
+        with self._lock:
+            for scope, key, tokens, updated in rows:
+                if scope in self.limits and (scope, key) not in self._buckets:
+                    capacity, rate = self.limits[scope]
+                    self._buckets[(scope, key)] = TokenBucket(capacity, rate, tokens, updated)
+                    self._refilling.add((scope, key))
+        logging.info("Restored %s rate limit buckets", len(rows))
+
+    def persist(self):
+        """
+        Write the buckets touched since the last call.
+
+        Full buckets carry no state worth keeping, so they are deleted from the
+        table and dropped from memory; this keeps both bounded by the number of
+        recently active users. Saved buckets that are not yet full are checked
+        again on later calls until they have refilled.
+        """
+        now = time.time()
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            upserts, deletes = [], []
+            for scope, key in dirty | self._refilling:
+                bucket = self._buckets.get((scope, key))
+                if bucket is None:
+                    self._refilling.discard((scope, key))
+                elif bucket.is_full(now):
+                    deletes.append((scope, key))
+                elif (scope, key) in dirty:
+                    upserts.append((scope, key, bucket.tokens, bucket.updated))
+                    self._refilling.add((scope, key))
+        if not upserts and not deletes:
+            return 0
+
+        def write(cursor):
+            if upserts:
+                cursor.executemany("""
+                    INSERT INTO rate_limit_buckets (scope, bucket_key, tokens, updated_at)
+                    VALUES (%s, %s, %s, %s)
+                    ON DUPLICATE KEY UPDATE tokens = VALUES(tokens), updated_at = VALUES(updated_at)
+                """, upserts)
+            if deletes:
+                cursor.executemany("DELETE FROM rate_limit_buckets WHERE scope = %s AND bucket_key = %s", deletes)
+
+        try:
+            run_in_transaction(write)
+        except Exception:
+            with self._lock:
+                # Retry the unsaved buckets on the next pass
+                self._dirty.update(dirty)
+            raise
+        with self._lock:
+            for scope_key in deletes:
+                self._refilling.discard(scope_key)
+                # A bucket drawn on again since is saved by the next pass
+                if scope_key not in self._dirty:
+                    self._buckets.pop(scope_key, None)
+        return len(upserts) + len(deletes)
+
+    def start(self):
+        """Start the background thread that persists buckets every ``persist_seconds``."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="rate-limit-persister", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        try:
+            self.persist()
+        except Exception as e:
+            logging.error("Failed to persist rate limits: %s", e)
+
+    def _run(self):
+        while not self._stop.wait(self.persist_seconds):
+            try:
+                self.persist()
+            except Exception as e:
+                logging.error("Failed to persist rate limits: %s", e)
+
+class MessageBuffer:
+    """Coalesce message inserts into batched transactions when traffic is heavy."""
+
+    INSERT_QUERY = "INSERT INTO alumni_messages (sender_email, receiver_email, message) VALUES (%s, %s, %s)"
+    DEAD_LETTER_QUERY = """
+        INSERT INTO message_dead_letters (sender_email, receiver_email, message, error, failed_at)
+        VALUES (%s, %s, %s, %s, NOW())
+    """
+
+    def __init__(self, batch_size=200, flush_seconds=0.2, max_pending=5000, coalesce_above=5):
+        """
+        :param batch_size: Largest number of messages written in one transaction.
+        :param flush_seconds: Longest time a queued message waits for its batch to fill.
+        :param max_pending: Queue size at which new messages are refused.
+        :param coalesce_above: Messages per second above which inserts are queued
+                               rather than written by the caller.
+        """
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.max_pending = max_pending
+        self.coalesce_above = coalesce_above
+        self.written = 0
+        self.batches = 0
+        self.rejected = 0
+        self.failed = 0
+        self.dead_lettered = 0
+        self._pending = []
+        self._arrivals = deque()
+        self._flushing = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def pressure(self):
+        """Fraction of the queue in use, from 0.0 (idle) to 1.0 (refusing messages)."""
+        with self._cond:
+            return len(self._pending) / self.max_pending
+
+    def submit(self, sender_email, receiver_email, message):
+        """
+        Write or queue one message.
+
+        :return: True if the message was stored or queued, False if the buffer is full.
+        """
+        row = (sender_email, receiver_email, message)
+        now = time.monotonic()
+        with self._cond:
+            self._arrivals.append(now)
+            while self._arrivals[0] < now - 1:
+                self._arrivals.popleft()
+            if len(self._pending) >= self.max_pending:
+                self.rejected += 1
+                return False
+            busy = self._pending or self._flushing or len(self._arrivals) > self.coalesce_above
+            if busy and not self._closed:
+                self._pending.append(row)
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="message-buffer", daemon=True)
+                    self._thread.start()
+                if len(self._pending) >= self.batch_size:
+                    self._cond.notify_all()
+                return True
+        # Quiet traffic: write through so the message is visible immediately
+        self._write([row])
+        with self._cond:
+            self.written += 1
+        return True
+
+    def flush(self, timeout=None):
+        """Wait until every queued message has been written; returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._cond.notify_all()
+            while self._pending or self._flushing:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout=None):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "pending": len(self._pending),
+                "written": self.written,
+                "batches": self.batches,
+                "rejected": self.rejected,
+                "failed": self.failed,
+                "dead_lettered": self.dead_lettered,
+            }
+
+    def _write(self, rows):
+        run_in_transaction(lambda cursor: cursor.executemany(self.INSERT_QUERY, rows))
+
+    def _dead_letter(self, failures):
+        """Keep messages that could not be stored; returns how many were kept."""
+        rows = [(*row, str(error)[:255]) for row, error in failures]
+        try:
+            run_in_transaction(lambda cursor: cursor.executemany(self.DEAD_LETTER_QUERY, rows))
+            return len(rows)
+        except Exception as e:
+            # Last resort: the log line carries the whole message
+            for sender_email, receiver_email, message, error in rows:
+                logging.error("Lost message from %s to %s (%s; dead letter failed: %s): %r",
+                              sender_email, receiver_email, error, e, message)
+            return 0
+
+    def _next_batch(self):
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            deadline = time.monotonic() + self.flush_seconds
+            while len(self._pending) < self.batch_size and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = self._pending[:self.batch_size]
+            del self._pending[:self.batch_size]
+            self._flushing = bool(batch)
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+            written = 0
+            failures = []
+            try:
+                self._write(batch)
+                written = len(batch)
+            except Exception as e:
+                # One bad row (e.g. an unknown receiver) must not sink the whole batch
+                logging.warning("Batched insert of %s messages failed, writing them one by one: %s", len(batch), e)
+                for row in batch:
+                    try:
+                        self._write([row])
+                        written += 1
+                    except Exception as row_error:
+                        logging.error("Failed to store message from %s to %s: %s", row[0], row[1], row_error)
+                        failures.append((row, row_error))
+            dead_lettered = self._dead_letter(failures) if failures else 0
+            with self._cond:
+                self.written += written
+                self.failed += len(failures)
+                self.dead_lettered += dead_lettered
+                self.batches += 1
+                self._flushing = False
+                self._cond.notify_all()
+
+def build_limits(settings):
+    """Return the RateLimiter scopes for the ``[ratelimit]`` settings."""
+    return {
+        "message_sender": (settings["message_burst"], settings["messages_per_minute"] / 60),
+        "message_receiver": (settings["inbox_burst"], settings["inbox_per_minute"] / 60),
+        "connection_sender": (settings["connection_burst"], settings["connections_per_hour"] / 3600),
+        "connection_receiver": (settings["incoming_connection_burst"], settings["incoming_connections_per_hour"] / 3600),
+    }
+
+def _setup():
+    global _limiter, _message_buffer
+    with _setup_lock:
+        if _limiter is not None:
+            return
+        settings = load_rate_limit_settings()
+        limiter = RateLimiter(build_limits(settings), settings["persist_seconds"])
+        try:
+            limiter.load()
+        except Exception as e:
+            logging.error("Failed to restore rate limits: %s", e)
+        limiter.start()
+        _message_buffer = MessageBuffer(
+            batch_size=settings["buffer_batch_size"],
+            flush_seconds=settings["buffer_flush_seconds"],
+            max_pending=settings["buffer_max_pending"],
+        )
+        _limiter = limiter
+        atexit.register(shutdown)
+
+def get_rate_limiter():
+    """Return the process-wide RateLimiter, restoring saved buckets on first use."""
+    if _limiter is None:
+        _setup()
+    return _limiter
+
+def get_message_buffer():
+    """Return the process-wide MessageBuffer."""
+    if _message_buffer is None:
+        _setup()
+    return _message_buffer
+
+def backpressure():
+    """Return how loaded the message write path is, from 0.0 to 1.0."""
+    return _message_buffer.pressure() if _message_buffer is not None else 0.0
+
+def is_overloaded():
+    """True when writers that can be retried later should refuse new work."""
+    return backpressure() >= BACKPRESSURE_HIGH_WATERMARK
+
+def shutdown():
+    """Write queued messages and bucket state before the process exits."""
+    if _message_buffer is not None:
+        _message_buffer.flush(timeout=10)
+        _message_buffer.close(timeout=1)
+    if _limiter is not None:
+        _limiter.stop()
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+def load_test_messaging(senders, abusers, receiver, duration=10.0, interval=0.5):
+    """
+    Measure message latency for well-behaved senders while abusive ones flood.
+
+    Each email in ``senders`` sends one message to ``receiver`` every
+    ``interval`` seconds while each email in ``abusers`` sends as fast as it
+    can. All emails must belong to existing alumni.
+
+    :return: Per-group outcome counts and latency percentiles in milliseconds.
+    """
+    from alumni.community import deliver_message
+
+    stop = threading.Event()
+    results = {"senders": [], "abusers": []}
+    lock = threading.Lock()
+
+    def send_loop(group, email, pause):
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                outcome = deliver_message(email, receiver, f"load test message from {email}")
+            except Exception:
+                outcome = "error"
+            elapsed = time.perf_counter() - started
+            with lock:
+                results[group].append((outcome, elapsed))
+            if pause:
+                stop.wait(pause)
+
+    threads = [threading.Thread(target=send_loop, args=("senders", email, interval)) for email in senders]
+    threads += [threading.Thread(target=send_loop, args=("abusers", email, 0)) for email in abusers]
+    for thread in threads:
+        thread.start()
+    stop.wait(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    get_message_buffer().flush(timeout=30)
+
+    summary = {}
+    for group, samples in results.items():
+        latencies = sorted(elapsed * 1000 for _, elapsed in samples)
+        outcomes = {}
+        for outcome, _ in samples:
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+        summary[group] = {
+            "requests": len(samples),
+            "outcomes": outcomes,
+            "p50_ms": percentile(latencies, 0.50),
+            "p95_ms": percentile(latencies, 0.95),
+            "p99_ms": percentile(latencies, 0.99),
+            "max_ms": latencies[-1] if latencies else None,
+        }
+    summary["buffer"] = get_message_buffer().stats()
+    return summary
+
+def main(argv=None):
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Load test the message rate limits.")
+    parser.add_argument("--senders", required=True, help="comma-separated emails sending at a normal pace")
+    parser.add_argument("--abusers", default="", help="comma-separated emails sending as fast as possible")
+    parser.add_argument("--receiver", required=True)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--interval", type=float, default=0.5)
+    args = parser.parse_args(argv)
+
+    split = lambda value: [email.strip() for email in value.split(",") if email.strip()]
+    summary = load_test_messaging(split(args.senders), split(args.abusers), args.receiver, args.duration, args.interval)
+    print(json.dumps(summary, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""Alumni registration, CRUD and search."""
+import logging
+
+from alumni import db
+from alumni.cache import get_query_cache, invalidate_all_job_searches, invalidate_skill_searches, skill_tag
+from alumni.changes import mark_data_changed
+from alumni.db import database_connection
+from alumni.names import index_alumnus_name, name_index
+from alumni.skills import canonical_skill_name
+from alumni.validation import validate_email, validate_graduation_year, validate_job_title, validate_name
+
+def register_alumnus():
+    """Register a new alumnus."""
+    first_name = str(input("Enter your first name: "))
+    while(first_name and not validate_name(first_name)):
+        print("Please enter a valid name with only Alphabetical Characters.")
+        first_name = str(input("Enter your first name: "))
+    last_name = str(input("Enter your Last Name: "))
+    while(last_name and not validate_name(last_name)):
+        print("Please enter a valid name with only Alphabetical Characters.")
+        last_name = str(input("Enter your Last Name: "))
+    email = str(input("Enter your email address: "))
+    while not validate_email(email):
+        print("Invalid email format. Please try again.")
+        email = str(input("Enter your email address: "))
+    graduation_year = str(input("Enter your graduation year: "))
+    while not validate_graduation_year(graduation_year):
+        print("Invalid graduation year. Please enter a year between 1900 and 2100.")
+        graduation_year = str(input("Enter your graduation year: "))
+    current_job = str(input("Enter Current Job: "))
+    try:
+        with database_connection() as connection:
+            cursor = connection.cursor()
+            query = "INSERT INTO alumni (first_name, last_name, email, graduation_year, current_job) VALUES (%s, %s, %s, %s, %s)"
+            cursor.execute(query, (first_name, last_name, email, graduation_year, current_job))
+            connection.commit()
+            mark_data_changed("alumni")
+            index_alumnus_name(cursor.lastrowid, first_name, last_name)
+            logging.info("New alumnus registered successfully")
+            from alumni.tasks import enqueue
+            enqueue("email.templated", {"template": "welcome", "recipient": email, "fields": {
+                "first_name": first_name, "last_name": last_name, "graduation_year": graduation_year,
+            }})
+    except Exception as e:
+        logging.error("Failed to register alumnus: %s", e)
+        print("An error occurred during registration.")
+
+def alumnus_login(email):
+    """Check if an email exists in the alumni table."""
+    try:
+        with database_connection() as connection:
+            cursor = connection.cursor()
+            query = "SELECT * FROM alumni WHERE email = %s"
+            cursor.execute(query, (email,))
+            result = cursor.fetchone()
+
+            if result is None:
+                print(f"No alumni found with the email '{email}'.")
+                return False
+            else:
+                return True
+    except db.Error as db_err:
+        logging.error("Database error while checking alumni email: %s", db_err)
+        return False
+    except Exception as e:
+        logging.error("Failed to check alumni email '%s': %s", email, e)
+        print("An error occurred during the email check.")
+        return False
+
+def add_alumnus(first_name, last_name, email, graduation_year, current_job):
+    """Insert a new alumnus into the database."""
+    try:
+        with database_connection() as connection:
+            cursor = connection.cursor()
+            query = "INSERT INTO alumni (first_name, last_name, email, graduation_year, current_job) VALUES (%s, %s, %s, %s, %s)"
+            cursor.execute(query, (first_name, last_name, email, graduation_year, current_job))
+            connection.commit()
+            mark_data_changed("alumni")
+            index_alumnus_name(cursor.lastrowid, first_name, last_name)
+
+        logging.info("Alumnus added successfully.")
+    except db.Error as db_err:
+        logging.error("Database error while adding alumnus: %s", db_err)
+    except Exception as e:
+        logging.error("Unexpected error while adding alumnus: %s", e)
+
+def get_all_alumni():
+    """Fetch all alumni from the database."""
+    try:
+        with database_connection(read_only=True) as connection:
+            cursor = connection.cursor()
+            cursor.execute("SELECT * FROM alumni")
+            records = cursor.fetchall()
+            return records
+    except db.Error as db_err:
+        logging.error("Database error fetching all alumni: %s", db_err)
+        return []
+    except Exception as e:
+        logging.error("Error fetching all alumni: %s", e)
+        return []
+
+def update_alumnus(id, first_name=None, last_name=None, email=None, graduation_year=None, current_job=None):
+    """Update details of an alumnus in the database."""
+    if first_name and not validate_name(first_name):
+        logging.error("Invalid first name format.")
+        print("Invalid first name format. Please ensure the name contains only letters.")
+        return
+    if last_name and not validate_name(last_name):
+        logging.error("Invalid last name format.")
+        print("Invalid last name format. Please ensure the name contains only letters.")
+        return
+    if current_job and not validate_job_title(current_job):
+        logging.error("Invalid job title format.")
+        print("Invalid job title format. Please re-enter the job title.")
+        return
+    try:
+        with database_connection() as connection:
+            cursor = connection.cursor()
+
+            update_fields = []
+            values = []
+
+            if first_name:
+                update_fields.append("first_name = %s")
+                values.append(first_name)
+            if last_name:
+                update_fields.append("last_name = %s")
+                values.append(last_name)
+            if email:
+                update_fields.append("email = %s")
+                values.append(email)
+            if graduation_year:
+                update_fields.append("graduation_year = %s")
+                values.append(graduation_year)
+            if current_job:
+                update_fields.append("current_job = %s")
+                values.append(current_job)
+
+            query = "UPDATE alumni SET " + ", ".join(update_fields) + " WHERE id = %s"
+            values.append(id)
+
+            cursor.execute(query, tuple(values))
+            connection.commit()
+            mark_data_changed("alumni")
+            # Cached skill searches embed the alumni row
+            invalidate_skill_searches(*searches_listing_alumnus(cursor, id)[0])
+
+            if name_index.loaded and (first_name or last_name):
+                cursor.execute("SELECT first_name, last_name FROM alumni WHERE id = %s", (id,))
+                names = cursor.fetchone()
+                if names:
+                    index_alumnus_name(id, *names)
+
+            logging.info("Alumnus with ID %s updated successfully.", id)
+    except db.Error as db_err:
+        logging.error("Database error fetching all alumni: %s", db_err)
+        return []
+    except Exception as e:
+        logging.error("Failed to update alumnus: %s", e)
+        print("An error occurred while updating the alumnus.")
+
+def searches_listing_alumnus(cursor, alumnus_id):
+    """Return the alumnus's skill names and whether they have job postings, for cache invalidation."""
+    cursor.execute("""
+        SELECT skills.skill_name FROM alumni_skills
+        JOIN skills ON skills.skill_id = alumni_skills.skill_id
+        WHERE alumni_skills.alumnus_id = %s
+    """, (alumnus_id,))
+    skill_names = [row[0] for row in cursor.fetchall()]
+    cursor.execute("SELECT EXISTS (SELECT 1 FROM job_postings WHERE alumnus_id = %s)", (alumnus_id,))
+    return skill_names, bool(cursor.fetchone()[0])
+
+def delete_alumnus(id):
+    """Remove an alumnus from the database."""
+    try:
+        with database_connection() as connection:
+            cursor = connection.cursor()
+            affected_skills, has_postings = searches_listing_alumnus(cursor, id)
+            query = "DELETE FROM alumni WHERE id = %s"
+            cursor.execute(query, (id,))
+            connection.commit()
+            mark_data_changed("alumni")
+            name_index.remove(id)
+            invalidate_skill_searches(*affected_skills)
+            if has_postings:
+                invalidate_all_job_searches()
+
+            logging.info("Alumnus with ID %s deleted successfully.", id)
+    except db.Error as db_err:
+        logging.error("Database error fetching all alumni: %s", db_err)
+        return []
+    except Exception as e:
+        logging.error("Failed to delete alumnus with ID %s: %s", id, e)
+        print("An error occurred while deleting the alumnus.")
+
+def add_skill(skill_name):
+    """Add a new skill to the skills table under its canonical name."""
+    skill_name = canonical_skill_name(skill_name)
+    try:
+        with database_connection() as connection:
+            cursor = connection.cursor()
+
+            query = "INSERT INTO skills (skill_name) VALUES (%s)"
+            cursor.execute(query, (skill_name,))
+
+            connection.commit()
+            logging.info("Skill '%s' added successfully.", skill_name)
+    except db.Error as db_err:
+        logging.error("Database error fetching all alumni: %s", db_err)
+        return []
+    except Exception as e:
+        logging.error("Failed to add skill '%s': %s", skill_name, e)
+        print("An error occurred while adding the skill.")
+
+def search_alumni_by_name(name):
+    """Search alumni based on name."""
+    try:
+        with database_connection(read_only=True) as connection:
+            cursor = connection.cursor()
+            query = "SELECT * FROM alumni WHERE first_name LIKE %s OR last_name LIKE %s"
+            cursor.execute(query, ('%' + name + '%', '%' + name + '%'))
+            results = cursor.fetchall()
+
+            if len(results) == 0:
+                print(f"No alumni found with the name '{name}'.")
+                return []
+
+            logging.info("Search for alumni by name '%s' completed successfully.", name)
+            return results
+    except db.Error as db_err:
+        logging.error("Database error fetching all alumni: %s", db_err)
+        return []
+    except Exception as e:
+        logging.error("Failed to search alumni by name '%s': %s", name, e)
+        print("An error occurred during the search.")
+        return []
+
+def search_alumni_by_skill(skill_name, limit=None, offset=0):
+    """Search alumni based on skill; results are cached until the skill's links change."""
+    skill = canonical_skill_name(skill_name)
+
+    def run_query():
+        with database_connection(read_only=True) as connection:
+            cursor = connection.cursor()
+            query = """
+                SELECT alumni.* FROM alumni
+                JOIN alumni_skills ON alumni.id = alumni_skills.alumnus_id
+                JOIN skills ON skills.skill_id = alumni_skills.skill_id
+                WHERE skills.skill_name = %s
+                ORDER BY alumni.id
+            """
+            params = (skill,)
+            if limit is not None:
+                query += " LIMIT %s OFFSET %s"
+                params += (limit, offset)
+            cursor.execute(query, params)
+            return cursor.fetchall()
+
+    try:
+        results = get_query_cache().get_or_compute(("skill", skill, limit, offset), run_query, tags=(skill_tag(skill),))
+        if len(results) == 0:
+            print(f"No alumni found with the skill '{skill_name}'.")
+            return []
+
+        logging.info("Search for alumni by skill '%s' completed successfully.", skill_name)
+        return results
+    except db.Error as db_err:
+        logging.error("Database error fetching all alumni: %s", db_err)
+        return []
+    except Exception as e:
+        logging.error("Failed to search alumni by skill '%s': %s", skill_name, e)
+        print("An error occurred during the skill search.")
+        return []
@@ -0,0 +1,301 @@
+"""Report engine: reports are defined once, computed in the background and
+served from the latest stored snapshot."""
+import csv
+import io
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+
+from alumni import db
+from alumni.changes import on_data_changed, table_version
+from alumni.db import database_connection, run_in_transaction
+from alumni.profiling import phase
+
+REPORT_REFRESH_SECONDS = 300
+REPORT_SNAPSHOT_HISTORY = 20
+
+REPORTS = {}
+_report_snapshots = {}
+_report_lock = threading.Lock()
+_data_changed = threading.Event()
+report_scheduler = None
+
+def define_report(name, title, tables, refresh_seconds=None):
+    """
+    Register a report computed by the decorated function.
+
+    :param name: Unique report name.
+    :param title: Human readable report title.
+    :param tables: Tables the report reads; writes to them trigger a refresh.
+    :param refresh_seconds: Maximum snapshot age, defaults to REPORT_REFRESH_SECONDS.
+    """
+    def register(compute):
+        REPORTS[name] = {
+            "name": name,
+            "title": title,
+            "tables": tuple(tables),
+            "refresh_seconds": refresh_seconds or REPORT_REFRESH_SECONDS,
+            "compute": compute,
+        }
+        return compute
+    return register
+
+@define_report("alumni_statistics", "Alumni Statistics", tables=("alumni",))
+def compute_alumni_statistics(cursor):
+    cursor.execute("SELECT graduation_year, COUNT(*) FROM alumni GROUP BY graduation_year ORDER BY graduation_year")
+    year_distribution = [list(row) for row in cursor.fetchall()]
+    return {
+        "summary": {"Total Alumni": sum(count for _, count in year_distribution)},
+        "sections": [{
+            "title": "Graduation Year Distribution",
+            "columns": ["graduation_year", "alumni"],
+            "rows": year_distribution,
+            "row_format": "Year {0}: {1} alumni",
+        }],
+    }
+
+@define_report("event_participation", "Event Participation Report", tables=("events", "event_attendance"))
+def compute_event_participation(cursor):
+    cursor.execute("""
+        SELECT e.event_name, COUNT(a.alumnus_id) AS participants
+        FROM events e
+        JOIN event_attendance a ON e.event_id = a.event_id
+        GROUP BY e.event_name
+    """)
+    return {
+        "summary": {},
+        "sections": [{
+            "title": "Participants per Event",
+            "columns": ["event_name", "participants"],
+            "rows": [list(row) for row in cursor.fetchall()],
+            "row_format": "{0}: {1} participants",
+        }],
+    }
+
+@on_data_changed
+def mark_snapshots_stale(tables):
+    """Mark snapshots reading any of ``tables`` stale and wake the scheduler."""
+    now = time.time()
+    with _report_lock:
+        for name, snapshot in _report_snapshots.items():
+            if set(tables) & set(REPORTS[name]["tables"]):
+                snapshot["stale_at"] = min(snapshot["stale_at"], now)
+    _data_changed.set()
+
+def refresh_report(name):
+    """Compute report ``name`` now, store it as a new snapshot version and return it."""
+    definition = REPORTS[name]
+    table_versions = {table: table_version(table) for table in definition["tables"]}
+
+    # Compute on the primary: a lagging replica could miss a change already counted in table_versions
+    with database_connection() as connection:
+        cursor = connection.cursor()
+        data = definition["compute"](cursor)
+    generated_at = time.time()
+
+    def store(cursor):
+        cursor.execute("SELECT COALESCE(MAX(version), 0) FROM report_snapshots WHERE report_name = %s FOR UPDATE", (name,))
+        version = cursor.fetchone()[0] + 1
+        snapshot = {
+            "report": name,
+            "title": definition["title"],
+            "version": version,
+            "generated_at": generated_at,
+            "stale_at": generated_at + definition["refresh_seconds"],
+            "data": data,
+        }
+        cursor.execute(
+            "INSERT INTO report_snapshots (report_name, version, generated_at, payload) VALUES (%s, %s, %s, %s)",
+            (name, version, datetime.fromtimestamp(generated_at), json.dumps(snapshot, default=str)),
+        )
+        cursor.execute("DELETE FROM report_snapshots WHERE report_name = %s AND version <= %s", (name, version - REPORT_SNAPSHOT_HISTORY))
+        return snapshot
+
+    snapshot = run_in_transaction(store)
+    snapshot["table_versions"] = table_versions
+    with _report_lock:
+        _report_snapshots[name] = snapshot
+    logging.info("Report '%s' refreshed to version %s.", name, snapshot['version'])
+    return snapshot
+
+def load_report_snapshot(name):
+    """Load the latest stored snapshot of report ``name``, or None if there is none."""
+    with database_connection(read_only=True) as connection:
+        cursor = connection.cursor()
+        cursor.execute("SELECT payload FROM report_snapshots WHERE report_name = %s ORDER BY version DESC LIMIT 1", (name,))
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    snapshot = json.loads(row[0])
+    with _report_lock:
+        # Changes made by other processes are unknown, so rely on the refresh cadence
+        snapshot["table_versions"] = {table: table_version(table) for table in REPORTS[name]["tables"]}
+        _report_snapshots[name] = snapshot
+    return snapshot
+
+def get_report(name):
+    """
+    Return the latest snapshot of report ``name``, computing it if none exists yet.
+
+    While the scheduler runs, a stale snapshot is served and the scheduler
+    refreshes it. Without the scheduler, as in the batch CLI, a snapshot past
+    its ``stale_at`` or older than a change to its tables is refreshed here.
+    """
+    if name not in REPORTS:
+        raise ValueError(f"Unknown report: {name}")
+    with _report_lock:
+        snapshot = _report_snapshots.get(name)
+    snapshot = snapshot or load_report_snapshot(name)
+    if snapshot is None:
+        return refresh_report(name)
+    if report_scheduler is None and (time.time() >= snapshot["stale_at"] or report_is_due(name)):
+        return refresh_report(name)
+    return snapshot
+
+def report_is_due(name, now=None):
+    """Tell whether report ``name`` has reached its refresh cadence or its tables changed."""
+    now = now or time.time()
+    definition = REPORTS[name]
+    with _report_lock:
+        snapshot = _report_snapshots.get(name)
+        if snapshot is None:
+            return True
+        if now >= snapshot["generated_at"] + definition["refresh_seconds"]:
+            return True
+        return any(table_version(table) != version for table, version in snapshot["table_versions"].items())
+
+class ReportScheduler:
+    """Background thread that keeps report snapshots fresh."""
+
+    def __init__(self, poll_seconds=30, debounce_seconds=2):
+        self.poll_seconds = poll_seconds
+        self.debounce_seconds = debounce_seconds
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="report-scheduler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        _data_changed.set()
+        self._thread.join(timeout)
+
+    def run_pending(self):
+        """Refresh every report that is due; returns the names refreshed."""
+        refreshed = []
+        for name in REPORTS:
+            if not report_is_due(name):
+                continue
+            try:
+                refresh_report(name)
+                refreshed.append(name)
+            except Exception as e:
+                logging.error("Failed to refresh report '%s': %s", name, e)
+        return refreshed
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.run_pending()
+            if _data_changed.wait(self.poll_seconds):
+                _data_changed.clear()
+                # Let a burst of writes settle before recomputing
+                self._stop.wait(self.debounce_seconds)
+
+def start_report_scheduler(poll_seconds=30):
+    """Start the background report scheduler once per process."""
+    global report_scheduler
+    if report_scheduler is None:
+        report_scheduler = ReportScheduler(poll_seconds=poll_seconds)
+        report_scheduler.start()
+    return report_scheduler
+
+def _format_timestamp(timestamp):
+    return datetime.fromtimestamp(timestamp).isoformat(sep=" ", timespec="seconds")
+
+def render_report_text(snapshot):
+    data = snapshot["data"]
+    lines = [
+        snapshot["title"],
+        f"Version {snapshot['version']}, generated {_format_timestamp(snapshot['generated_at'])}, stale at {_format_timestamp(snapshot['stale_at'])}",
+        "",
+    ]
+    for label, value in data["summary"].items():
+        lines.append(f"{label}: {value}")
+    for section in data["sections"]:
+        lines.append("")
+        lines.append(f"{section['title']}:")
+        row_format = section.get("row_format")
+        for row in section["rows"]:
+            lines.append(row_format.format(*row) if row_format else ", ".join(str(value) for value in row))
+    return "\n".join(lines)
+
+def render_report_json(snapshot):
+    payload = {key: value for key, value in snapshot.items() if key != "table_versions"}
+    payload["generated_at"] = _format_timestamp(snapshot["generated_at"])
+    payload["stale_at"] = _format_timestamp(snapshot["stale_at"])
+    return json.dumps(payload, default=str, indent=2)
+
+def render_report_csv(snapshot):
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(["report", snapshot["report"], "version", snapshot["version"],
+                     "generated_at", _format_timestamp(snapshot["generated_at"]),
+                     "stale_at", _format_timestamp(snapshot["stale_at"])])
+    for label, value in snapshot["data"]["summary"].items():
+        writer.writerow([label, value])
+    for section in snapshot["data"]["sections"]:
+        writer.writerow([])
+        writer.writerow([section["title"]])
+        writer.writerow(section["columns"])
+        writer.writerows(section["rows"])
+    return output.getvalue()
+
+REPORT_RENDERERS = {
+    "text": render_report_text,
+    "json": render_report_json,
+    "csv": render_report_csv,
+}
+
+def render_report(name, fmt="text"):
+    """Render the latest snapshot of report ``name`` as text, json or csv."""
+    if fmt not in REPORT_RENDERERS:
+        raise ValueError(f"Unknown report format: {fmt}")
+    snapshot = get_report(name)
+    with phase("format"):
+        return REPORT_RENDERERS[fmt](snapshot)
+
+def generate_report(fmt="text"):
+    """Print the alumni statistics report."""
+    try:
+        print(render_report("alumni_statistics", fmt))
+        logging.info("Report generated successfully.")
+    except db.Error as db_err:
+        logging.error("Database error generating report: %s", db_err)
+    except Exception as e:
+        logging.error("Failed to generate report: %s", e)
+        print("An error occurred during report generation.")
+
+def generate_alumni_statistics(fmt="text"):
+    """
+    Generate statistics about alumni.
+    """
+    try:
+        print(render_report("alumni_statistics", fmt))
+        logging.info("Alumni statistics generated successfully.")
+    except Exception as e:
+        logging.error("Failed to generate alumni statistics: %s", e)
+        print("An error occurred while generating alumni statistics.")
+
+def generate_event_participation_report(fmt="text"):
+    """
+    Generate a report on event participation.
+    """
+    try:
+        print(render_report("event_participation", fmt))
+        logging.info("Event participation report generated successfully.")
+    except Exception as e:
+        logging.error("Failed to generate event participation report: %s", e)
+        print("An error occurred while generating event participation report.")
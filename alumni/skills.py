@@ -0,0 +1,401 @@
+"""Skill name normalization, aliases and related-skill suggestions.
+
+Skill names are typed freely, so "python", "Python3" and "Python " used to
+become three skills. Every name is now reduced to a canonical form before it
+is stored or searched: case-folded, whitespace collapsed, stray punctuation
+and the release number of a language or framework removed, then looked up in the alias table
+(``skill_aliases`` on top of SEED_SKILL_ALIASES) so that "js" and
+"javascript" name the same skill. normalize_skills() merges the skills that
+were stored before, re-keying their ``alumni_skills`` links in bulk.
+
+Related skills come from how often two skills appear on the same profile.
+refresh_related_skills() loads ``alumni_skills`` into a sparse alumni x skills
+matrix, multiplies it with itself one block of skills at a time and keeps the
+top K skills per skill in ``skill_related``, which related_skills() serves.
+numpy and scipy are only needed for the refresh, so they are imported on
+first use.
+"""
+import logging
+import re
+import threading
+import time
+import unicodedata
+
+from alumni.cache import get_query_cache, normalize_query
+from alumni.changes import mark_data_changed, on_data_changed
+from alumni.db import database_connection, run_in_transaction
+
+# Abbreviations and spellings of the same skill, applied on top of the canonical form.
+SEED_SKILL_ALIASES = {
+    "js": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "golang": "go",
+    "k8s": "kubernetes",
+    "postgres": "postgresql",
+    "nodejs": "node.js",
+    "reactjs": "react",
+    "react.js": "react",
+    "ml": "machine learning",
+    "ms excel": "excel",
+    "microsoft excel": "excel",
+}
+
+ALIAS_RELOAD_SECONDS = 300
+SKILL_LINKS_CHUNK_SIZE = 500_000
+RELATED_SKILLS_TOP_K = 20
+# Pairs seen on fewer profiles than this are noise rather than a relation
+RELATED_SKILLS_MIN_SUPPORT = 2
+RELATED_SKILLS_BLOCK_SIZE = 2048
+RELATED_SKILLS_INSERT_BATCH = 5000
+RELATED_SKILLS_TAG = "skill_related"
+
+# Skills whose release number is not part of the skill: "python3" and "node 18.2" are python and node.
+# Digits in other names, as in ipv6, html5, office 365 or industry 4.0, are kept.
+VERSIONED_SKILLS = frozenset({
+    "python", "java", "javascript", "typescript", "node", "node.js", "nodejs", "php", "perl", "ruby", "rails",
+    "go", "golang", "rust", "swift", "kotlin", "scala", "angular", "vue", "react", "django", "spring", "laravel",
+    "bootstrap", "postgresql", "postgres", "mysql",
+})
+_VERSION_SUFFIX = re.compile(r"^(?P<base>.*?[a-z])[ .-]*v?\d+(?:\.\d+)*$")
+
+def canonicalize_skill(name):
+    """
+    Reduce a skill name to its canonical spelling, without consulting aliases.
+
+    "Python 3.11", "python3" and " PYTHON. " all become "python". A trailing
+    version is only dropped from the names in VERSIONED_SKILLS, so "ipv6",
+    "html5" and "windows 10" keep theirs.
+    """
+    text = normalize_query(unicodedata.normalize("NFKC", name or "")).strip(" ,-").rstrip(".")
+    match = _VERSION_SUFFIX.match(text)
+    if match and match.group("base").rstrip(" .-") in VERSIONED_SKILLS:
+        return match.group("base").rstrip(" .-")
+    return text
+
+def canonical_skill_name(name, aliases=None):
+    """Return the name ``name`` is stored and searched under, following aliases."""
+    if aliases is None:
+        aliases = skill_aliases()
+    text = normalize_query(unicodedata.normalize("NFKC", name or "")).strip(" ,-").rstrip(".")
+    if text in aliases:
+        return aliases[text]
+    canonical = canonicalize_skill(text)
+    return aliases.get(canonical, canonical)
+
+def _load_aliases(cursor):
+    cursor.execute("""
+        SELECT skill_aliases.alias, skills.skill_name FROM skill_aliases
+        JOIN skills ON skills.skill_id = skill_aliases.skill_id
+    """)
+    return {alias: normalize_query(skill_name) for alias, skill_name in cursor.fetchall()}
+
+_aliases = None
+_aliases_loaded_at = 0.0
+_aliases_lock = threading.Lock()
+
+def skill_aliases():
+    """Return the alias map, reloaded from ``skill_aliases`` every ALIAS_RELOAD_SECONDS."""
+    global _aliases, _aliases_loaded_at
+    with _aliases_lock:
+        if _aliases is None or time.monotonic() - _aliases_loaded_at > ALIAS_RELOAD_SECONDS:
+            try:
+                with database_connection(read_only=True) as connection:
+                    _aliases = dict(SEED_SKILL_ALIASES, **_load_aliases(connection.cursor()))
+            except Exception as e:
+                logging.error("Failed to load skill aliases, using the built-in ones: %s", e)
+                _aliases = dict(SEED_SKILL_ALIASES)
+            _aliases_loaded_at = time.monotonic()
+        return _aliases
+
+@on_data_changed
+def _reset_aliases(tables):
+    global _aliases
+    if "skill_aliases" in tables or "skills" in tables:
+        with _aliases_lock:
+            _aliases = None
+
+def invalidate_skill_caches():
+    """Drop every cached skill search and related-skill list."""
+    return get_query_cache().invalidate(lambda tag: tag.startswith("skill:") or tag == RELATED_SKILLS_TAG)
+
+def plan_skill_merges(skills, aliases):
+    """
+    Group stored skills by canonical name and pick the row each group keeps.
+
+    The kept row is the one with the most links, so the fewest links move.
+
+    :param skills: (skill_id, skill_name, links) rows.
+    :return: (rekey, renames): rekey maps every merged skill_id to the kept
+             skill_id, renames maps kept skill_ids to their canonical name.
+    """
+    groups = {}
+    for skill_id, skill_name, links in skills:
+        groups.setdefault(canonical_skill_name(skill_name, aliases), []).append((skill_id, skill_name, links))
+    rekey, renames = {}, {}
+    for canonical, members in groups.items():
+        kept_id, kept_name, _ = max(members, key=lambda member: (member[2], member[1] == canonical, -member[0]))
+        for skill_id, _, _ in members:
+            if skill_id != kept_id:
+                rekey[skill_id] = kept_id
+        if kept_name != canonical:
+            renames[kept_id] = canonical
+    return rekey, renames
+
+def normalize_skills(dry_run=False):
+    """
+    Merge stored skills that share a canonical name.
+
+    Links of merged skills are re-keyed to the kept skill with set-based
+    statements over a temporary mapping table; a link the alumnus already has
+    under the kept skill is dropped instead of duplicated. The spellings of
+    merged skills that were matched through a built-in alias are recorded in
+    ``skill_aliases``. Runs in one transaction.
+
+    :return: Dict of migration metrics.
+    """
+    started = time.perf_counter()
+
+    def migrate(cursor):
+        stored_aliases = _load_aliases(cursor)
+        aliases = dict(SEED_SKILL_ALIASES, **stored_aliases)
+        cursor.execute("""
+            SELECT skills.skill_id, skills.skill_name, COUNT(alumni_skills.id) FROM skills
+            LEFT JOIN alumni_skills ON alumni_skills.skill_id = skills.skill_id
+            GROUP BY skills.skill_id, skills.skill_name
+        """)
+        skills = cursor.fetchall()
+        rekey, renames = plan_skill_merges(skills, aliases)
+        names = {skill_id: skill_name for skill_id, skill_name, _ in skills}
+        metrics = {"skills": len(skills), "merged": len(rekey), "renamed": len(renames),
+                   "links_moved": 0, "links_dropped": 0, "aliases_added": 0}
+        if dry_run or not (rekey or renames):
+            return metrics
+
+        if rekey:
+            cursor.execute("""
+                CREATE TEMPORARY TABLE skill_rekey (
+                    old_skill_id INT PRIMARY KEY,
+                    new_skill_id INT NOT NULL
+                )
+            """)
+            pairs = list(rekey.items())
+            for start in range(0, len(pairs), RELATED_SKILLS_INSERT_BATCH):
+                cursor.executemany("INSERT INTO skill_rekey (old_skill_id, new_skill_id) VALUES (%s, %s)",
+                                   pairs[start:start + RELATED_SKILLS_INSERT_BATCH])
+            cursor.execute("""
+                INSERT IGNORE INTO alumni_skills (alumnus_id, skill_id)
+                SELECT alumni_skills.alumnus_id, skill_rekey.new_skill_id FROM alumni_skills
+                JOIN skill_rekey ON skill_rekey.old_skill_id = alumni_skills.skill_id
+            """)
+            metrics["links_moved"] = cursor.rowcount
+            cursor.execute("""
+                DELETE alumni_skills FROM alumni_skills
+                JOIN skill_rekey ON skill_rekey.old_skill_id = alumni_skills.skill_id
+            """)
+            metrics["links_dropped"] = cursor.rowcount - metrics["links_moved"]
+            cursor.execute("""
+                UPDATE skill_aliases JOIN skill_rekey ON skill_rekey.old_skill_id = skill_aliases.skill_id
+                SET skill_aliases.skill_id = skill_rekey.new_skill_id
+            """)
+            # Related-skill rows of merged skills are rebuilt by the next refresh
+            cursor.execute("DELETE skill_related FROM skill_related JOIN skill_rekey ON skill_rekey.old_skill_id = skill_related.skill_id")
+            cursor.execute("DELETE skill_related FROM skill_related JOIN skill_rekey ON skill_rekey.old_skill_id = skill_related.related_skill_id")
+            cursor.execute("DELETE skills FROM skills JOIN skill_rekey ON skill_rekey.old_skill_id = skills.skill_id")
+            cursor.execute("DROP TEMPORARY TABLE skill_rekey")
+
+        # Renamed only now: the merged rows held names equal to the canonical one under the collation
+        if renames:
+            cursor.executemany("UPDATE skills SET skill_name = %s WHERE skill_id = %s",
+                               [(name, skill_id) for skill_id, name in renames.items()])
+
+        # Persist built-in aliases that merged a skill, so the table documents every merge
+        new_aliases = {}
+        for old_id, new_id in rekey.items():
+            alias = canonicalize_skill(names[old_id])
+            if alias != canonical_skill_name(names[old_id], aliases) and alias not in stored_aliases:
+                new_aliases[alias] = new_id
+        if new_aliases:
+            cursor.executemany("INSERT IGNORE INTO skill_aliases (alias, skill_id) VALUES (%s, %s)", list(new_aliases.items()))
+            metrics["aliases_added"] = len(new_aliases)
+        return metrics
+
+    metrics = run_in_transaction(migrate)
+    if not dry_run and (metrics["merged"] or metrics["renamed"]):
+        mark_data_changed("skills", "alumni_skills", "skill_aliases")
+        invalidate_skill_caches()
+    metrics["seconds"] = round(time.perf_counter() - started, 3)
+    logging.info("Skill normalization%s: %s", " (dry run)" if dry_run else "", metrics)
+    return metrics
+
+def add_skill_alias(alias, skill_name):
+    """
+    Make ``alias`` another name for ``skill_name``, then merge any skill stored under the alias.
+
+    :return: The normalize_skills() metrics.
+    """
+    key = canonicalize_skill(alias)
+    target = canonical_skill_name(skill_name)
+    if not key or not target:
+        raise ValueError("Alias and skill name must not be empty")
+    if key == target:
+        raise ValueError(f"'{alias}' already is the canonical name of '{skill_name}'")
+
+    def record(cursor):
+        cursor.execute("INSERT INTO skills (skill_name) VALUES (%s) ON DUPLICATE KEY UPDATE skill_id = LAST_INSERT_ID(skill_id)", (target,))
+        cursor.execute("""
+            INSERT INTO skill_aliases (alias, skill_id) VALUES (%s, %s)
+            ON DUPLICATE KEY UPDATE skill_id = VALUES(skill_id)
+        """, (key, cursor.lastrowid))
+
+    run_in_transaction(record)
+    mark_data_changed("skill_aliases")
+    logging.info("Skill alias '%s' now names '%s'.", key, target)
+    return normalize_skills()
+
+def load_skill_links(chunk_size=SKILL_LINKS_CHUNK_SIZE):
+    """Return the (alumnus_id, skill_id) pairs of ``alumni_skills`` as two numpy arrays."""
+    import numpy as np
+
+    alumnus_chunks, skill_chunks = [], []
+    with database_connection(read_only=True) as connection:
+        cursor = connection.cursor()
+        cursor.execute("SELECT alumnus_id, skill_id FROM alumni_skills WHERE alumnus_id IS NOT NULL AND skill_id IS NOT NULL")
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            chunk = np.array(rows, dtype=np.int64)
+            alumnus_chunks.append(chunk[:, 0])
+            skill_chunks.append(chunk[:, 1])
+        cursor.close()
+    if not alumnus_chunks:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(alumnus_chunks), np.concatenate(skill_chunks)
+
+def compute_related_skills(alumnus_ids, skill_ids, top_k=RELATED_SKILLS_TOP_K,
+                           min_support=RELATED_SKILLS_MIN_SUPPORT, block_size=RELATED_SKILLS_BLOCK_SIZE):
+    """
+    Rank the skills that co-occur with every skill.
+
+    Two skills co-occur when one alumnus lists both. The score is the cosine
+    similarity of the skills' alumni sets, count / sqrt(alumni_a * alumni_b),
+    so a skill everyone lists does not top every ranking. The skills x skills
+    product is computed ``block_size`` skills at a time, which bounds memory
+    by the densest block rather than the whole co-occurrence matrix.
+
+    :param alumnus_ids: Integer array, one entry per alumni_skills link.
+    :param skill_ids: Integer array parallel to ``alumnus_ids``.
+    :return: Arrays (skill_id, related_skill_id, cooccurrences, score), with
+             at most ``top_k`` rows per skill, best first.
+    """
+    import numpy as np
+    from scipy import sparse
+
+    empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64),
+             np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64))
+    if len(alumnus_ids) == 0:
+        return empty
+    alumni, rows = np.unique(alumnus_ids, return_inverse=True)
+    skills, columns = np.unique(skill_ids, return_inverse=True)
+    incidence = sparse.csr_matrix((np.ones(len(rows), dtype=np.int32), (rows, columns)),
+                                  shape=(len(alumni), len(skills)))
+    support = np.asarray(incidence.sum(axis=0)).ravel().astype(np.float64)
+    by_skill = incidence.T.tocsr()
+
+    results = []
+    for start in range(0, len(skills), block_size):
+        block = (by_skill[start:start + block_size] @ incidence).tocoo()
+        source = block.row.astype(np.int64) + start
+        related = block.col.astype(np.int64)
+        counts = block.data.astype(np.int64)
+        keep = (source != related) & (counts >= min_support)
+        source, related, counts = source[keep], related[keep], counts[keep]
+        if not len(source):
+            continue
+        scores = counts / np.sqrt(support[source] * support[related])
+        # Best first within each source skill, then keep the first top_k of every run
+        order = np.lexsort((related, -scores, source))
+        source, related, counts, scores = source[order], related[order], counts[order], scores[order]
+        rank = np.arange(len(source)) - np.searchsorted(source, source)
+        keep = rank < top_k
+        results.append((skills[source[keep]], skills[related[keep]], counts[keep], scores[keep]))
+    if not results:
+        return empty
+    return tuple(np.concatenate(column) for column in zip(*results))
+
+def refresh_related_skills(top_k=RELATED_SKILLS_TOP_K, min_support=RELATED_SKILLS_MIN_SUPPORT):
+    """
+    Recompute ``skill_related`` from ``alumni_skills``.
+
+    The table is replaced in one transaction, so readers see either the old
+    or the new rankings.
+
+    :return: Dict of refresh metrics.
+    """
+    started = time.perf_counter()
+    alumnus_ids, skill_ids = load_skill_links()
+    loaded = time.perf_counter()
+    skill_column, related_column, counts, scores = compute_related_skills(alumnus_ids, skill_ids, top_k, min_support)
+    computed = time.perf_counter()
+
+    def store(cursor):
+        cursor.execute("DELETE FROM skill_related")
+        for start in range(0, len(skill_column), RELATED_SKILLS_INSERT_BATCH):
+            end = start + RELATED_SKILLS_INSERT_BATCH
+            cursor.executemany("""
+                INSERT INTO skill_related (skill_id, related_skill_id, cooccurrences, score)
+                VALUES (%s, %s, %s, %s)
+            """, list(zip(skill_column[start:end].tolist(), related_column[start:end].tolist(),
+                          counts[start:end].tolist(), scores[start:end].tolist())))
+
+    run_in_transaction(store)
+    mark_data_changed(RELATED_SKILLS_TAG)
+    get_query_cache().invalidate_tags(RELATED_SKILLS_TAG)
+    metrics = {
+        "links": len(alumnus_ids),
+        "rows": len(skill_column),
+        "load_seconds": round(loaded - started, 3),
+        "compute_seconds": round(computed - loaded, 3),
+        "store_seconds": round(time.perf_counter() - computed, 3),
+    }
+    logging.info("Related skills refreshed: %s", metrics)
+    return metrics
+
+def related_skills(skill_name, limit=10):
+    """Return (skill_name, cooccurrences, score) rows of the skills listed most often alongside ``skill_name``."""
+    skill = canonical_skill_name(skill_name)
+
+    def run_query():
+        with database_connection(read_only=True) as connection:
+            cursor = connection.cursor()
+            cursor.execute("""
+                SELECT related.skill_name, skill_related.cooccurrences, skill_related.score FROM skills
+                JOIN skill_related ON skill_related.skill_id = skills.skill_id
+                JOIN skills AS related ON related.skill_id = skill_related.related_skill_id
+                WHERE skills.skill_name = %s
+                ORDER BY skill_related.score DESC, related.skill_name
+                LIMIT %s
+            """, (skill, limit))
+            return cursor.fetchall()
+
+    try:
+        return get_query_cache().get_or_compute(("related_skills", skill, limit), run_query, tags=(RELATED_SKILLS_TAG,))
+    except Exception as e:
+        logging.error("Failed to load skills related to '%s': %s", skill_name, e)
+        return []
+
+def benchmark_related_skills(alumni=1_000_000, skills=100_000, skills_per_alumnus=8, seed=0):
+    """Rank related skills for synthetic profiles with Zipf-distributed skill popularity; returns the timing."""
+    import numpy as np
+
+    generator = np.random.default_rng(seed)
+    alumnus_ids = np.repeat(np.arange(alumni, dtype=np.int64), skills_per_alumnus)
+    skill_ids = (generator.zipf(1.3, size=len(alumnus_ids)) - 1) % skills
+    # Drop the repeats a profile cannot hold, as the unique key on alumni_skills does
+    pairs = np.unique(alumnus_ids * skills + skill_ids)
+    alumnus_ids, skill_ids = pairs // skills, pairs % skills
+    started = time.perf_counter()
+    rows = compute_related_skills(alumnus_ids, skill_ids)
+    elapsed = time.perf_counter() - started
+    return {"alumni": alumni, "skills": skills, "links": len(pairs), "rows": len(rows[0]), "seconds": round(elapsed, 3)}
@@ -0,0 +1,74 @@
+"""Cold-start benchmark for the entry points, based on ``python -X importtime``.
+
+Run ``python -m alumni.startup [MODULE] [--runs N] [--record FILE]`` to print the
+import time of MODULE (default alumni.menus) and optionally append it to a
+JSON-lines history file so regressions show up over time.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+DEFAULT_MODULE = "alumni.menus"
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def parse_importtime(stderr):
+    """Return {module: (self_us, cumulative_us)} from ``-X importtime`` output."""
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        timings[module.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+def measure_import_time(module=DEFAULT_MODULE, runs=5, top=10):
+    """
+    Import ``module`` in ``runs`` fresh interpreters.
+
+    Returns the minimum and median cumulative import time in milliseconds and the
+    ``top`` modules with the largest self time (best run per module).
+    """
+    totals = []
+    self_times = {}
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True, text=True, cwd=PROJECT_ROOT, check=True,
+        )
+        timings = parse_importtime(result.stderr)
+        totals.append(timings[module][1] / 1000)
+        for name, (self_us, _) in timings.items():
+            self_times[name] = min(self_times.get(name, self_us), self_us)
+
+    heaviest = sorted(self_times.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {
+        "module": module,
+        "runs": runs,
+        "min_ms": round(min(totals), 2),
+        "median_ms": round(statistics.median(totals), 2),
+        "heaviest_self_ms": {name: round(self_us / 1000, 2) for name, self_us in heaviest},
+    }
+
+def record_import_time(path, measurement):
+    """Append a timestamped measurement to the JSON-lines history at ``path``."""
+    with open(path, mode='a', encoding='utf-8') as file:
+        file.write(json.dumps(dict(measurement, recorded_at=time.strftime("%Y-%m-%dT%H:%M:%S"))) + "\n")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold-start import time.")
+    parser.add_argument("module", nargs="?", default=DEFAULT_MODULE)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--record", metavar="FILE", help="append the result to a JSON-lines history file")
+    args = parser.parse_args(argv)
+
+    measurement = measure_import_time(args.module, args.runs)
+    if args.record:
+        record_import_time(args.record, measurement)
+    print(json.dumps(measurement, indent=2))
+
+if __name__ == "__main__":
+    main()
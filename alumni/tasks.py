@@ -0,0 +1,436 @@
+"""Durable background task queue backed by a local SQLite file.
+
+Request paths call ``enqueue()`` and return immediately; workers claim tasks
+by priority, run the registered handler, and retry failures with exponential
+backoff until ``max_attempts``. Workers run as a thread inside the interactive
+menus and as separate processes started with ``python -m alumni worker``. Every
+process that opens the same ``[tasks] path`` shares the queue.
+
+A claimed task is leased for ``TASK_LEASE_SECONDS`` and the worker renews the
+lease while the handler runs, up to the handler's ``timeout``. If the worker
+dies, or the handler overruns its timeout, the task is claimed again once the
+lease expires. Errors in ``PERMANENT_TASK_ERRORS`` fail the task at once.
+"""
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from alumni.config import load_task_settings
+
+PRIORITY_LOW = 0
+PRIORITY_NORMAL = 5
+PRIORITY_HIGH = 10
+
+TASK_STATUSES = ("queued", "running", "done", "failed", "cancelled")
+# Workers that have not reported for this long are not counted as live
+WORKER_HEARTBEAT_SECONDS = 30
+# A running task's lease; its worker renews it every third of this
+TASK_LEASE_SECONDS = 60
+# Errors a retry cannot fix, such as a missing event or a bad payload
+PERMANENT_TASK_ERRORS = (ValueError, TypeError)
+
+TASK_HANDLERS = {}
+
+_queue = None
+_queue_lock = threading.Lock()
+_in_process_workers = []
+
+def task(name, priority=PRIORITY_NORMAL, timeout=600):
+    """
+    Register the decorated function as the handler of tasks called ``name``.
+
+    The handler receives the task payload as keyword arguments and may return a
+    JSON-serializable result; raising an exception schedules a retry unless it
+    is one of ``PERMANENT_TASK_ERRORS``.
+
+    :param priority: Default priority of enqueued tasks, higher runs first.
+    :param timeout: Seconds a task may run before its lease is no longer renewed and another worker may retry it.
+    """
+    def register(handler):
+        TASK_HANDLERS[name] = {"handler": handler, "priority": priority, "timeout": timeout}
+        return handler
+    return register
+
+class TaskQueue:
+    """Tasks, their state and worker statistics in a SQLite file."""
+
+    def __init__(self, path, max_attempts=5, backoff_seconds=10.0):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self._local = threading.local()
+        self._connection().executescript("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                task_id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                priority INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL,
+                run_at REAL NOT NULL,
+                lease_until REAL,
+                enqueued_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                worker TEXT,
+                last_error TEXT,
+                result TEXT);
+            CREATE INDEX IF NOT EXISTS tasks_ready ON tasks (status, priority DESC, run_at);
+            CREATE TABLE IF NOT EXISTS task_workers (
+                worker TEXT PRIMARY KEY,
+                pid INTEGER NOT NULL,
+                started_at REAL NOT NULL,
+                heartbeat_at REAL NOT NULL,
+                busy_seconds REAL NOT NULL DEFAULT 0,
+                tasks_done INTEGER NOT NULL DEFAULT 0,
+                tasks_failed INTEGER NOT NULL DEFAULT 0);
+        """)
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.row_factory = sqlite3.Row
+            self._local.connection = connection
+        return connection
+
+    def enqueue(self, name, payload=None, priority=None, delay=0, max_attempts=None):
+        """Add a task and return its ID; ``delay`` postpones the first attempt by that many seconds."""
+        if name not in TASK_HANDLERS:
+            raise ValueError(f"Unknown task: {name}")
+        now = time.time()
+        cursor = self._connection().execute("""
+            INSERT INTO tasks (name, payload, priority, status, max_attempts, run_at, enqueued_at)
+            VALUES (?, ?, ?, 'queued', ?, ?, ?)
+        """, (name, json.dumps(payload or {}, default=str),
+              TASK_HANDLERS[name]["priority"] if priority is None else priority,
+              max_attempts or self.max_attempts, now + delay, now))
+        logging.info("Enqueued task %s '%s'", cursor.lastrowid, name)
+        return cursor.lastrowid
+
+    def claim(self, worker):
+        """Lease the most urgent ready task to ``worker``; returns the task row or None."""
+        connection = self._connection()
+        now = time.time()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            # A task whose worker died on its last attempt is not retried again
+            connection.execute("""
+                UPDATE tasks SET status = 'failed', finished_at = ?, lease_until = NULL,
+                                 last_error = 'Worker stopped before the task finished'
+                WHERE status = 'running' AND lease_until < ? AND attempts >= max_attempts
+            """, (now, now))
+            claimed = connection.execute("""
+                SELECT task_id, name, payload, attempts, max_attempts, enqueued_at FROM tasks
+                WHERE (status = 'queued' AND run_at <= ?) OR (status = 'running' AND lease_until < ?)
+                ORDER BY priority DESC, run_at, task_id
+                LIMIT 1
+            """, (now, now)).fetchone()
+            if claimed is not None:
+                connection.execute("""
+                    UPDATE tasks
+                    SET status = 'running', attempts = attempts + 1, started_at = ?, lease_until = ?, worker = ?
+                    WHERE task_id = ?
+                """, (now, now + task_lease_seconds(claimed["name"]), worker, claimed["task_id"]))
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        if claimed is None:
+            return None
+        return dict(claimed, attempts=claimed["attempts"] + 1)
+
+    def renew(self, task_id, worker, lease_seconds):
+        """Extend the lease ``worker`` holds on a running task; returns False if the lease was lost."""
+        cursor = self._connection().execute("""
+            UPDATE tasks SET lease_until = ? WHERE task_id = ? AND worker = ? AND status = 'running'
+        """, (time.time() + lease_seconds, task_id, worker))
+        return cursor.rowcount > 0
+
+    def complete(self, task_id, result):
+        self._connection().execute("""
+            UPDATE tasks SET status = 'done', finished_at = ?, lease_until = NULL, result = ?, last_error = NULL
+            WHERE task_id = ?
+        """, (time.time(), json.dumps(result, default=str), task_id))
+
+    def fail(self, task_id, attempts, max_attempts, error, permanent=False):
+        """Record a failed attempt; unless ``permanent``, the task is retried with backoff until it runs out of attempts."""
+        now = time.time()
+        if attempts < max_attempts and not permanent:
+            delay = self.backoff_seconds * (2 ** (attempts - 1)) * (1 + random.random())
+            self._connection().execute("""
+                UPDATE tasks SET status = 'queued', run_at = ?, lease_until = NULL, last_error = ?
+                WHERE task_id = ?
+            """, (now + delay, error, task_id))
+            return delay
+        self._connection().execute("""
+            UPDATE tasks SET status = 'failed', finished_at = ?, lease_until = NULL, last_error = ?
+            WHERE task_id = ?
+        """, (now, error, task_id))
+        return None
+
+    def cancel(self, task_id):
+        """Cancel a task that has not started; returns True if it was cancelled."""
+        cursor = self._connection().execute(
+            "UPDATE tasks SET status = 'cancelled', finished_at = ? WHERE task_id = ? AND status = 'queued'",
+            (time.time(), task_id))
+        return cursor.rowcount > 0
+
+    def get(self, task_id):
+        row = self._connection().execute("SELECT * FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        return _task_dict(row) if row else None
+
+    def list(self, status=None, limit=20):
+        """Return the most recent tasks, optionally only those with ``status``."""
+        if status:
+            rows = self._connection().execute(
+                "SELECT * FROM tasks WHERE status = ? ORDER BY task_id DESC LIMIT ?", (status, limit))
+        else:
+            rows = self._connection().execute("SELECT * FROM tasks ORDER BY task_id DESC LIMIT ?", (limit,))
+        return [_task_dict(row) for row in rows]
+
+    def prune(self, retention_days):
+        """Delete finished tasks older than ``retention_days``; returns the number deleted."""
+        cutoff = time.time() - retention_days * 86400
+        cursor = self._connection().execute(
+            "DELETE FROM tasks WHERE status IN ('done', 'failed', 'cancelled') AND finished_at < ?", (cutoff,))
+        return cursor.rowcount
+
+    def register_worker(self, worker):
+        now = time.time()
+        self._connection().execute("""
+            INSERT OR REPLACE INTO task_workers (worker, pid, started_at, heartbeat_at) VALUES (?, ?, ?, ?)
+        """, (worker, os.getpid(), now, now))
+
+    def record_work(self, worker, busy_seconds=0.0, done=0, failed=0):
+        self._connection().execute("""
+            UPDATE task_workers
+            SET heartbeat_at = ?, busy_seconds = busy_seconds + ?, tasks_done = tasks_done + ?,
+                tasks_failed = tasks_failed + ?
+            WHERE worker = ?
+        """, (time.time(), busy_seconds, done, failed, worker))
+
+    def unregister_worker(self, worker):
+        self._connection().execute("DELETE FROM task_workers WHERE worker = ?", (worker,))
+
+    def stats(self):
+        """
+        Return queue depth, latency and worker utilization.
+
+        ``wait_seconds`` is the average time from enqueue to the start of the
+        last attempt and ``run_seconds`` the average run time, both over the
+        tasks finished in the last hour. A worker's utilization is the share of
+        its uptime spent running tasks.
+        """
+        connection = self._connection()
+        now = time.time()
+        counts = dict.fromkeys(TASK_STATUSES, 0)
+        counts.update(connection.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall())
+        ready, oldest = connection.execute(
+            "SELECT COUNT(*), MIN(enqueued_at) FROM tasks WHERE status = 'queued' AND run_at <= ?", (now,)).fetchone()
+        wait, run = connection.execute("""
+            SELECT AVG(started_at - enqueued_at), AVG(finished_at - started_at) FROM tasks
+            WHERE status = 'done' AND finished_at >= ?
+        """, (now - 3600,)).fetchone()
+        workers = []
+        for row in connection.execute("SELECT * FROM task_workers WHERE heartbeat_at >= ? ORDER BY worker",
+                                      (now - WORKER_HEARTBEAT_SECONDS,)):
+            uptime = max(row["heartbeat_at"] - row["started_at"], 1e-9)
+            workers.append({
+                "worker": row["worker"],
+                "pid": row["pid"],
+                "tasks_done": row["tasks_done"],
+                "tasks_failed": row["tasks_failed"],
+                "utilization": round(min(row["busy_seconds"] / uptime, 1.0), 3),
+            })
+        return {
+            "counts": counts,
+            "depth": ready,
+            "oldest_queued_seconds": round(now - oldest, 3) if oldest else 0.0,
+            "wait_seconds": round(wait, 3) if wait is not None else None,
+            "run_seconds": round(run, 3) if run is not None else None,
+            "workers": workers,
+        }
+
+def task_lease_seconds(name):
+    """Return the lease of a claimed task: ``TASK_LEASE_SECONDS``, or its handler's timeout if shorter."""
+    return min(TASK_LEASE_SECONDS, TASK_HANDLERS.get(name, {}).get("timeout", 600))
+
+def _task_dict(row):
+    task = dict(row)
+    task["payload"] = json.loads(task["payload"])
+    task["result"] = json.loads(task["result"]) if task["result"] else None
+    return task
+
+def get_task_queue():
+    """Return the process-wide TaskQueue, built from the task settings on first use."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            settings = load_task_settings()
+            _queue = TaskQueue(settings["path"], settings["max_attempts"], settings["backoff_seconds"])
+        return _queue
+
+def enqueue(name, payload=None, priority=None, delay=0):
+    """Add a task to the shared queue and return its ID."""
+    return get_task_queue().enqueue(name, payload, priority, delay)
+
+def get_task(task_id):
+    """Return the state of a task as a dict, or None if it does not exist."""
+    return get_task_queue().get(task_id)
+
+def list_tasks(status=None, limit=20):
+    return get_task_queue().list(status, limit)
+
+def cancel_task(task_id):
+    return get_task_queue().cancel(task_id)
+
+def queue_stats():
+    return get_task_queue().stats()
+
+@contextmanager
+def lease_heartbeat(queue, worker, claimed):
+    """Renew the lease on a claimed task from a background thread until the block exits or the task times out."""
+    task_id, name = claimed["task_id"], claimed["name"]
+    lease = task_lease_seconds(name)
+    deadline = time.time() + TASK_HANDLERS.get(name, {}).get("timeout", 600)
+    done = threading.Event()
+
+    def renew():
+        while not done.wait(lease / 3):
+            if time.time() >= deadline:
+                logging.warning("Task %s '%s' ran past its timeout; its lease will expire", task_id, name)
+                return
+            if not queue.renew(task_id, worker, lease):
+                logging.warning("Task %s '%s' lost its lease on %s", task_id, name, worker)
+                return
+
+    thread = threading.Thread(target=renew, name=f"task-lease-{task_id}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        done.set()
+        thread.join()
+
+def run_task(queue, worker, claimed):
+    """Run one claimed task and record the outcome; returns True if it succeeded."""
+    task_id, name = claimed["task_id"], claimed["name"]
+    handler = TASK_HANDLERS.get(name)
+    try:
+        if handler is None:
+            raise ValueError(f"No handler registered for task '{name}'")
+        with lease_heartbeat(queue, worker, claimed):
+            result = handler["handler"](**json.loads(claimed["payload"]))
+        queue.complete(task_id, result)
+        logging.info("Task %s '%s' finished on %s", task_id, name, worker)
+        return True
+    except Exception as e:
+        delay = queue.fail(task_id, claimed["attempts"], claimed["max_attempts"], f"{type(e).__name__}: {e}",
+                           permanent=isinstance(e, PERMANENT_TASK_ERRORS))
+        if delay is None:
+            logging.error("Task %s '%s' failed after %s attempts: %s", task_id, name, claimed["attempts"], e)
+        else:
+            logging.warning("Task %s '%s' failed, retrying in %.1fs: %s", task_id, name, delay, e)
+        return False
+
+def run_worker(stop=None, poll_seconds=None, once=False, worker=None):
+    """
+    Claim and run tasks until ``stop`` is set, or until the queue is drained if ``once``.
+
+    :return: The number of tasks run.
+    """
+    settings = load_task_settings()
+    poll_seconds = poll_seconds or settings["poll_seconds"]
+    stop = stop or threading.Event()
+    queue = get_task_queue()
+    worker = worker or f"{os.uname().nodename}:{os.getpid()}:{threading.get_ident()}"
+    queue.register_worker(worker)
+    queue.prune(settings["retention_days"])
+    ran = 0
+    try:
+        while not stop.is_set():
+            claimed = queue.claim(worker)
+            if claimed is None:
+                if once:
+                    break
+                queue.record_work(worker)
+                stop.wait(poll_seconds)
+                continue
+            started = time.perf_counter()
+            succeeded = run_task(queue, worker, claimed)
+            queue.record_work(worker, time.perf_counter() - started, int(succeeded), int(not succeeded))
+            ran += 1
+    finally:
+        queue.unregister_worker(worker)
+    return ran
+
+def _worker_process(stop):
+    from alumni.logs import configure_logging
+    configure_logging()
+    try:
+        run_worker(stop)
+    except KeyboardInterrupt:
+        pass
+
+def run_worker_processes(processes):
+    """Run ``processes`` worker processes until interrupted."""
+    import multiprocessing
+    context = multiprocessing.get_context("spawn")
+    stop = context.Event()
+    workers = [context.Process(target=_worker_process, args=(stop,), name=f"task-worker-{i}") for i in range(processes)]
+    for process in workers:
+        process.start()
+    try:
+        for process in workers:
+            process.join()
+    except KeyboardInterrupt:
+        stop.set()
+        for process in workers:
+            process.join()
+
+def start_task_workers(count=None):
+    """Start in-process worker threads once per process; ``count`` defaults to the ``in_process_workers`` setting."""
+    if _in_process_workers:
+        return _in_process_workers
+    count = load_task_settings()["in_process_workers"] if count is None else count
+    for i in range(count):
+        thread = threading.Thread(target=run_worker, name=f"task-worker-{i}", daemon=True)
+        thread.start()
+        _in_process_workers.append(thread)
+    return _in_process_workers
+
+@task("email.templated", priority=PRIORITY_HIGH, timeout=120)
+def send_templated_email_task(template, recipient, fields):
+    from alumni.mail import send_templated_email
+    if not send_templated_email(template, recipient, fields):
+        raise RuntimeError(f"Could not send '{template}' email to {recipient}")
+
+@task("events.invite", timeout=3600)
+def invite_attendees_task(event_id, emails, parallel=1):
+    from alumni.events import invite_attendees
+    stats = invite_attendees(event_id, emails, parallel=parallel)
+    if stats["failed"]:
+        # Retried; invitations already sent are not sent again
+        raise RuntimeError(f"Could not send {stats['failed']} of {stats['invited']} invitations to event {event_id}")
+    return stats
+
+@task("transfer.import", priority=PRIORITY_LOW, timeout=3600)
+def import_alumni_task(path, batch_size=1000, parallel=1):
+    from alumni.transfer import import_alumni_csv
+    return import_alumni_csv(path, batch_size=batch_size, parallel=parallel)
+
+@task("transfer.export", priority=PRIORITY_LOW, timeout=3600)
+def export_table_task(path, table="alumni", fmt="csv"):
+    from alumni.transfer import export_table
+    with open(path, mode='w', newline='', encoding='utf-8') as file:
+        rows = export_table(table, file, fmt)
+    return {"table": table, "rows": rows, "output": path}
@@ -0,0 +1,216 @@
+"""Batch import and export of alumni data."""
+import csv
+import json
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from alumni import db
+from alumni.changes import mark_data_changed
+from alumni.db import database_connection
+from alumni.names import index_alumnus_name, name_index
+from alumni.profiling import phase
+from alumni.tasks import enqueue
+from alumni.validation import validate_email, validate_graduation_year
+
+IMPORT_BATCH_SIZE = 1000
+EXPORT_CHUNK_SIZE = 5000
+IMPORT_COLUMNS = ("email", "first_name", "last_name", "graduation_year", "current_job")
+
+# Tables that may be exported; email_config is left out on purpose (it holds credentials)
+EXPORTABLE_TABLES = (
+    "alumni", "skills", "alumni_skills", "events", "event_attendance", "event_invitations",
+    "event_rsvps", "job_postings", "job_postings_archive", "job_history", "alumni_achievements",
+)
+EXPORT_FORMATS = ("csv", "json", "jsonl")
+
+def read_import_batches(file, batch_size, stats):
+    """Yield lists of valid alumni rows from a CSV file, skipping invalid rows and repeated emails."""
+    reader = csv.DictReader(file)
+    seen_emails = set()
+    batch = []
+    for row in reader:
+        stats["read"] += 1
+        email = row.get('email') or ""
+        if not validate_email(email) or not validate_graduation_year(row.get('graduation_year') or ""):
+            stats["invalid"] += 1
+            logging.warning("Invalid data skipped at line %s: %s", reader.line_num, email)
+            continue
+        if email in seen_emails:
+            stats["duplicates"] += 1
+            logging.warning("Duplicate entry skipped: %s", email)
+            continue
+        seen_emails.add(email)
+        batch.append(tuple(row.get(column) for column in IMPORT_COLUMNS))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _timed_batches(batches):
+    """Yield from ``batches``, timing the reading and validation of each batch as the parse phase."""
+    while True:
+        with phase("parse"):
+            batch = next(batches, None)
+        if batch is None:
+            return
+        yield batch
+
+IMPORT_INSERT = (
+    "INSERT INTO alumni (email, first_name, last_name, graduation_year, current_job) VALUES (%s, %s, %s, %s, %s)"
+    " ON DUPLICATE KEY UPDATE id = id"
+)
+# MySQL error codes for a row the table rejects: too long, NULL, wrong type or out of range
+IMPORT_ROW_ERROR_CODES = (1048, 1264, 1292, 1366, 1406)
+
+def import_batch(batch):
+    """
+    Insert one batch on its own connection; returns (imported, duplicates, invalid).
+
+    Emails already in the table are left unchanged and counted as duplicates.
+    When the table rejects a row, the batch is inserted row by row and the
+    rejected rows are logged and counted as invalid.
+    """
+    invalid = 0
+    with database_connection() as connection:
+        cursor = connection.cursor()
+        try:
+            cursor.executemany(IMPORT_INSERT, batch)
+            imported = cursor.rowcount
+        except db.Error as db_err:
+            if db_err.errno not in IMPORT_ROW_ERROR_CODES:
+                raise
+            connection.rollback()
+            imported = 0
+            for row in batch:
+                try:
+                    cursor.execute(IMPORT_INSERT, row)
+                    imported += cursor.rowcount
+                except db.Error as row_err:
+                    if row_err.errno not in IMPORT_ROW_ERROR_CODES:
+                        raise
+                    invalid += 1
+                    logging.warning("Invalid data skipped for %s: %s", row[0], row_err)
+        connection.commit()
+
+        # The ids are only needed to keep a loaded name index in step
+        if name_index.loaded:
+            placeholders = ", ".join(["%s"] * len(batch))
+            cursor.execute(f"SELECT id, first_name, last_name FROM alumni WHERE email IN ({placeholders})", tuple(row[0] for row in batch))
+            for alumnus_id, first_name, last_name in cursor.fetchall():
+                index_alumnus_name(alumnus_id, first_name, last_name)
+        cursor.close()
+    return imported, len(batch) - imported - invalid, invalid
+
+def import_alumni_csv(csv_file_path, batch_size=IMPORT_BATCH_SIZE, parallel=1):
+    """
+    Import alumni from a CSV file in batches, optionally on several connections at once.
+
+    Returns a dict with the rows read, imported, skipped as invalid or duplicate,
+    batches that failed, and the elapsed seconds.
+    """
+    stats = {"read": 0, "imported": 0, "invalid": 0, "duplicates": 0, "failed_batches": 0}
+    start = time.perf_counter()
+
+    def run(batch):
+        try:
+            return import_batch(batch)
+        except db.Error as db_err:
+            logging.error("Database error importing a batch of %s rows: %s", len(batch), db_err)
+            return None
+
+    def record(result):
+        if result is None:
+            stats["failed_batches"] += 1
+        else:
+            stats["imported"] += result[0]
+            stats["duplicates"] += result[1]
+            stats["invalid"] += result[2]
+
+    with open(csv_file_path, mode='r', encoding='utf-8') as file:
+        batches = _timed_batches(read_import_batches(file, batch_size, stats))
+        if parallel > 1:
+            # Keep at most two batches per worker in flight so large files stream
+            with ThreadPoolExecutor(max_workers=parallel) as executor:
+                pending = set()
+                for batch in batches:
+                    pending.add(executor.submit(run, batch))
+                    if len(pending) >= parallel * 2:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            record(future.result())
+                for future in pending:
+                    record(future.result())
+        else:
+            for batch in batches:
+                record(run(batch))
+    if stats["imported"]:
+        mark_data_changed("alumni")
+    stats["seconds"] = round(time.perf_counter() - start, 3)
+    logging.info("Imported %s of %s rows from %s in %ss.", stats["imported"], stats["read"], csv_file_path, stats["seconds"])
+    return stats
+
+def batch_import(csv_file_path):
+    """Queue an import of ``csv_file_path`` as a background task; returns the task ID."""
+    if not os.path.isfile(csv_file_path):
+        logging.error("File not found: %s", csv_file_path)
+        print("File not found.")
+        return None
+    try:
+        task_id = enqueue("transfer.import", {"path": os.path.abspath(csv_file_path)})
+        print(f"Batch import queued as task {task_id}.")
+        return task_id
+    except Exception as e:
+        logging.error("Failed to queue batch import: %s", e)
+        print("An error occurred while queueing the batch import.")
+
+def export_table(table, file, fmt="csv", chunk_size=EXPORT_CHUNK_SIZE):
+    """Stream ``table`` to an open text file as csv, json or jsonl; returns the number of rows written."""
+    if table not in EXPORTABLE_TABLES:
+        raise ValueError(f"Table cannot be exported: {table}")
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    rows_written = 0
+    with database_connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute(f"SELECT * FROM {table}")
+        columns = [desc[0] for desc in cursor.description]
+
+        if fmt == "csv":
+            writer = csv.writer(file)
+            writer.writerow(columns)
+        elif fmt == "json":
+            file.write("[")
+
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            with phase("format"):
+                if fmt == "csv":
+                    writer.writerows(rows)
+                elif fmt == "jsonl":
+                    file.writelines(json.dumps(dict(zip(columns, row)), default=str) + "\n" for row in rows)
+                else:
+                    for offset, row in enumerate(rows):
+                        separator = "," if rows_written + offset else ""
+                        file.write(separator + "\n  " + json.dumps(dict(zip(columns, row)), default=str))
+            rows_written += len(rows)
+        cursor.close()
+
+    if fmt == "json":
+        file.write("\n]\n")
+    return rows_written
+
+def batch_export(csv_file_path):
+    """Queue an export of the alumni table to ``csv_file_path``; returns the task ID."""
+    try:
+        task_id = enqueue("transfer.export", {"path": os.path.abspath(csv_file_path)})
+        print(f"Batch export queued as task {task_id}.")
+        return task_id
+    except Exception as e:
+        logging.error("Failed to queue batch export: %s", e)
+        print("An error occurred during batch export.")
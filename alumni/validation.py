@@ -0,0 +1,34 @@
+"""Input validation helpers."""
+import re
+
+def validate_name(name):
+    """Validate a name."""
+    return name.isalpha()
+
+def validate_job_title(title):
+    """Validate a job title."""
+    # Example validation: checks if title is not empty and consists of letters, spaces, and possibly a few special characters
+    return bool(re.match(r"^[A-Za-z .,()-]+$", title))
+
+def validate_email(email):
+    """Validate the email format."""
+    pattern = r"^\w+([\.-]?\w+)*@\w+([\.-]?\w+)*(\.\w{2,3})+$"
+    return re.match(pattern, email)
+
+def validate_graduation_year(year):
+    """Validate the graduation year."""
+    return year.isdigit() and 1900 <= int(year) <= 2100
+
+def validate_event_name(name):
+    """Validate an event name."""
+    # Example: Check if the event name is not empty and consists of acceptable characters
+    return bool(re.match(r"^[A-Za-z0-9 .,()-]+$", name))
+
+def validate_event_description(description):
+    """Validate an event description."""
+    # Example: Basic check for non-empty string
+    return len(description.strip()) > 0
+
+def validate_skill_name(name):
+    """Validate a skill name."""
+    return bool(re.match(r"^[A-Za-z0-9 .,()-]+$", name))
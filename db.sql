@@ -8,7 +8,9 @@ CREATE TABLE alumni (
     last_name VARCHAR(50) NOT NULL,
     email VARCHAR(100) UNIQUE NOT NULL,
     graduation_year VARCHAR(10),
-    current_job VARCHAR(100)
+    current_job VARCHAR(100),
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_alumni_updated_at (updated_at)
 );
 
 CREATE TABLE IF NOT EXISTS email_config (
@@ -28,17 +30,37 @@ CREATE TABLE IF NOT EXISTS alumni_skills (
     id INT AUTO_INCREMENT PRIMARY KEY,
     alumnus_id INT,
     skill_id INT,
+    UNIQUE KEY uq_alumni_skill (alumnus_id, skill_id),
     FOREIGN KEY (alumnus_id) REFERENCES alumni(id),
     FOREIGN KEY (skill_id) REFERENCES skills(skill_id)
 );
 
+-- Other names of a skill, keyed by their canonical form (see alumni/skills.py)
+CREATE TABLE IF NOT EXISTS skill_aliases (
+    alias VARCHAR(100) PRIMARY KEY,
+    skill_id INT NOT NULL,
+    FOREIGN KEY (skill_id) REFERENCES skills(skill_id)
+);
+
+-- Top related skills per skill, rebuilt from alumni_skills co-occurrence
+CREATE TABLE IF NOT EXISTS skill_related (
+    skill_id INT NOT NULL,
+    related_skill_id INT NOT NULL,
+    cooccurrences INT NOT NULL,
+    score DOUBLE NOT NULL,
+    PRIMARY KEY (skill_id, related_skill_id),
+    FOREIGN KEY (skill_id) REFERENCES skills(skill_id),
+    FOREIGN KEY (related_skill_id) REFERENCES skills(skill_id)
+);
+
 CREATE TABLE IF NOT EXISTS events (
     event_id INT AUTO_INCREMENT PRIMARY KEY,
     event_name VARCHAR(255) NOT NULL,
     event_date DATE NOT NULL,
     description TEXT,
     organizer_email VARCHAR(100),
-    FOREIGN KEY (organizer_email) REFERENCES alumni(email)
+    FOREIGN KEY (organizer_email) REFERENCES alumni(email),
+    INDEX idx_events_date (event_date)
 );
 
 CREATE TABLE IF NOT EXISTS job_postings (
@@ -49,7 +71,26 @@ CREATE TABLE IF NOT EXISTS job_postings (
     company VARCHAR(255),
     location VARCHAR(255),
     posted_date DATE,
-    FOREIGN KEY (alumnus_id) REFERENCES alumni(id)
+    expires_at DATE,
+    status VARCHAR(20) NOT NULL DEFAULT 'active',
+    FOREIGN KEY (alumnus_id) REFERENCES alumni(id),
+    INDEX idx_job_postings_active (status, expires_at)
+);
+
+-- Expired and closed postings, moved out of job_postings by the archiver
+CREATE TABLE IF NOT EXISTS job_postings_archive (
+    job_id INT PRIMARY KEY,
+    alumnus_id INT,
+    title VARCHAR(255) NOT NULL,
+    description TEXT,
+    company VARCHAR(255),
+    location VARCHAR(255),
+    posted_date DATE,
+    expires_at DATE,
+    status VARCHAR(20) NOT NULL,
+    archived_at DATETIME NOT NULL,
+    INDEX idx_job_archive_alumnus (alumnus_id),
+    INDEX idx_job_archive_posted (posted_date)
 );
 
 CREATE TABLE IF NOT EXISTS alumni_achievements (
@@ -58,7 +99,8 @@ CREATE TABLE IF NOT EXISTS alumni_achievements (
     title VARCHAR(255) NOT NULL,
     description TEXT,
     date_posted DATE,
-    FOREIGN KEY (alumnus_id) REFERENCES alumni(id)
+    FOREIGN KEY (alumnus_id) REFERENCES alumni(id),
+    INDEX idx_achievements_date (date_posted)
 );
 
 CREATE TABLE IF NOT EXISTS alumni_messages (
@@ -100,6 +142,8 @@ CREATE TABLE IF NOT EXISTS event_invitations (
     invitation_id INT AUTO_INCREMENT PRIMARY KEY,
     event_id INT,
     attendee_email VARCHAR(100),
+    sent_at DATETIME NULL,
+    UNIQUE KEY uq_event_invitation (event_id, attendee_email),
     FOREIGN KEY (event_id) REFERENCES events(event_id),
     FOREIGN KEY (attendee_email) REFERENCES alumni(email)
 );
@@ -112,3 +156,72 @@ CREATE TABLE IF NOT EXISTS event_rsvps (
     FOREIGN KEY (event_id) REFERENCES events(event_id),
     FOREIGN KEY (attendee_email) REFERENCES alumni(email)
 );
+
+CREATE TABLE IF NOT EXISTS report_snapshots (
+    snapshot_id INT AUTO_INCREMENT PRIMARY KEY,
+    report_name VARCHAR(100) NOT NULL,
+    version INT NOT NULL,
+    generated_at DATETIME NOT NULL,
+    payload LONGTEXT NOT NULL,
+    UNIQUE KEY uq_report_version (report_name, version)
+);
+
+CREATE TABLE IF NOT EXISTS alumni_merges (
+    merge_id INT AUTO_INCREMENT PRIMARY KEY,
+    kept_id INT NOT NULL,
+    merged_id INT NOT NULL,
+    merged_email VARCHAR(100) NOT NULL,
+    score DECIMAL(4, 3),
+    merged_at DATETIME NOT NULL
+);
+
+-- Messages that could not be stored in alumni_messages; no foreign keys so they always fit
+CREATE TABLE IF NOT EXISTS message_dead_letters (
+    dead_letter_id INT AUTO_INCREMENT PRIMARY KEY,
+    sender_email VARCHAR(100),
+    receiver_email VARCHAR(100),
+    message TEXT,
+    error VARCHAR(255),
+    failed_at DATETIME NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+    scope VARCHAR(50) NOT NULL,
+    bucket_key VARCHAR(100) NOT NULL,
+    tokens DOUBLE NOT NULL,
+    updated_at DOUBLE NOT NULL,
+    PRIMARY KEY (scope, bucket_key)
+);
+
+-- Saved searches and skills emailed as job alert digests; subscribers may be students without an alumni record
+CREATE TABLE IF NOT EXISTS job_alert_subscriptions (
+    subscription_id INT AUTO_INCREMENT PRIMARY KEY,
+    email VARCHAR(100) NOT NULL,
+    kind VARCHAR(10) NOT NULL,
+    term VARCHAR(255) NOT NULL,
+    created_at DATETIME NOT NULL,
+    UNIQUE KEY uq_job_alert (email, kind, term)
+);
+
+-- Postings each subscriber has been emailed; rows older than the digest lookback are pruned
+CREATE TABLE IF NOT EXISTS job_alert_deliveries (
+    email VARCHAR(100) NOT NULL,
+    job_id INT NOT NULL,
+    delivered_at DATETIME NOT NULL,
+    PRIMARY KEY (email, job_id),
+    INDEX idx_job_alert_deliveries_job (job_id),
+    INDEX idx_job_alert_deliveries_at (delivered_at)
+);
+
+CREATE TABLE IF NOT EXISTS job_alert_runs (
+    run_id INT AUTO_INCREMENT PRIMARY KEY,
+    started_at DATETIME NOT NULL,
+    last_job_id INT NOT NULL,
+    postings INT NOT NULL,
+    subscriptions INT NOT NULL,
+    digests INT NOT NULL,
+    sent INT NOT NULL,
+    failed INT NOT NULL,
+    match_seconds DOUBLE NOT NULL,
+    send_seconds DOUBLE NOT NULL
+);
@@ -0,0 +1,11 @@
+-- Databases created before alumni_skills had its unique key may hold the same
+-- (alumnus_id, skill_id) link several times, and the skill upserts only become
+-- idempotent once the key exists. Keep the oldest row of every link, then add the key.
+
+DELETE newer FROM alumni_skills newer
+JOIN alumni_skills older
+  ON older.alumnus_id = newer.alumnus_id
+ AND older.skill_id = newer.skill_id
+ AND older.id < newer.id;
+
+ALTER TABLE alumni_skills ADD UNIQUE KEY uq_alumni_skill (alumnus_id, skill_id);
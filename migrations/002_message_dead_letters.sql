@@ -0,0 +1,21 @@
+-- Token buckets of the message and connection rate limits, saved so a
+-- restart does not hand out a fresh allowance.
+
+CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+    scope VARCHAR(50) NOT NULL,
+    bucket_key VARCHAR(100) NOT NULL,
+    tokens DOUBLE NOT NULL,
+    updated_at DOUBLE NOT NULL,
+    PRIMARY KEY (scope, bucket_key)
+);
+
+-- Queued messages that fail to insert are now kept here instead of being dropped.
+
+CREATE TABLE IF NOT EXISTS message_dead_letters (
+    dead_letter_id INT AUTO_INCREMENT PRIMARY KEY,
+    sender_email VARCHAR(100),
+    receiver_email VARCHAR(100),
+    message TEXT,
+    error VARCHAR(255),
+    failed_at DATETIME NOT NULL
+);
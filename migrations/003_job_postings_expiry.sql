@@ -0,0 +1,23 @@
+-- Job postings gained an expiry date and a status (active, closed, filled or
+-- expired), and stale postings move to job_postings_archive. Existing postings
+-- stay active; the archiver retires those without an expiry date by posted_date.
+
+ALTER TABLE job_postings
+    ADD COLUMN expires_at DATE,
+    ADD COLUMN status VARCHAR(20) NOT NULL DEFAULT 'active',
+    ADD INDEX idx_job_postings_active (status, expires_at);
+
+CREATE TABLE IF NOT EXISTS job_postings_archive (
+    job_id INT PRIMARY KEY,
+    alumnus_id INT,
+    title VARCHAR(255) NOT NULL,
+    description TEXT,
+    company VARCHAR(255),
+    location VARCHAR(255),
+    posted_date DATE,
+    expires_at DATE,
+    status VARCHAR(20) NOT NULL,
+    archived_at DATETIME NOT NULL,
+    INDEX idx_job_archive_alumnus (alumnus_id),
+    INDEX idx_job_archive_posted (posted_date)
+);
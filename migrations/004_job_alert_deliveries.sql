@@ -0,0 +1,44 @@
+-- Job alert digests now record which postings each subscriber was sent instead
+-- of advancing a job_id watermark. Mark the recent postings the last recorded
+-- run already covered as delivered, so the first run after upgrading does not
+-- send them again.
+
+-- Saved searches and skills emailed as job alert digests, and the metrics of
+-- each digest run. Databases created before job alerts existed lack both.
+CREATE TABLE IF NOT EXISTS job_alert_subscriptions (
+    subscription_id INT AUTO_INCREMENT PRIMARY KEY,
+    email VARCHAR(100) NOT NULL,
+    kind VARCHAR(10) NOT NULL,
+    term VARCHAR(255) NOT NULL,
+    created_at DATETIME NOT NULL,
+    UNIQUE KEY uq_job_alert (email, kind, term)
+);
+
+CREATE TABLE IF NOT EXISTS job_alert_runs (
+    run_id INT AUTO_INCREMENT PRIMARY KEY,
+    started_at DATETIME NOT NULL,
+    last_job_id INT NOT NULL,
+    postings INT NOT NULL,
+    subscriptions INT NOT NULL,
+    digests INT NOT NULL,
+    sent INT NOT NULL,
+    failed INT NOT NULL,
+    match_seconds DOUBLE NOT NULL,
+    send_seconds DOUBLE NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS job_alert_deliveries (
+    email VARCHAR(100) NOT NULL,
+    job_id INT NOT NULL,
+    delivered_at DATETIME NOT NULL,
+    PRIMARY KEY (email, job_id),
+    INDEX idx_job_alert_deliveries_job (job_id),
+    INDEX idx_job_alert_deliveries_at (delivered_at)
+);
+
+INSERT IGNORE INTO job_alert_deliveries (email, job_id, delivered_at)
+SELECT DISTINCT job_alert_subscriptions.email, job_postings.job_id, NOW()
+FROM job_alert_subscriptions
+JOIN job_postings
+  ON job_postings.job_id <= (SELECT COALESCE(MAX(last_job_id), 0) FROM job_alert_runs)
+ AND job_postings.posted_date >= CURDATE() - INTERVAL 7 DAY;
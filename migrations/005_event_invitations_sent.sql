@@ -0,0 +1,16 @@
+-- Invitations are recorded once per event and invitee and marked when their
+-- email is sent, so a retried invitation task only emails the invitees it
+-- missed. Invitations recorded before this change were sent by the run that
+-- recorded them.
+
+DELETE later FROM event_invitations later
+JOIN event_invitations earlier
+  ON earlier.event_id = later.event_id
+ AND earlier.attendee_email = later.attendee_email
+ AND earlier.invitation_id < later.invitation_id;
+
+ALTER TABLE event_invitations
+    ADD COLUMN sent_at DATETIME NULL,
+    ADD UNIQUE KEY uq_event_invitation (event_id, attendee_email);
+
+UPDATE event_invitations SET sent_at = NOW();
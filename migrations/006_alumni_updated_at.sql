@@ -0,0 +1,6 @@
+-- The alumni directory and the name index refresh incrementally by fetching
+-- the rows changed since their last refresh, which needs a change timestamp.
+
+ALTER TABLE alumni
+    ADD COLUMN updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    ADD INDEX idx_alumni_updated_at (updated_at);
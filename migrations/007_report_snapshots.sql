@@ -0,0 +1,10 @@
+-- Reports are served from versioned snapshots stored here and refreshed in the background.
+
+CREATE TABLE IF NOT EXISTS report_snapshots (
+    snapshot_id INT AUTO_INCREMENT PRIMARY KEY,
+    report_name VARCHAR(100) NOT NULL,
+    version INT NOT NULL,
+    generated_at DATETIME NOT NULL,
+    payload LONGTEXT NOT NULL,
+    UNIQUE KEY uq_report_version (report_name, version)
+);
@@ -0,0 +1,10 @@
+-- Duplicate alumni merged by the deduplication job are recorded here.
+
+CREATE TABLE IF NOT EXISTS alumni_merges (
+    merge_id INT AUTO_INCREMENT PRIMARY KEY,
+    kept_id INT NOT NULL,
+    merged_id INT NOT NULL,
+    merged_email VARCHAR(100) NOT NULL,
+    score DECIMAL(4, 3),
+    merged_at DATETIME NOT NULL
+);
@@ -0,0 +1,20 @@
+-- Aliases added with ``python -m alumni skill-alias`` on top of the built-in
+-- ones, and the related skill suggestions rebuilt by ``related-skills``. Run
+-- ``python -m alumni normalize-skills`` afterwards to merge skills stored under
+-- different spellings, then ``related-skills`` to fill skill_related.
+
+CREATE TABLE IF NOT EXISTS skill_aliases (
+    alias VARCHAR(100) PRIMARY KEY,
+    skill_id INT NOT NULL,
+    FOREIGN KEY (skill_id) REFERENCES skills(skill_id)
+);
+
+CREATE TABLE IF NOT EXISTS skill_related (
+    skill_id INT NOT NULL,
+    related_skill_id INT NOT NULL,
+    cooccurrences INT NOT NULL,
+    score DOUBLE NOT NULL,
+    PRIMARY KEY (skill_id, related_skill_id),
+    FOREIGN KEY (skill_id) REFERENCES skills(skill_id),
+    FOREIGN KEY (related_skill_id) REFERENCES skills(skill_id)
+);
@@ -0,0 +1,6 @@
+-- The upcoming events and recent achievements landing views read the first
+-- rows in date order; without these indexes each rebuild scans and sorts the table.
+
+ALTER TABLE events ADD INDEX idx_events_date (event_date);
+
+ALTER TABLE alumni_achievements ADD INDEX idx_achievements_date (date_posted);
@@ -0,0 +1,133 @@
+"""Shared fixtures: every test runs with default settings and fresh process-wide caches."""
+import os
+
+import pytest
+
+from alumni import cache, db
+
+@pytest.fixture(autouse=True)
+def default_settings(monkeypatch, tmp_path):
+    for name in list(os.environ):
+        if name.startswith("ALUMNI_"):
+            monkeypatch.delenv(name)
+    monkeypatch.setenv("ALUMNI_CONFIG", str(tmp_path / "missing.ini"))
+    monkeypatch.setattr(db, "db_settings", None)
+    monkeypatch.setattr(db, "_replica_router", None)
+    monkeypatch.setattr(cache, "_query_cache", None)
+
+class FakeDatabase:
+    """
+    In-memory stand-in for the MySQL server behind ``db.connect_to_db``.
+
+    Tests register a handler per statement with ``on(prefix, handler)``. A
+    statement goes to the handler with the longest prefix of its
+    whitespace-collapsed text; unknown statements fail the test.
+    ``handler(cursor, params)`` returns the result rows (a list), the number
+    of affected rows (an int) or None. A handler registered with
+    ``many=True`` receives the whole row list of ``executemany``, so one bad
+    row can fail the statement; other handlers run once per row.
+
+    ``on_commit``, ``on_rollback`` and ``on_close`` are called with the
+    connection, whose ``state`` dict holds per-connection data such as locks.
+    """
+
+    def __init__(self):
+        self.handlers = {}
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.on_commit = None
+        self.on_rollback = None
+        self.on_close = None
+
+    def on(self, prefix, handler=None, many=False):
+        """Register ``handler`` for statements starting with ``prefix``; usable as a decorator."""
+        if handler is None:
+            return lambda function: self.on(prefix, function, many)
+        self.handlers[" ".join(prefix.split())] = (handler, many)
+        return handler
+
+    def connect(self):
+        return FakeConnection(self)
+
+    def run(self, cursor, query, params, many=False):
+        query = " ".join(query.split())
+        self.statements.append(query)
+        matches = [prefix for prefix in self.handlers if query.startswith(prefix)]
+        if not matches:
+            raise AssertionError(f"Unexpected statement: {query}")
+        handler, takes_rows = self.handlers[max(matches, key=len)]
+        if not many or takes_rows:
+            return handler(cursor, params)
+        results = [handler(cursor, row) for row in params]
+        return sum(result for result in results if isinstance(result, int))
+
+class FakeConnection:
+    def __init__(self, database):
+        self.database = database
+        self.state = {}
+        self.closed = False
+
+    def cursor(self, *args, **kwargs):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.database.commits += 1
+        if self.database.on_commit:
+            self.database.on_commit(self)
+
+    def rollback(self):
+        self.database.rollbacks += 1
+        if self.database.on_rollback:
+            self.database.on_rollback(self)
+
+    def close(self):
+        self.closed = True
+        if self.database.on_close:
+            self.database.on_close(self)
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.rowcount = -1
+        self.lastrowid = None
+        self._result = []
+
+    def execute(self, query, params=()):
+        self._store(self.connection.database.run(self, query, tuple(params or ())))
+
+    def executemany(self, query, rows):
+        self._store(self.connection.database.run(self, query, [tuple(row) for row in rows], many=True))
+
+    def _store(self, result):
+        if isinstance(result, int):
+            self.rowcount, self._result = result, []
+        elif result is None:
+            self.rowcount, self._result = 0, []
+        else:
+            self._result = list(result)
+            self.rowcount = len(self._result)
+
+    def fetchone(self):
+        return self._result.pop(0) if self._result else None
+
+    def fetchall(self):
+        rows, self._result = self._result, []
+        return rows
+
+    def fetchmany(self, size=1):
+        rows, self._result = self._result[:size], self._result[size:]
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def close(self):
+        pass
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    """A FakeDatabase that every ``db.connect_to_db()`` call connects to."""
+    database = FakeDatabase()
+    monkeypatch.setattr(db, "connect_to_db", database.connect)
+    return database
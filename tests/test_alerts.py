@@ -0,0 +1,144 @@
+"""Tests for job alert matching and delivery tracking."""
+import mysql.connector
+import pytest
+
+from alumni import alerts, mail, menus, skills
+
+ALIASES = dict(skills.SEED_SKILL_ALIASES)
+
+def posting(job_id, title, description=""):
+    return (job_id, title, description, "Acme", "Remote")
+
+def test_skill_alerts_match_every_spelling_of_the_skill():
+    postings = [posting(1, "Senior JS Developer"), posting(2, "JavaScript Engineer"), posting(3, "Java Engineer")]
+    subscriptions = [("ada@example.org", "skill", "javascript", "Ada"), ("alan@example.org", "skill", "JS", "Alan")]
+    digests, _ = alerts.build_digests(postings, subscriptions, aliases=ALIASES)
+    assert digests["ada@example.org"]["job_ids"] == [1, 2]
+    assert digests["alan@example.org"]["job_ids"] == [1, 2]
+
+def test_delivered_postings_are_left_out():
+    postings = [posting(1, "Python Developer"), posting(2, "Python Engineer")]
+    subscriptions = [("ada@example.org", "search", "python", "Ada"), ("alan@example.org", "search", "python", "Alan"),
+                     ("grace@example.org", "search", "python", "Grace")]
+    delivered = {("ada@example.org", 1), ("grace@example.org", 1), ("grace@example.org", 2)}
+    digests, _ = alerts.build_digests(postings, subscriptions, delivered, aliases=ALIASES)
+    assert digests == {"ada@example.org": {"first_name": "Ada", "job_ids": [2]},
+                       "alan@example.org": {"first_name": "Alan", "job_ids": [1, 2]}}
+
+class AlertTables:
+    """job_postings, job_alert_subscriptions, job_alert_deliveries and job_alert_runs on a FakeDatabase."""
+
+    def __init__(self, database):
+        self.postings = []
+        self.subscriptions = []
+        self.deliveries = set()
+        self.runs = []
+        database.on("SELECT GET_LOCK", lambda cursor, params: [(1,)])
+        database.on("SELECT RELEASE_LOCK", lambda cursor, params: [(1,)])
+        database.on("SELECT job_id, title, description, company, location FROM job_postings",
+                    lambda cursor, params: sorted(self.postings))
+        database.on("SELECT email, job_id FROM job_alert_deliveries WHERE job_id >= %s",
+                    lambda cursor, params: [row for row in self.deliveries if row[1] >= params[0]])
+        database.on("SELECT job_alert_subscriptions.email", lambda cursor, params: list(self.subscriptions))
+        database.on("DELETE FROM job_alert_deliveries", lambda cursor, params: 0)
+        database.on("INSERT INTO job_alert_runs", lambda cursor, params: self.runs.append(params))
+        database.on("INSERT IGNORE INTO job_alert_deliveries", lambda cursor, rows: self.deliveries.update(rows), many=True)
+
+@pytest.fixture
+def tables(fake_db, monkeypatch):
+    tables = AlertTables(fake_db)
+    monkeypatch.setattr(alerts, "skill_aliases", lambda: ALIASES)
+    monkeypatch.setattr(mail, "get_email_config", lambda: ("smtp.example.org", 587, "alerts@example.org", "secret"))
+    return tables
+
+def fake_send_bulk(outbox, failing=()):
+    def send_bulk(messages, email_config, parallel=1, on_sent=None):
+        sent = failed = 0
+        for recipient, message in messages:
+            if recipient in failing:
+                failed += 1
+                continue
+            outbox.append((recipient, message))
+            on_sent(recipient)
+            sent += 1
+        return sent, failed
+    return send_bulk
+
+def test_failed_and_late_postings_are_sent_on_the_next_run(tables, monkeypatch):
+    tables.subscriptions = [("ada@example.org", "search", "python", "Ada"), ("alan@example.org", "skill", "python", "Alan")]
+    tables.postings = [posting(10, "Python Developer"), posting(12, "Python Engineer")]
+    outbox = []
+    monkeypatch.setattr(mail, "send_bulk", fake_send_bulk(outbox, failing={"alan@example.org"}))
+
+    metrics = alerts.run_job_alert_digest()
+    assert (metrics["sent"], metrics["failed"], metrics["deliveries"]) == (1, 1, 2)
+    assert [recipient for recipient, _ in outbox] == ["ada@example.org"]
+
+    # Posting 11 commits after 12 was alerted; Alan's server error has cleared
+    tables.postings.append(posting(11, "Python Analyst"))
+    outbox.clear()
+    monkeypatch.setattr(mail, "send_bulk", fake_send_bulk(outbox))
+    metrics = alerts.run_job_alert_digest()
+
+    assert sorted(recipient for recipient, _ in outbox) == ["ada@example.org", "alan@example.org"]
+    sent = dict(outbox)
+    assert b"job ID 11" in sent["ada@example.org"] and b"job ID 12" not in sent["ada@example.org"]
+    assert all(f"job ID {job_id}".encode() in sent["alan@example.org"] for job_id in (10, 11, 12))
+
+    outbox.clear()
+    assert alerts.run_job_alert_digest()["digests"] == 0
+    assert outbox == []
+
+def test_deliveries_are_recorded_in_short_transactions_while_sending(tables, fake_db, monkeypatch):
+    monkeypatch.setattr(alerts, "DELIVERY_RECORD_BATCH", 2)
+    tables.subscriptions = [(f"{name}@example.org", "search", "python", name) for name in ("ada", "alan", "grace")]
+    tables.postings = [posting(10, "Python Developer")]
+    progress = []
+
+    def send_bulk(messages, email_config, parallel=1, on_sent=None):
+        # The reads were committed, so no transaction is open while sending
+        progress.append(fake_db.commits)
+        for recipient, _ in messages:
+            on_sent(recipient)
+            progress.append(len(tables.deliveries))
+        return 3, 0
+
+    monkeypatch.setattr(mail, "send_bulk", send_bulk)
+    assert alerts.run_job_alert_digest()["deliveries"] == 3
+    assert progress == [1, 0, 2, 2]
+    assert len(tables.deliveries) == 3
+
+    # A batch that cannot be recorded is retried with the next one
+    failures = [mysql.connector.Error(msg="Lost connection to MySQL server during query", errno=2013)]
+
+    @fake_db.on("INSERT IGNORE INTO job_alert_deliveries", many=True)
+    def record(cursor, rows):
+        if failures:
+            raise failures.pop()
+        tables.deliveries.update(rows)
+
+    tables.deliveries.clear()
+    progress.clear()
+    assert alerts.run_job_alert_digest()["deliveries"] == 3
+    assert progress[1:] == [0, 0, 3]
+    assert len(tables.deliveries) == 3
+
+def test_skill_alerts_are_saved_under_the_canonical_name(fake_db, monkeypatch):
+    saved = []
+    fake_db.on("INSERT IGNORE INTO job_alert_subscriptions", lambda cursor, params: saved.append(params) or 1)
+    monkeypatch.setattr(skills, "skill_aliases", lambda: ALIASES)
+    assert alerts.subscribe_job_alert("ada@example.org", "Python 3.11", "skill")
+    assert alerts.subscribe_job_alert("ada@example.org", "JS", "skill")
+    assert [params[2] for params in saved] == ["python", "javascript"]
+
+def test_student_alerts_need_the_emailed_code(monkeypatch):
+    monkeypatch.setattr(menus, "_verified_alert_emails", set())
+    monkeypatch.setattr(alerts, "send_alert_verification_code", lambda email: "123456")
+    answers = iter(["000000", "111111", "999999"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    assert menus.verify_alert_email("ada@example.org") is None
+
+    answers = iter(["000000", "123456"])
+    assert menus.verify_alert_email("ada@example.org") == "ada@example.org"
+    # Verified once per session
+    assert menus.verify_alert_email("ada@example.org") == "ada@example.org"
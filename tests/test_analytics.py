@@ -0,0 +1,63 @@
+"""Tests for the job history analytics; skipped when pandas is not installed."""
+import sys
+from datetime import date
+
+import pytest
+
+from alumni import analytics
+
+JOB_HISTORY = [
+    # alumnus_id, graduation_year, company_name, position, start_date, end_date
+    (1, "2015", "Acme ", "Analyst", date(2015, 9, 1), date(2017, 9, 1)),
+    (1, "2015", "Globex", "Engineer", date(2017, 10, 1), None),
+    (2, "2015", "Acme", "Analyst", date(2016, 3, 1), date(2016, 6, 1)),
+    (2, "2015", "Globex", "Analyst", date(2016, 7, 1), date(2020, 7, 1)),
+    (3, "2016", "Initech", "Engineer", date(2016, 1, 1), date(2016, 12, 1)),
+    (4, "unknown", "Acme", "Intern", date(2014, 6, 1), date(2014, 8, 1)),
+]
+
+@pytest.fixture
+def frame(fake_db):
+    pytest.importorskip("pandas")
+    fake_db.on("SELECT h.alumnus_id, a.graduation_year", lambda cursor, params: list(JOB_HISTORY))
+    return analytics.load_job_history_frame(chunk_size=4)
+
+def test_job_history_loads_in_chunks_into_typed_columns(frame):
+    assert len(frame) == len(JOB_HISTORY)
+    assert str(frame["company_name"].dtype) == "category"
+    assert sorted(frame["company_name"].cat.categories) == ["Acme", "Globex", "Initech"]
+    assert str(frame["graduation_year"].dtype) == "Int32"
+    assert frame["graduation_year"].isna().sum() == 1
+    assert frame["end_date"].isna().sum() == 1
+
+def test_tenure_is_bucketed_with_open_jobs_running_until_as_of(frame):
+    distribution = analytics.tenure_distribution(frame, as_of=date(2018, 11, 1))
+    assert distribution["jobs"].to_dict() == {
+        "0-6 months": 2, "6-12 months": 1, "12-24 months": 1, "24-36 months": 1,
+        "36-60 months": 1, "60-120 months": 0, "120+ months": 0,
+    }
+    assert distribution["share"].sum() == pytest.approx(1.0)
+
+def test_top_employers_count_distinct_alumni_per_cohort(frame):
+    top = analytics.top_employers_by_cohort(frame, top=1)
+    assert [(int(row.graduation_year), row.company_name, row.alumni) for row in top.itertuples()] == [
+        (2015, "Acme", 2), (2016, "Initech", 1)]
+
+def test_career_transitions_follow_each_alumnus_in_order(frame):
+    transitions = analytics.career_transitions(frame)
+    assert list(transitions.itertuples(index=False, name=None)) == [("Acme", "Globex", 2)]
+    roles = analytics.career_transitions(frame, column="position")
+    assert list(roles.itertuples(index=False, name=None)) == [("Analyst", "Engineer", 1)]
+
+def test_time_to_first_job_is_summarised_per_cohort(frame):
+    summary = analytics.time_to_first_job(frame)
+    assert summary.loc[2015, "alumni"] == 2
+    # Alumnus 1 started two months after a July graduation, alumnus 2 eight months after
+    assert summary.loc[2015, "median_months"] == 5
+    assert summary.loc[2015, "within_6_months"] == 0.5
+    assert summary.loc[2016, "median_months"] == -6
+
+def test_missing_pandas_is_reported(monkeypatch, capsys):
+    monkeypatch.setitem(sys.modules, "pandas", None)
+    analytics.generate_job_history_analytics()
+    assert "require pandas and numpy" in capsys.readouterr().out
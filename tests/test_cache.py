@@ -0,0 +1,123 @@
+"""Tests for the query cache on both the in-memory and the shared SQLite store."""
+import types
+
+import pytest
+
+from alumni import cache
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache, "time", types.SimpleNamespace(time=clock.time))
+    return clock
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request, tmp_path):
+    def make_store(max_entries=100):
+        if request.param == "memory":
+            return cache.MemoryCacheStore(max_entries)
+        store = cache.SqliteCacheStore(str(tmp_path / "cache.sqlite3"), max_entries)
+        store.EVICT_EVERY = 1
+        return store
+    return make_store
+
+def counting(value):
+    calls = []
+    def compute():
+        calls.append(1)
+        return value
+    compute.calls = calls
+    return compute
+
+def test_results_are_served_until_they_expire(make_store, clock):
+    query_cache = cache.QueryCache(make_store(), ttl_seconds=60)
+    compute = counting([("Ada", "Lovelace")])
+    for _ in range(3):
+        assert query_cache.get_or_compute(("skill", "python"), compute, ["skill:python"]) == [("Ada", "Lovelace")]
+    assert len(compute.calls) == 1
+    assert query_cache.stats() == {"hits": 2, "misses": 1, "hit_rate": 2 / 3}
+
+    clock.now += 60
+    query_cache.get_or_compute(("skill", "python"), compute, ["skill:python"])
+    assert len(compute.calls) == 2
+
+def test_invalidation_drops_only_entries_with_a_matching_tag(make_store, clock):
+    query_cache = cache.QueryCache(make_store(), ttl_seconds=60)
+    python, sql = counting(["python"]), counting(["sql"])
+    query_cache.get_or_compute("python", python, ["skill:python"])
+    query_cache.get_or_compute("sql", sql, ["skill:sql", "skill:databases"])
+
+    assert query_cache.invalidate_tags("skill:databases") == 1
+    assert query_cache.invalidate_tags("skill:cobol") == 0
+    query_cache.get_or_compute("python", python, ["skill:python"])
+    query_cache.get_or_compute("sql", sql, ["skill:sql", "skill:databases"])
+    assert (len(python.calls), len(sql.calls)) == (1, 2)
+
+def test_results_computed_across_an_invalidation_are_not_stored(make_store, clock):
+    query_cache = cache.QueryCache(make_store(), ttl_seconds=60)
+    generation = query_cache.store.generation()
+
+    def compute_while_a_writer_invalidates():
+        query_cache.invalidate_tags("jobs:analyst")
+        return ["stale"]
+
+    assert query_cache.get_or_compute("jobs", compute_while_a_writer_invalidates, ["jobs:analyst"]) == ["stale"]
+    assert query_cache.store.generation() == generation + 1
+    fresh = counting(["fresh"])
+    assert query_cache.get_or_compute("jobs", fresh, ["jobs:analyst"]) == ["fresh"]
+    assert query_cache.get_or_compute("jobs", fresh, ["jobs:analyst"]) == ["fresh"]
+    assert len(fresh.calls) == 1
+
+def test_results_are_not_stored_while_replicas_may_lag_an_invalidation(make_store, clock):
+    query_cache = cache.QueryCache(make_store(), ttl_seconds=60, settle_seconds=5)
+    query_cache.invalidate_tags("skill:python")
+    compute = counting(["maybe stale"])
+    query_cache.get_or_compute("python", compute, ["skill:python"])
+    query_cache.get_or_compute("python", compute, ["skill:python"])
+    assert len(compute.calls) == 2
+
+    clock.now += 5
+    query_cache.get_or_compute("python", compute, ["skill:python"])
+    query_cache.get_or_compute("python", compute, ["skill:python"])
+    assert len(compute.calls) == 3
+
+def test_least_recently_used_entries_are_evicted_first(make_store, clock):
+    query_cache = cache.QueryCache(make_store(max_entries=2), ttl_seconds=60)
+    computes = {key: counting(key) for key in ("a", "b", "c")}
+    for key in ("a", "b"):
+        query_cache.get_or_compute(key, computes[key], [])
+        clock.now += 1
+    query_cache.get_or_compute("a", computes["a"], [])
+    clock.now += 1
+    query_cache.get_or_compute("c", computes["c"], [])
+    for key in ("a", "c", "b"):
+        query_cache.get_or_compute(key, computes[key], [])
+    assert {key: len(compute.calls) for key, compute in computes.items()} == {"a": 1, "b": 2, "c": 1}
+
+def test_the_sqlite_store_is_shared_between_processes(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite3")
+    first = cache.QueryCache(cache.SqliteCacheStore(path, 100), ttl_seconds=60)
+    second = cache.QueryCache(cache.SqliteCacheStore(path, 100), ttl_seconds=60)
+    compute = counting({"alumni": 2})
+    first.get_or_compute(("report", 1), compute, ["report"])
+    assert second.get_or_compute(("report", 1), compute, ["report"]) == {"alumni": 2}
+    assert len(compute.calls) == 1
+
+    second.invalidate_tags("report")
+    assert first.store.generation() == second.store.generation() == 1
+    first.get_or_compute(("report", 1), compute, ["report"])
+    assert len(compute.calls) == 2
+
+def test_new_postings_invalidate_the_job_searches_they_match(clock):
+    query_cache = cache.get_query_cache()
+    for term in ("data analyst", "nurse"):
+        query_cache.get_or_compute(("jobs", term), counting([term]), ["jobs:" + term])
+    assert cache.invalidate_job_searches("Senior  Data Analyst", "SQL and reporting") == 1
+    assert cache.invalidate_all_job_searches() == 1
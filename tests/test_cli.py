@@ -0,0 +1,55 @@
+"""Tests for the command line exit codes and the JSON it prints."""
+import json
+
+import pytest
+
+from alumni import cli, jobs, transfer
+
+@pytest.fixture(autouse=True)
+def no_log_file(monkeypatch):
+    monkeypatch.setattr(cli, "configure_logging", lambda: None)
+
+def run(capsys, *argv):
+    code = cli.main(list(argv))
+    out, err = capsys.readouterr()
+    return code, out, json.loads(err) if err else None
+
+def test_unknown_report_is_a_usage_error(capsys):
+    code, out, error = run(capsys, "report", "salaries")
+    assert (code, out) == (cli.EXIT_USAGE, "")
+    assert error["error"].startswith("Unknown report: salaries (choose from stats, events,")
+
+def test_tables_that_cannot_be_exported_are_refused(capsys):
+    code, _, error = run(capsys, "export", "email_config")
+    assert code == cli.EXIT_USAGE
+    assert error["error"].startswith("Table cannot be exported: email_config")
+
+def test_rejected_arguments_exit_with_the_usage_code(capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main(["import", "alumni.csv", "--batch-size", "0"])
+    assert exit_info.value.code == cli.EXIT_USAGE
+    assert "must be at least 1: 0" in capsys.readouterr().err
+
+def test_import_with_skipped_rows_is_partial(capsys, monkeypatch):
+    stats = {"read": 3, "imported": 1, "invalid": 2, "duplicates": 0, "failed_batches": 0}
+    monkeypatch.setattr(transfer, "import_alumni_csv", lambda path, batch_size, parallel: stats)
+    code, out, error = run(capsys, "import", "alumni.csv")
+    assert (code, json.loads(out), error) == (cli.EXIT_PARTIAL, stats, None)
+
+    stats.update(imported=3, invalid=0)
+    assert run(capsys, "import", "alumni.csv")[0] == cli.EXIT_OK
+
+def test_failures_are_logged_and_printed_as_json(capsys, monkeypatch, caplog):
+    def close_job_posting(job_id, reason):
+        raise RuntimeError("Lost connection to MySQL server")
+
+    monkeypatch.setattr(jobs, "close_job_posting", close_job_posting)
+    code, out, error = run(capsys, "close-job", "5")
+    assert (code, out) == (cli.EXIT_ERROR, "")
+    assert error == {"error": "Lost connection to MySQL server"}
+    assert "Command close-job failed: Lost connection to MySQL server" in caplog.text
+
+def test_closing_a_missing_posting_fails(capsys, monkeypatch):
+    monkeypatch.setattr(jobs, "close_job_posting", lambda job_id, reason: False)
+    code, out, _ = run(capsys, "close-job", "5", "--filled")
+    assert (code, json.loads(out)) == (cli.EXIT_ERROR, {"job_id": 5, "closed": False})
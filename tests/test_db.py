@@ -0,0 +1,32 @@
+"""Tests for read-your-writes routing between the primary and replicas."""
+import pytest
+
+from alumni import db
+
+@pytest.fixture
+def clock(fake_db, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(db.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(db, "_last_primary_use", {})
+    monkeypatch.setattr(db, "_last_primary_use_pruned", 0.0)
+    yield clock
+    db.set_current_user(None)
+
+def write_as(user):
+    db.set_current_user(user)
+    with db.database_connection():
+        pass
+
+def test_writers_read_from_the_primary_for_the_sticky_window(clock):
+    write_as("ada@example.org")
+    assert db.reads_from_primary("ada@example.org")
+    assert not db.reads_from_primary("alan@example.org")
+    clock[0] += db.get_db_settings()["sticky_seconds"]
+    assert not db.reads_from_primary("ada@example.org")
+
+def test_ended_sticky_windows_are_forgotten(clock):
+    for i in range(100):
+        write_as(f"user{i}@example.org")
+    clock[0] += db.get_db_settings()["sticky_seconds"]
+    write_as("ada@example.org")
+    assert list(db._last_primary_use) == ["ada@example.org"]
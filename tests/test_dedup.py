@@ -0,0 +1,104 @@
+"""Tests for duplicate alumni detection and merging."""
+import pytest
+
+from alumni import dedup
+
+@pytest.fixture
+def alumni_rows(fake_db):
+    rows = []
+    fake_db.on("SELECT id, first_name, last_name, email, graduation_year, current_job FROM alumni",
+               lambda cursor, params: list(rows))
+    return rows
+
+@pytest.fixture
+def alumni_skills(fake_db):
+    """Skill IDs per alumnus, served to the alumni_skills lookup."""
+    skill_ids = {}
+    fake_db.on("SELECT alumnus_id, skill_id FROM alumni_skills WHERE alumnus_id IN",
+               lambda cursor, params: [(alumnus_id, skill_id) for alumnus_id in params
+                                       for skill_id in sorted(skill_ids.get(alumnus_id, ()))])
+    return skill_ids
+
+# Two sign-ups with unrelated addresses: only the name block can pair them
+JOSE_GARCIA = [
+    (1, "José", "García", "jgarcia@school.edu", "2015", None),
+    (2, "Jose", "Garcia", "pepe.g@example.org", "2015", None),
+    (3, "Jose", "Garcia", "jose.garcia@example.org", "2019", None),
+]
+
+def test_same_name_and_graduation_year_alone_is_not_a_duplicate(alumni_rows, alumni_skills):
+    alumni_rows.extend(JOSE_GARCIA)
+    alumni_skills.update({1: {10}, 2: {10, 11}})
+    assert dedup.find_duplicate_alumni() == []
+
+def test_same_name_and_year_with_shared_skills_is_a_duplicate(alumni_rows, alumni_skills):
+    alumni_rows.extend(JOSE_GARCIA)
+    alumni_skills.update({1: {10, 11, 12}, 2: {10, 11}, 3: {10, 11, 12}})
+    assert dedup.find_duplicate_alumni() == [(1, 2, pytest.approx(0.8))]
+
+def test_same_name_year_and_job_is_a_duplicate(alumni_rows, alumni_skills):
+    alumni_rows.extend([(1, "José", "García", "jgarcia@school.edu", "2015", "Engineer"),
+                        (2, "Jose", "Garcia", "pepe.g@example.org", "2015", "engineer")])
+    assert dedup.find_duplicate_alumni() == [(1, 2, pytest.approx(0.9))]
+
+def test_same_email_local_part_and_similar_name_is_a_duplicate(alumni_rows):
+    alumni_rows.extend([
+        (4, "Katherine", "Johnson", "k.johnson@school.edu", "2001", None),
+        (9, "Kathrine", "Johnson", "kjohnson+alumni@example.org", None, None),
+    ])
+    assert [(keep, duplicate) for keep, duplicate, _ in dedup.find_duplicate_alumni()] == [(4, 9)]
+
+def test_shared_email_local_part_alone_is_not_a_duplicate(alumni_rows):
+    alumni_rows.extend([
+        (1, "Ada", "Lovelace", "info@school.edu", "2015", None),
+        (2, "Alan", "Turing", "info@example.org", "2015", None),
+    ])
+    assert dedup.find_duplicate_alumni() == []
+
+def test_merges_notify_every_table_they_write(monkeypatch):
+    merged, changed = [], []
+    monkeypatch.setattr(dedup, "merge_duplicate_alumnus", lambda keep, duplicate, score: merged.append(duplicate) or True)
+    monkeypatch.setattr(dedup, "mark_data_changed", lambda *tables: changed.extend(tables))
+
+    assert dedup.merge_duplicates([(1, 2, 0.9), (1, 3, 0.85)]) == 2
+    assert merged == [2, 3]
+    for table in ("alumni", "alumni_skills", "job_history", "alumni_messages", "job_alert_subscriptions"):
+        assert table in changed
+
+def test_deduplication_only_merges_when_asked(alumni_rows, monkeypatch):
+    merged = []
+    monkeypatch.setattr(dedup, "merge_duplicate_alumnus", lambda keep, duplicate, score: merged.append(duplicate) or True)
+    alumni_rows.extend([(4, "Katherine", "Johnson", "k.johnson@school.edu", "2001", None),
+                        (9, "Kathrine", "Johnson", "kjohnson+alumni@example.org", None, None)])
+    assert len(dedup.run_deduplication()) == 1
+    assert merged == []
+    dedup.run_deduplication(dry_run=False)
+    assert merged == [9]
+
+def test_merging_keeps_one_attendance_per_event(fake_db):
+    # (event_id, alumnus_id) rows; both records attended event 3
+    attendance = [(3, 1), (4, 1), (3, 2), (5, 2)]
+    fake_db.on("SELECT id, email, current_job FROM alumni WHERE id IN",
+               lambda cursor, params: [(1, "jgarcia@school.edu", None), (2, "pepe.g@example.org", "Engineer")])
+    fake_db.on("SELECT skills.skill_name FROM alumni_skills", lambda cursor, params: [])
+    fake_db.on("SELECT EXISTS", lambda cursor, params: [(0,)])
+    fake_db.on("UPDATE", lambda cursor, params: 0)
+    fake_db.on("DELETE", lambda cursor, params: 0)
+    fake_db.on("INSERT INTO alumni_merges", lambda cursor, params: 1)
+
+    @fake_db.on("DELETE duplicate FROM event_attendance duplicate JOIN event_attendance kept ON kept.event_id = duplicate.event_id")
+    def drop_overlap(cursor, params):
+        keep_id, duplicate_id = params
+        kept_events = {event_id for event_id, alumnus_id in attendance if alumnus_id == keep_id}
+        overlap = [row for row in attendance if row[1] == duplicate_id and row[0] in kept_events]
+        for row in overlap:
+            attendance.remove(row)
+        return len(overlap)
+
+    @fake_db.on("UPDATE event_attendance SET alumnus_id = %s WHERE alumnus_id = %s")
+    def repoint(cursor, params):
+        keep_id, duplicate_id = params
+        attendance[:] = [(event_id, keep_id if alumnus_id == duplicate_id else alumnus_id) for event_id, alumnus_id in attendance]
+
+    assert dedup.merge_duplicate_alumnus(1, 2, 0.9)
+    assert sorted(attendance) == [(3, 1), (4, 1), (5, 1)]
@@ -0,0 +1,76 @@
+"""Tests for the incremental refresh of the alumni directory."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from alumni import directory
+
+class AlumniTable:
+    """The alumni table on a FakeDatabase, whose updated_at comes from a database clock behind the app host's."""
+
+    def __init__(self, database):
+        self.now = datetime.now() - timedelta(minutes=5)
+        self.rows = {}
+        columns = f"SELECT {directory.DIRECTORY_COLUMNS} FROM alumni"
+        database.on("SELECT NOW()", lambda cursor, params: [(self.now,)])
+        database.on(columns + " ORDER BY id", lambda cursor, params: [row for _, (row, _) in sorted(self.rows.items())])
+        database.on(columns + " WHERE updated_at >= %s OR id > %s", self.changed_since)
+        database.on("SELECT COUNT(*) FROM alumni", lambda cursor, params: [(len(self.rows),)])
+        database.on("SELECT id FROM alumni", lambda cursor, params: [(alumnus_id,) for alumnus_id in self.rows])
+
+    def write(self, alumnus_id, first_name, last_name, email, graduation_year=None, current_job=None):
+        self.rows[alumnus_id] = ((alumnus_id, first_name, last_name, email, graduation_year, current_job), self.now)
+
+    def changed_since(self, cursor, params):
+        since, max_id = params
+        return [row for alumnus_id, (row, updated_at) in self.rows.items() if updated_at >= since or alumnus_id > max_id]
+
+@pytest.fixture
+def table(fake_db):
+    return AlumniTable(fake_db)
+
+def test_refresh_sees_updates_when_the_database_clock_is_behind(table):
+    table.write(1, "Ada", "Lovelace", "ada@example.org", "1835", "Analyst")
+    alumni = directory.AlumniDirectory()
+    alumni.load()
+
+    table.now += timedelta(seconds=10)
+    table.write(1, "Ada", "Lovelace", "ada@example.org", "1835", "Engineer")
+    alumni.refresh()
+
+    assert alumni.get_by_email("ada@example.org").current_job == "Engineer"
+
+def test_refresh_adds_new_rows_and_drops_deleted_ones(table):
+    table.write(1, "Ada", "Lovelace", "ada@example.org")
+    table.write(2, "Alan", "Turing", "alan@example.org")
+    alumni = directory.AlumniDirectory()
+    alumni.load()
+
+    table.write(3, "Grace", "Hopper", "grace@example.org")
+    table.rows.pop(1)
+    alumni.refresh()
+
+    assert [record.email for record in alumni.records()] == ["alan@example.org", "grace@example.org"]
+    assert alumni.get(1) is None
+
+def test_records_follow_their_alumnus_when_rows_move(table):
+    for alumnus_id, name in enumerate(("Ada", "Alan", "Grace"), start=1):
+        table.write(alumnus_id, name, "X", f"{name.lower()}@example.org")
+    alumni = directory.AlumniDirectory()
+    alumni.load()
+    grace = alumni.get(3)
+
+    del table.rows[1]
+    table.now += timedelta(seconds=10)
+    alumni.refresh()
+    alumni._compact()
+    assert (grace.first_name, grace.email) == ("Grace", "grace@example.org")
+
+    table.write(4, "Edsger", "Dijkstra", "edsger@example.org")
+    del table.rows[2]
+    alumni.load()
+    assert tuple(grace) == (3, "Grace", "X", "grace@example.org", None, None)
+    del table.rows[3]
+    alumni.load()
+    with pytest.raises(LookupError):
+        grace.first_name
@@ -0,0 +1,47 @@
+"""Tests for closing job postings."""
+import pytest
+
+from alumni import cache, jobs
+
+@pytest.fixture
+def postings(fake_db):
+    """job_postings with posting 5 (active, by ada@example.org) and posting 6 (already filled)."""
+    postings = {
+        5: {"email": "ada@example.org", "title": "Data Engineer", "description": "Pipelines", "status": "active"},
+        6: {"email": "ada@example.org", "title": "Analyst", "description": "Reports", "status": "filled"},
+    }
+
+    def select(cursor, params):
+        email, job_id = params if len(params) == 2 else (None, params[0])
+        posting = postings.get(job_id)
+        matches = posting is not None and posting["status"] == "active" and email in (None, posting["email"])
+        return [(posting["title"], posting["description"])] if matches else []
+
+    def update(cursor, params):
+        postings[params[1]]["status"] = params[0]
+        return 1
+
+    fake_db.on("SELECT job_postings.title, job_postings.description FROM job_postings", select)
+    fake_db.on("UPDATE job_postings SET status = %s WHERE job_id = %s", update)
+    return postings
+
+def test_poster_can_mark_a_posting_filled(postings):
+    query_cache = cache.get_query_cache()
+    query_cache.get_or_compute(("jobs", "engineer", None, 0), lambda: ["stale"], tags=("jobs:engineer",))
+
+    assert jobs.close_job_posting(5, "filled", user_email="ada@example.org")
+    assert postings[5]["status"] == "filled"
+    # The cached search listing the posting is dropped
+    assert query_cache.get_or_compute(("jobs", "engineer", None, 0), lambda: [], tags=()) == []
+
+def test_only_the_poster_or_an_admin_can_close_a_posting(postings):
+    assert not jobs.close_job_posting(5, user_email="mallory@example.org")
+    assert postings[5]["status"] == "active"
+    assert jobs.close_job_posting(5)
+    assert postings[5]["status"] == "closed"
+
+def test_closed_postings_and_unknown_statuses_are_refused(postings):
+    assert not jobs.close_job_posting(6)
+    assert postings[6]["status"] == "filled"
+    assert not jobs.close_job_posting(5, "expired")
+    assert postings[5]["status"] == "active"
@@ -0,0 +1,81 @@
+"""Tests for the landing views: dirty tracking, versions and ETags."""
+import time
+
+import pytest
+
+from alumni import landing
+from alumni.changes import mark_data_changed
+
+class LandingTables:
+    """The rows each landing view query returns, on a FakeDatabase."""
+
+    def __init__(self, database):
+        self.postings = [(3, "Data Analyst", "Acme", "Remote")]
+        self.featured = [("Ada", "Lovelace", "Analyst", 2)]
+        self.events = [(7, "Reunion", "2026-11-01")]
+        self.achievements = [("Ada", "Lovelace", "Award", "2026-10-01")]
+        self.failing = False
+        database.on("SELECT job_id, title, COALESCE(company", lambda cursor, params: list(self.postings))
+        database.on("SELECT alumni.first_name, alumni.last_name", lambda cursor, params: list(self.featured))
+        database.on("SELECT event_id, event_name, event_date FROM events", self.upcoming_events)
+        database.on("SELECT COALESCE(alumni.first_name, '')", lambda cursor, params: list(self.achievements))
+
+    def upcoming_events(self, cursor, params):
+        if self.failing:
+            raise RuntimeError("Lost connection to MySQL server")
+        return list(self.events)
+
+@pytest.fixture
+def tables(fake_db):
+    return LandingTables(fake_db)
+
+def test_an_unchanged_page_is_served_from_memory_by_etag(tables, fake_db):
+    page = landing.LandingPage()
+    first = page.snapshot()
+    assert (first["version"], [view["name"] for view in first["views"]]) == (1, list(landing.LANDING_VIEWS))
+    assert first["views"][2]["rows"] == [[7, "Reunion", "2026-11-01"]]
+    statements = len(fake_db.statements)
+
+    assert page.snapshot(first["etag"]) == {"version": 1, "etag": first["etag"], "views": None}
+    assert page.snapshot()["views"] == first["views"]
+    assert len(fake_db.statements) == statements
+
+def test_writes_mark_only_the_views_reading_the_table(tables, monkeypatch):
+    page = landing.LandingPage()
+    page.snapshot()
+    monkeypatch.setattr(landing, "_landing_page", page)
+    mark_data_changed("events")
+    assert page.due_views() == ["upcoming_events"]
+    mark_data_changed("alumni_achievements")
+    assert page.due_views() == ["featured_alumni", "upcoming_events", "recent_achievements"]
+    page.rebuild()
+    assert page.due_views() == []
+    later = time.monotonic() + landing.LANDING_REFRESH_SECONDS
+    assert page.due_views(now=later) == list(landing.LANDING_VIEWS)
+
+def test_version_and_etag_change_only_with_the_content(tables):
+    page = landing.LandingPage()
+    first = page.snapshot()
+    page.mark_dirty(["events"])
+    assert page.rebuild() == ["upcoming_events"]
+    assert (page.version, page.etag) == (1, first["etag"])
+
+    tables.events.append((8, "Career Fair", "2026-12-01"))
+    page.mark_dirty(["events"])
+    page.rebuild()
+    second = page.snapshot(first["etag"])
+    assert second["version"] == 2 and second["etag"] != first["etag"]
+    assert second["views"][2]["rows"][1] == [8, "Career Fair", "2026-12-01"]
+
+def test_views_that_fail_to_build_stay_dirty(tables):
+    page = landing.LandingPage()
+    first = page.snapshot()
+    tables.failing = True
+    tables.postings.insert(0, (4, "Nurse", "Clinic", "Leeds"))
+    page.mark_dirty(["job_postings", "events"])
+    with pytest.raises(RuntimeError):
+        page.rebuild()
+    # The views built before the failure are still published
+    assert page.due_views() == ["upcoming_events"]
+    assert page.snapshot()["views"][0]["rows"][0] == [4, "Nurse", "Clinic", "Leeds"]
+    assert page.version == first["version"] + 1
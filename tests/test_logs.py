@@ -0,0 +1,51 @@
+"""Tests for log sampling, the logging setup and its benchmark."""
+import json
+import logging
+
+from alumni import logs
+from alumni.logs import SamplingFilter
+
+def make_record(level, msg="Retrying %s"):
+    return logging.LogRecord("alumni", level, __file__, 1, msg, ("x",), None)
+
+def passed(sampling, level, count):
+    return sum(sampling.filter(make_record(level)) for _ in range(count))
+
+def test_repeated_warnings_are_sampled():
+    sampling = SamplingFilter(burst=5, every=10)
+    assert passed(sampling, logging.WARNING, 105) == 5 + 10
+
+def test_info_and_errors_are_never_sampled():
+    sampling = SamplingFilter(burst=5, every=10)
+    assert passed(sampling, logging.INFO, 200) == 200
+    assert passed(sampling, logging.ERROR, 200) == 200
+
+def test_passed_record_carries_the_suppressed_count():
+    sampling = SamplingFilter(burst=1, every=3)
+    records = [make_record(logging.WARNING) for _ in range(4)]
+    kept = [record for record in records if sampling.filter(record)]
+    assert [record.suppressed for record in kept] == [0, 2]
+
+def test_configuring_logging_again_registers_one_exit_hook(tmp_path, monkeypatch):
+    registered = []
+    monkeypatch.setattr(logs.atexit, "register", registered.append)
+    monkeypatch.setattr(logs, "_stop_registered", False)
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    try:
+        logs.configure_logging(str(tmp_path / "first.log"))
+        logs.configure_logging(str(tmp_path / "second.log"))
+        logging.getLogger("alumni").info("Configured twice")
+        logs.stop_logging()
+    finally:
+        root.handlers[:] = handlers
+        root.setLevel(level)
+    assert registered == [logs.stop_logging]
+    entry = json.loads((tmp_path / "second.log").read_text(encoding="utf-8"))
+    assert entry["message"] == "Configured twice"
+
+def test_benchmark_prints_the_cost_per_call(capsys):
+    logs.main(["--calls", "50"])
+    results = json.loads(capsys.readouterr().out)
+    assert set(results) == {"synchronous_file", "queued", "discarded"}
+    assert all(micros >= 0 for micros in results.values())
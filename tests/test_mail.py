@@ -0,0 +1,71 @@
+"""Tests for bulk email delivery."""
+import smtplib
+
+import pytest
+
+from alumni import mail
+
+CONFIG = ("smtp.example.org", 587, "noreply@example.org", "secret")
+
+class FakeSMTP:
+    """SMTP client double; ``refuse`` makes login fail, ``drop_after`` disconnects after that many sends."""
+
+    connections = 0
+    refuse = False
+    drop_after = None
+
+    def __init__(self, host, port):
+        type(self).connections += 1
+        self.sent = 0
+
+    def starttls(self):
+        pass
+
+    def login(self, user, password):
+        if self.refuse:
+            raise smtplib.SMTPAuthenticationError(535, b"5.7.8 Authentication credentials invalid")
+
+    def sendmail(self, sender, recipients, message):
+        if self.drop_after is not None and self.sent >= self.drop_after:
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        self.sent += 1
+        delivered.extend(recipients)
+
+    def quit(self):
+        pass
+
+delivered = []
+
+@pytest.fixture
+def smtp(monkeypatch):
+    delivered.clear()
+    monkeypatch.setattr(smtplib, "SMTP", FakeSMTP)
+    monkeypatch.setattr(FakeSMTP, "connections", 0)
+    monkeypatch.setattr(FakeSMTP, "refuse", False)
+    monkeypatch.setattr(FakeSMTP, "drop_after", None)
+    return FakeSMTP
+
+def messages(count):
+    return [(f"user{i}@example.org", b"Subject: hi\r\n\r\nhello") for i in range(count)]
+
+def test_refused_login_stops_the_whole_send(smtp):
+    smtp.refuse = True
+    assert mail.send_bulk(iter(messages(25)), CONFIG, batch_size=10) == (0, 25)
+    assert smtp.connections == 1
+
+@pytest.mark.parametrize("parallel", [1, 3])
+def test_unreachable_server_is_tried_once_per_send(smtp, monkeypatch, parallel):
+    def unreachable(host, port):
+        smtp.connections += 1
+        raise ConnectionRefusedError(111, "Connection refused")
+    monkeypatch.setattr(smtplib, "SMTP", unreachable)
+    sent, failed = mail.send_bulk(iter(messages(40)), CONFIG, parallel=parallel, batch_size=10)
+    assert (sent, failed) == (0, 40)
+    # Batches already in flight may each try once; later ones are not started
+    assert smtp.connections <= parallel
+
+def test_dropped_connection_is_reopened(smtp):
+    smtp.drop_after = 3
+    assert mail.send_bulk(iter(messages(7)), CONFIG, batch_size=10) == (7, 0)
+    assert smtp.connections == 3
+    assert len(delivered) == 7
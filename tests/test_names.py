@@ -0,0 +1,65 @@
+"""Tests for the incremental refresh of the name index."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from alumni import names
+
+class AlumniTable:
+    """The alumni table on a FakeDatabase, with a database clock that updated_at is stamped from."""
+
+    def __init__(self, database):
+        self.now = datetime(2026, 1, 1, 12, 0, 0)
+        self.rows = {}
+        database.on("SELECT NOW()", lambda cursor, params: [(self.now,)])
+        database.on("SELECT id, first_name, last_name FROM alumni",
+                    lambda cursor, params: [(alumnus_id, first, last) for alumnus_id, (first, last, _) in self.rows.items()])
+        database.on("SELECT id, first_name, last_name FROM alumni WHERE updated_at >= %s OR id > %s", self.changed_since)
+        database.on("SELECT COUNT(*) FROM alumni", lambda cursor, params: [(len(self.rows),)])
+        database.on("SELECT id FROM alumni", lambda cursor, params: [(alumnus_id,) for alumnus_id in self.rows])
+
+    def write(self, alumnus_id, first_name, last_name):
+        self.rows[alumnus_id] = (first_name, last_name, self.now)
+
+    def changed_since(self, cursor, params):
+        since, max_id = params
+        return [(alumnus_id, first, last) for alumnus_id, (first, last, updated_at) in self.rows.items()
+                if updated_at >= since or alumnus_id > max_id]
+
+@pytest.fixture
+def table(fake_db):
+    return AlumniTable(fake_db)
+
+def matched_ids(index, query):
+    return [alumnus_id for alumnus_id, _ in index.search(query)]
+
+def test_refresh_picks_up_rows_written_by_other_processes(table):
+    table.write(1, "Ada", "Lovelace")
+    table.write(2, "Alan", "Turing")
+    index = names.NameIndex()
+    index.load()
+    assert matched_ids(index, "Lovelase") == [1]
+
+    # Written elsewhere: a new alumnus, a rename and a deletion
+    table.now += timedelta(seconds=30)
+    table.write(3, "Grace", "Hopper")
+    table.write(2, "Alan", "Kay")
+    table.rows.pop(1)
+    index.refresh()
+
+    assert matched_ids(index, "Hoper") == [3]
+    assert matched_ids(index, "Alan Kay") == [2]
+    assert matched_ids(index, "Turing") == []
+    assert matched_ids(index, "Lovelace") == []
+    assert len(index) == 2
+
+def test_refresh_if_stale_reloads_after_the_refresh_interval(table):
+    table.write(1, "Ada", "Lovelace")
+    index = names.NameIndex(refresh_seconds=0)
+    index.refresh_if_stale()
+    assert index.loaded and len(index) == 1
+
+    table.now += timedelta(seconds=5)
+    table.write(7, "Katherine", "Johnson")
+    index.refresh_if_stale()
+    assert matched_ids(index, "Katherin Jonson") == [7]
@@ -0,0 +1,144 @@
+"""Concurrency tests for the transactional profile writes."""
+import random
+import threading
+
+import mysql.connector
+import pytest
+
+from alumni import cache, db, profile, skills
+
+class SkillStore:
+    """
+    The skills and alumni_skills tables on a FakeDatabase.
+
+    It enforces the unique keys of db.sql, holds the alumnus row lock taken by
+    SELECT ... FOR UPDATE until commit or rollback, and fails a share of the
+    statements with a deadlock so the retry path runs.
+    """
+
+    def __init__(self, database, emails, deadlock_rate=0.1, seed=0):
+        self.alumni = {email: alumnus_id for alumnus_id, email in enumerate(emails, start=1)}
+        self.row_locks = {email: threading.Lock() for email in emails}
+        self.skills = {}
+        self.links = []
+        self.deadlocks = 0
+        self.deadlock_rate = deadlock_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        database.on("SELECT id FROM alumni WHERE email = %s FOR UPDATE", self.lock_alumnus)
+        database.on("INSERT INTO skills", self.insert_skill)
+        # Links must be idempotent upserts; a plain INSERT is an unexpected statement
+        database.on("INSERT INTO alumni_skills (alumnus_id, skill_id) VALUES (%s, %s) ON DUPLICATE KEY", self.insert_link)
+        database.on_commit = self.release
+        database.on_rollback = self.undo
+        database.on_close = lambda connection: self.undo(connection) if connection.state.get("locked") else None
+
+    def maybe_deadlock(self):
+        with self._lock:
+            fail = self._random.random() < self.deadlock_rate
+            if fail:
+                self.deadlocks += 1
+        if fail:
+            raise mysql.connector.Error(msg="Deadlock found when trying to get lock", errno=1213)
+
+    def lock_alumnus(self, cursor, params):
+        email, locked = params[0], cursor.connection.state.setdefault("locked", [])
+        if email in self.row_locks and email not in locked:
+            self.row_locks[email].acquire()
+            locked.append(email)
+        return [(self.alumni[email],)] if email in self.alumni else []
+
+    def insert_skill(self, cursor, params):
+        self.maybe_deadlock()
+        with self._lock:
+            if params[0] not in self.skills:
+                self.skills[params[0]] = len(self.skills) + 1
+                cursor.connection.state.setdefault("undo", []).append(lambda name=params[0]: self.skills.pop(name))
+            cursor.lastrowid = self.skills[params[0]]
+        return 1
+
+    def insert_link(self, cursor, params):
+        self.maybe_deadlock()
+        with self._lock:
+            if params not in self.links:
+                self.links.append(params)
+                cursor.connection.state.setdefault("undo", []).append(lambda link=params: self.links.remove(link))
+        return 1
+
+    def release(self, connection):
+        for email in connection.state.pop("locked", []):
+            self.row_locks[email].release()
+        connection.state.pop("undo", None)
+
+    def undo(self, connection):
+        with self._lock:
+            for undo in reversed(connection.state.get("undo", [])):
+                undo()
+        self.release(connection)
+
+@pytest.fixture
+def store(fake_db, monkeypatch):
+    store = SkillStore(fake_db, ["ada@example.org", "alan@example.org"])
+    monkeypatch.setattr(skills, "skill_aliases", lambda: dict(skills.SEED_SKILL_ALIASES))
+    # Keep retries fast but let them contend
+    real_run = db.run_in_transaction
+    monkeypatch.setattr(profile, "run_in_transaction",
+                        lambda work, *args: real_run(work, *args, retries=20, backoff=0.0005))
+    return store
+
+def test_concurrent_skill_upserts_leave_one_link_per_skill(store, capsys):
+    names = ["Python", "python3", "SQL", "Docker", "Go"]
+    workers, rounds = 8, 25
+
+    def worker(worker_id):
+        for i in range(rounds):
+            email = "ada@example.org" if (worker_id + i) % 2 else "alan@example.org"
+            profile.add_skill_to_profile(email, names[(worker_id + i) % len(names)])
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert store.deadlocks > 0
+    assert "error occurred" not in capsys.readouterr().out
+    # "Python" and "python3" are one skill
+    assert sorted(store.skills) == ["docker", "go", "python", "sql"]
+    assert len(store.links) == len(set(store.links)) == 2 * len(store.skills)
+
+@pytest.fixture
+def alumnus(fake_db):
+    """One alumnus (ID 7, skills Python and SQL) for profile updates."""
+    row = {"email": "ada@example.org", "current_job": "Analyst"}
+
+    @fake_db.on("UPDATE alumni SET")
+    def update(cursor, params):
+        if params[-1] != row["email"]:
+            return 0
+        row["current_job"] = params[0]
+        return 1
+
+    fake_db.on("SELECT id, first_name, last_name FROM alumni WHERE email = %s",
+               lambda cursor, params: [(7, "Ada", "Lovelace")] if params[0] == row["email"] else [])
+    fake_db.on("SELECT skills.skill_name FROM alumni_skills",
+               lambda cursor, params: [("python",), ("sql",)] if params[0] == 7 else [])
+    fake_db.on("SELECT EXISTS", lambda cursor, params: [(0,)])
+    return row
+
+def test_profile_update_invalidates_cached_skill_searches(alumnus, monkeypatch, capsys):
+    row = alumnus
+    answers = iter(["", "", "", "Engineer"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    query_cache = cache.get_query_cache()
+    for skill in ("python", "sql", "go"):
+        query_cache.get_or_compute(("skill", skill, None, 0), lambda: [(7, "Ada", row["current_job"])], tags=(cache.skill_tag(skill),))
+
+    profile.update_alumnus_profile("ada@example.org")
+
+    assert "Profile updated successfully." in capsys.readouterr().out
+    fresh = [(7, "Ada", row["current_job"])]
+    assert query_cache.get_or_compute(("skill", "python", None, 0), lambda: fresh, tags=()) == [(7, "Ada", "Engineer")]
+    assert query_cache.get_or_compute(("skill", "sql", None, 0), lambda: fresh, tags=()) == [(7, "Ada", "Engineer")]
+    # Searches for skills the alumnus does not list are kept
+    assert query_cache.get_or_compute(("skill", "go", None, 0), lambda: fresh, tags=()) == [(7, "Ada", "Analyst")]
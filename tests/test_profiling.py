@@ -0,0 +1,91 @@
+"""Tests for profiling runs: phase timings and the files a run writes."""
+import json
+import threading
+import time
+
+import pytest
+
+from alumni import profiling
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "profiles"
+    monkeypatch.setenv("ALUMNI_PROFILE_DIR", str(directory))
+    monkeypatch.setenv("ALUMNI_PROFILE_INTERVAL", "0.002")
+    return directory
+
+def busy(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+def test_self_time_excludes_nested_phases(profile_dir):
+    with profiling.profile_run("nesting", "sample") as run:
+        with profiling.phase("outer"):
+            busy(0.02)
+            with profiling.phase("inner"):
+                busy(0.03)
+            with profiling.phase("inner"):
+                assert run.current_phase(threading.get_ident()) == "inner"
+    outer_calls, outer_total, outer_self = run.phases["outer"]
+    inner_calls, inner_total, inner_self = run.phases["inner"]
+    assert (outer_calls, inner_calls) == (1, 2)
+    assert inner_self == inner_total
+    assert outer_self == pytest.approx(outer_total - inner_total)
+    assert outer_self >= 0.02 and inner_total >= 0.03
+
+def test_phase_stacks_belong_to_the_run_and_are_cleared(profile_dir):
+    entered, release = threading.Event(), threading.Event()
+
+    def worker():
+        with profiling.phase("mail.smtp"):
+            entered.set()
+            release.wait(5)
+
+    with profiling.profile_run("threads", "sample") as run:
+        thread = threading.Thread(target=worker)
+        thread.start()
+        entered.wait(5)
+        assert run.current_phase(thread.ident) == "mail.smtp"
+        with profiling.phase("db.query"):
+            pass
+        # A finished thread leaves nothing behind
+        assert threading.get_ident() not in run.phase_stacks
+    # The worker's phase is still open when the run stops
+    assert run.phase_stacks == {}
+    release.set()
+    thread.join(5)
+    assert run.phases["mail.smtp"][0] == 1
+    assert profiling.phase("db.query") is profiling._NO_PHASE
+
+def test_run_writes_stacks_summary_and_history(profile_dir):
+    with profiling.profile_run("report cli", "sample") as run:
+        with profiling.phase("db.query"):
+            busy(0.1)
+
+    stacks = list(profile_dir.glob("*-report_cli.folded"))
+    assert len(stacks) == 1
+    lines = stacks[0].read_text(encoding="utf-8").splitlines()
+    assert lines
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0
+        assert stack.split(";")[0] and len(stack.split(";")) > 1
+    assert any("test_profiling.py:busy" in line for line in lines)
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == run.samples
+
+    summary = (profile_dir / stacks[0].name.replace(".folded", ".txt")).read_text(encoding="utf-8")
+    assert summary.startswith("Profile of report cli (sample mode), started ")
+    assert "Phases (self time excludes nested phases" in summary
+    assert any(line.split()[:2] == ["db.query", "1"] for line in summary.splitlines())
+    assert f"Top functions over {run.samples} samples every 2ms:" in summary
+
+    with profiling.profile_run("report cli", "sample"):
+        pass
+    history = [json.loads(line) for line in (profile_dir / "history.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert len(history) == 2
+    entry = history[0]
+    assert (entry["label"], entry["mode"]) == ("report cli", "sample")
+    assert entry["phases"]["db.query"]["calls"] == 1
+    assert entry["phases"]["db.query"]["seconds"] >= 0.1
+    assert entry["files"] == {"summary": str(stacks[0].with_suffix(".txt")), "stacks": str(stacks[0])}
@@ -0,0 +1,123 @@
+"""Tests for the message buffer and message delivery checks."""
+import threading
+import types
+
+import mysql.connector
+import pytest
+
+from alumni import community, ratelimit
+
+class MessageTables:
+    """alumni_messages (with its foreign keys) and message_dead_letters on a FakeDatabase."""
+
+    def __init__(self, database, alumni):
+        self.alumni = set(alumni)
+        self.messages = []
+        self.dead_letters = []
+        self.batch_sizes = []
+        self._lock = threading.Lock()
+        database.on("INSERT INTO alumni_messages", self.insert_messages, many=True)
+        database.on("INSERT INTO message_dead_letters", lambda cursor, rows: self.dead_letters.extend(rows), many=True)
+
+    def insert_messages(self, cursor, rows):
+        with self._lock:
+            for sender_email, receiver_email, _ in rows:
+                if sender_email not in self.alumni or receiver_email not in self.alumni:
+                    raise mysql.connector.Error(msg="Cannot add or update a child row: a foreign key constraint fails",
+                                                errno=1452)
+            self.messages.extend(rows)
+            self.batch_sizes.append(len(rows))
+        return len(rows)
+
+@pytest.fixture
+def tables(fake_db):
+    return MessageTables(fake_db, ["ada@example.org", "alan@example.org", "grace@example.org"])
+
+def test_quiet_traffic_writes_through(tables):
+    buffer = ratelimit.MessageBuffer(coalesce_above=5)
+    assert buffer.submit("ada@example.org", "alan@example.org", "hello")
+    assert tables.messages == [("ada@example.org", "alan@example.org", "hello")]
+    assert buffer.stats()["written"] == 1
+
+def test_failed_rows_of_a_batch_are_dead_lettered(tables):
+    buffer = ratelimit.MessageBuffer(batch_size=50, flush_seconds=0.05, coalesce_above=0)
+    for i in range(20):
+        receiver = "nobody@example.org" if i == 7 else "alan@example.org"
+        assert buffer.submit("ada@example.org", receiver, f"message {i}")
+    assert buffer.flush(timeout=5)
+    buffer.close(timeout=1)
+
+    assert len(tables.messages) == 19
+    assert [row[:3] for row in tables.dead_letters] == [("ada@example.org", "nobody@example.org", "message 7")]
+    assert "foreign key" in tables.dead_letters[0][3]
+    stats = buffer.stats()
+    assert (stats["written"], stats["failed"], stats["dead_lettered"]) == (19, 1, 1)
+
+def test_heavy_traffic_is_batched(tables):
+    buffer = ratelimit.MessageBuffer(batch_size=25, flush_seconds=0.05, coalesce_above=0)
+    for i in range(100):
+        buffer.submit("grace@example.org", "ada@example.org", f"message {i}")
+    assert buffer.flush(timeout=5)
+    buffer.close(timeout=1)
+    assert len(tables.messages) == 100
+    assert max(tables.batch_sizes) > 1
+
+def test_messages_to_unknown_alumni_are_refused_up_front(monkeypatch):
+    submitted = []
+
+    class Limiter:
+        def acquire(self, *checks):
+            return 0.0
+
+    class Buffer:
+        def submit(self, *row):
+            submitted.append(row)
+            return True
+
+    monkeypatch.setattr(community, "get_rate_limiter", Limiter)
+    monkeypatch.setattr(community, "get_message_buffer", Buffer)
+    monkeypatch.setattr(community, "alumni_exist", lambda *emails: "nobody@example.org" not in emails)
+
+    assert community.deliver_message("ada@example.org", "nobody@example.org", "hi") == "unknown_alumnus"
+    assert community.deliver_message("ada@example.org", "alan@example.org", "hi") == "sent"
+    assert submitted == [("ada@example.org", "alan@example.org", "hi")]
+
+class BucketTable:
+    """rate_limit_buckets on a FakeDatabase."""
+
+    def __init__(self, database):
+        self.rows = {}
+        database.on("INSERT INTO rate_limit_buckets", self.upsert)
+        database.on("DELETE FROM rate_limit_buckets", lambda cursor, row: int(self.rows.pop(row, None) is not None))
+        database.on("SELECT scope, bucket_key, tokens, updated_at FROM rate_limit_buckets",
+                    lambda cursor, params: [(*scope_key, *row) for scope_key, row in self.rows.items()])
+
+    def upsert(self, cursor, row):
+        scope, key, tokens, updated = row
+        self.rows[(scope, key)] = (tokens, updated)
+        return 1
+
+def test_saved_buckets_are_dropped_once_they_refill(fake_db, monkeypatch):
+    clock = types.SimpleNamespace(time=lambda: now)
+    monkeypatch.setattr(ratelimit, "time", clock)
+    table = BucketTable(fake_db)
+    now = 1000.0
+    limiter = ratelimit.RateLimiter({"message_sender": (3, 1.0)})
+    assert limiter.acquire(("message_sender", "ada@example.org"), cost=2) == 0.0
+    assert limiter.persist() == 1
+    assert table.rows == {("message_sender", "ada@example.org"): (1, 1000.0)}
+
+    # Not touched again, but still refilling: nothing to write yet
+    now += 1
+    assert limiter.persist() == 0
+    now += 1
+    assert limiter.persist() == 1
+    assert (table.rows, limiter._buckets) == ({}, {})
+
+    # Buckets restored from the table are swept the same way
+    table.rows[("message_sender", "alan@example.org")] = (0, now)
+    restored = ratelimit.RateLimiter({"message_sender": (3, 1.0)})
+    restored.load()
+    now += 3
+    assert restored.persist() == 1
+    assert (table.rows, restored._buckets) == ({}, {})
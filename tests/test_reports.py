@@ -0,0 +1,91 @@
+"""Tests for versioned report snapshots and their refresh."""
+import json
+
+import pytest
+
+from alumni import reports
+from alumni.changes import mark_data_changed
+
+class SnapshotTables:
+    """alumni graduation years and report_snapshots on a FakeDatabase."""
+
+    def __init__(self, database):
+        self.years = {"2015": 2}
+        self.snapshots = {}
+        database.on("SELECT graduation_year, COUNT(*) FROM alumni",
+                    lambda cursor, params: sorted(self.years.items()))
+        database.on("SELECT COALESCE(MAX(version), 0) FROM report_snapshots",
+                    lambda cursor, params: [(max((version for name, version in self.snapshots if name == params[0]), default=0),)])
+        database.on("INSERT INTO report_snapshots", self.insert)
+        database.on("DELETE FROM report_snapshots WHERE report_name = %s AND version <= %s", self.prune)
+        database.on("SELECT payload FROM report_snapshots", self.latest)
+
+    def insert(self, cursor, params):
+        name, version, _, payload = params
+        self.snapshots[(name, version)] = payload
+        return 1
+
+    def prune(self, cursor, params):
+        old = [key for key in self.snapshots if key[0] == params[0] and key[1] <= params[1]]
+        for key in old:
+            del self.snapshots[key]
+        return len(old)
+
+    def latest(self, cursor, params):
+        versions = sorted(version for name, version in self.snapshots if name == params[0])
+        return [(self.snapshots[(params[0], versions[-1])],)] if versions else []
+
+@pytest.fixture
+def tables(fake_db, monkeypatch):
+    monkeypatch.setattr(reports, "_report_snapshots", {})
+    monkeypatch.setattr(reports, "report_scheduler", None)
+    return SnapshotTables(fake_db)
+
+def total_alumni(snapshot):
+    return snapshot["data"]["summary"]["Total Alumni"]
+
+def test_every_refresh_stores_a_new_version_and_keeps_a_bounded_history(tables, monkeypatch):
+    monkeypatch.setattr(reports, "REPORT_SNAPSHOT_HISTORY", 3)
+    for expected in range(1, 6):
+        assert reports.refresh_report("alumni_statistics")["version"] == expected
+    assert sorted(version for _, version in tables.snapshots) == [3, 4, 5]
+    stored = json.loads(tables.snapshots[("alumni_statistics", 5)])
+    assert (stored["version"], total_alumni(stored)) == (5, 2)
+
+def test_fresh_snapshots_are_served_without_recomputing(tables):
+    first = reports.get_report("alumni_statistics")
+    tables.years["2016"] = 3
+    assert reports.get_report("alumni_statistics") is first
+
+def test_stale_snapshots_are_refreshed_without_the_scheduler(tables):
+    first = reports.get_report("alumni_statistics")
+    tables.years["2016"] = 3
+    first["stale_at"] = 0
+    snapshot = reports.get_report("alumni_statistics")
+    assert (snapshot["version"], total_alumni(snapshot)) == (2, 5)
+
+def test_writes_to_a_report_table_make_its_snapshot_stale(tables):
+    reports.get_report("alumni_statistics")
+    tables.years["2016"] = 3
+    mark_data_changed("alumni")
+    assert total_alumni(reports.get_report("alumni_statistics")) == 5
+    # Other tables leave it alone
+    mark_data_changed("job_postings")
+    assert reports.get_report("alumni_statistics")["version"] == 2
+
+def test_a_snapshot_stored_by_another_process_is_loaded_then_refreshed_when_stale(tables, monkeypatch):
+    reports.refresh_report("alumni_statistics")
+    monkeypatch.setattr(reports, "_report_snapshots", {})
+    assert reports.get_report("alumni_statistics")["version"] == 1
+
+    stored = json.loads(tables.snapshots[("alumni_statistics", 1)])
+    stored["stale_at"] = 0
+    tables.snapshots[("alumni_statistics", 1)] = json.dumps(stored)
+    monkeypatch.setattr(reports, "_report_snapshots", {})
+    assert reports.get_report("alumni_statistics")["version"] == 2
+
+def test_the_scheduler_serves_stale_snapshots_while_it_refreshes(tables, monkeypatch):
+    first = reports.get_report("alumni_statistics")
+    first["stale_at"] = 0
+    monkeypatch.setattr(reports, "report_scheduler", object())
+    assert reports.get_report("alumni_statistics") is first
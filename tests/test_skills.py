@@ -0,0 +1,44 @@
+"""Tests for skill name normalization."""
+import pytest
+
+from alumni import skills
+
+ALIASES = dict(skills.SEED_SKILL_ALIASES)
+
+@pytest.mark.parametrize("name, canonical", [
+    ("Python 3.11", "python"),
+    ("python3", "python"),
+    (" PYTHON. ", "python"),
+    ("python v3", "python"),
+    ("node 18.2", "node"),
+    ("Node.js 20", "node.js"),
+    ("Java8", "java"),
+])
+def test_release_numbers_of_languages_are_dropped(name, canonical):
+    assert skills.canonicalize_skill(name) == canonical
+
+@pytest.mark.parametrize("name, canonical", [
+    ("IPv4", "ipv4"),
+    ("IPv6", "ipv6"),
+    ("HTML5", "html5"),
+    ("Office 365", "office 365"),
+    ("Windows 10", "windows 10"),
+    ("GPT4", "gpt4"),
+    ("Industry 4.0", "industry 4.0"),
+    ("web3", "web3"),
+    ("ES6", "es6"),
+    ("S3", "s3"),
+])
+def test_digits_that_are_part_of_the_name_are_kept(name, canonical):
+    assert skills.canonicalize_skill(name) == canonical
+
+def test_aliases_apply_after_the_release_number_is_dropped():
+    assert skills.canonical_skill_name("NodeJS", ALIASES) == "node.js"
+    assert skills.canonical_skill_name("Postgres 16", ALIASES) == "postgresql"
+    assert skills.canonical_skill_name("IPv6", ALIASES) == "ipv6"
+
+def test_versioned_spellings_are_merged_but_distinct_skills_are_not():
+    stored = [(1, "Python", 10), (2, "python3", 2), (3, "IPv4", 4), (4, "IPv6", 3), (5, "HTML5", 1), (6, "html", 1)]
+    rekey, renames = skills.plan_skill_merges(stored, ALIASES)
+    assert rekey == {2: 1}
+    assert renames == {1: "python", 3: "ipv4", 4: "ipv6", 5: "html5"}
@@ -0,0 +1,151 @@
+"""Tests for task leases, permanent failures and retried invitation tasks."""
+import threading
+import time
+
+import pytest
+
+from alumni import events, mail, tasks
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    monkeypatch.setattr(tasks, "TASK_HANDLERS", dict(tasks.TASK_HANDLERS))
+    return tasks.TaskQueue(str(tmp_path / "tasks.sqlite3"), max_attempts=3, backoff_seconds=0)
+
+def test_permanent_errors_fail_without_retrying(queue):
+    calls = []
+
+    @tasks.task("test.missing_event")
+    def missing_event():
+        calls.append(1)
+        raise ValueError("Event not found: 42")
+
+    task_id = queue.enqueue("test.missing_event")
+    assert not tasks.run_task(queue, "worker-1", queue.claim("worker-1"))
+    task = queue.get(task_id)
+    assert (task["status"], task["attempts"], len(calls)) == ("failed", 1, 1)
+    assert task["last_error"] == "ValueError: Event not found: 42"
+
+def test_transient_errors_are_retried(queue):
+    @tasks.task("test.flaky")
+    def flaky():
+        raise RuntimeError("SMTP server busy")
+
+    task_id = queue.enqueue("test.flaky")
+    tasks.run_task(queue, "worker-1", queue.claim("worker-1"))
+    assert queue.get(task_id)["status"] == "queued"
+
+def test_long_running_task_keeps_its_lease(queue, monkeypatch):
+    monkeypatch.setattr(tasks, "TASK_LEASE_SECONDS", 0.3)
+    started, release = threading.Event(), threading.Event()
+
+    @tasks.task("test.slow", timeout=30)
+    def slow():
+        started.set()
+        release.wait(5)
+        return "done"
+
+    task_id = queue.enqueue("test.slow")
+    runner = threading.Thread(target=tasks.run_task, args=(queue, "worker-1", queue.claim("worker-1")))
+    runner.start()
+    started.wait(5)
+    # Well past the first lease, the task is still not claimable by another worker
+    time.sleep(1.0)
+    assert queue.claim("worker-2") is None
+    release.set()
+    runner.join(5)
+    task = queue.get(task_id)
+    assert (task["status"], task["attempts"], task["worker"]) == ("done", 1, "worker-1")
+
+def test_overrunning_task_is_claimed_again(queue, monkeypatch):
+    monkeypatch.setattr(tasks, "TASK_LEASE_SECONDS", 0.2)
+    started, release = threading.Event(), threading.Event()
+
+    @tasks.task("test.stuck", timeout=0.3)
+    def stuck():
+        started.set()
+        release.wait(5)
+
+    queue.enqueue("test.stuck")
+    runner = threading.Thread(target=tasks.run_task, args=(queue, "worker-1", queue.claim("worker-1")))
+    runner.start()
+    started.wait(5)
+    time.sleep(0.8)
+    assert queue.claim("worker-2")["attempts"] == 2
+    release.set()
+    runner.join(5)
+
+@pytest.fixture
+def invitations(fake_db, monkeypatch):
+    """alumni, event 7 and event_invitations (keyed by event and invitee, with sent_at) on a FakeDatabase."""
+    alumni = {"ada@example.org": "Ada", "alan@example.org": "Alan", "grace@example.org": "Grace"}
+    invitations = {}
+
+    @fake_db.on("SELECT alumni.email, alumni.first_name")
+    def select(cursor, params):
+        event_id, emails = params[0], params[1:]
+        found = event_id == 7
+        return [(email, first_name, "", event_id if found else None, "Reunion" if found else None,
+                 "2026-11-01" if found else None, "Dinner" if found else None, invitations.get((event_id, email)))
+                for email, first_name in alumni.items() if email in emails]
+
+    @fake_db.on("UPDATE event_invitations SET sent_at = NOW()")
+    def mark_sent(cursor, params):
+        event_id, emails = params[0], params[1:]
+        for email in emails:
+            invitations[(event_id, email)] = "sent"
+        return len(emails)
+
+    @fake_db.on("INSERT IGNORE INTO event_invitations", many=True)
+    def record(cursor, rows):
+        for row in rows:
+            invitations.setdefault(row, None)
+        return len(rows)
+
+    monkeypatch.setattr(mail, "get_email_config", lambda: ("smtp.example.org", 587, "events@example.org", "secret"))
+    return invitations
+
+def fake_send_bulk(outbox, failing=()):
+    def send_bulk(messages, email_config, parallel=1, on_sent=None):
+        sent = failed = 0
+        for recipient, _ in messages:
+            if recipient in failing:
+                failed += 1
+                continue
+            outbox.append(recipient)
+            on_sent(recipient)
+            sent += 1
+        return sent, failed
+    return send_bulk
+
+def test_retried_invitations_only_email_the_invitees_missed(invitations, monkeypatch):
+    emails = ["ada@example.org", "alan@example.org", "grace@example.org", "nobody@example.org"]
+    outbox = []
+    monkeypatch.setattr(mail, "send_bulk", fake_send_bulk(outbox, failing={"grace@example.org"}))
+    stats = events.invite_attendees(7, emails)
+    assert (stats["invited"], stats["unknown"], stats["sent"], stats["failed"]) == (3, 1, 2, 1)
+
+    outbox.clear()
+    monkeypatch.setattr(mail, "send_bulk", fake_send_bulk(outbox))
+    stats = events.invite_attendees(7, emails)
+    assert outbox == ["grace@example.org"]
+    assert (stats["invited"], stats["already_sent"], stats["unknown"], stats["sent"]) == (1, 2, 1, 1)
+    assert sorted(invitations) == [(7, "ada@example.org"), (7, "alan@example.org"), (7, "grace@example.org")]
+
+def test_invitations_to_a_missing_event_are_refused(invitations):
+    with pytest.raises(ValueError, match="Event not found"):
+        events.invite_attendees(8, ["ada@example.org"])
+    assert invitations == {}
+
+def test_invitation_tasks_with_failed_sends_are_retried(queue, invitations, monkeypatch):
+    emails = ["ada@example.org", "alan@example.org", "grace@example.org"]
+    outbox = []
+    monkeypatch.setattr(mail, "send_bulk", fake_send_bulk(outbox, failing={"grace@example.org"}))
+    task_id = queue.enqueue("events.invite", {"event_id": 7, "emails": emails})
+    tasks.run_task(queue, "worker-1", queue.claim("worker-1"))
+    task = queue.get(task_id)
+    assert (task["status"], task["last_error"]) == ("queued", "RuntimeError: Could not send 1 of 3 invitations to event 7")
+
+    outbox.clear()
+    monkeypatch.setattr(mail, "send_bulk", fake_send_bulk(outbox))
+    assert tasks.run_task(queue, "worker-1", queue.claim("worker-1"))
+    assert (queue.get(task_id)["status"], outbox) == ("done", ["grace@example.org"])
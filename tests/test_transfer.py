@@ -0,0 +1,83 @@
+"""Tests for the batch alumni import."""
+import mysql.connector
+import pytest
+
+from alumni import names, transfer
+
+class StrictAlumniTable:
+    """The alumni table on a FakeDatabase, rejecting rows the way MySQL's strict mode does."""
+
+    def __init__(self, database):
+        self.rows = {}
+        self.committed = {}
+        # The statement the import runs, which must leave existing emails unchanged
+        assert "ON DUPLICATE KEY UPDATE" in transfer.IMPORT_INSERT
+        database.on(transfer.IMPORT_INSERT, self.insert_rows, many=True)
+        database.on("SELECT id, first_name, last_name FROM alumni WHERE email IN",
+                    lambda cursor, params: [self.rows[email] for email in params if email in self.rows])
+        database.on_commit = lambda connection: setattr(self, "committed", dict(self.rows))
+        database.on_rollback = lambda connection: setattr(self, "rows", dict(self.committed))
+
+    def insert(self, row):
+        email, first_name, last_name = row[:3]
+        if first_name is None or last_name is None:
+            raise mysql.connector.Error(msg="Column cannot be null", errno=1048)
+        if len(first_name) > 50 or len(last_name) > 50:
+            raise mysql.connector.Error(msg="Data too long for column", errno=1406)
+        if email in self.rows:
+            return 0
+        self.rows[email] = (len(self.rows) + 1, first_name, last_name)
+        return 1
+
+    def insert_rows(self, cursor, rows):
+        if isinstance(rows, tuple):  # execute() of a single row
+            return self.insert(rows)
+        # One multi-row statement: a rejected row fails the whole statement
+        before = dict(self.rows)
+        try:
+            return sum(self.insert(row) for row in rows)
+        except mysql.connector.Error:
+            self.rows = before
+            raise
+
+@pytest.fixture
+def table(fake_db):
+    return StrictAlumniTable(fake_db)
+
+def test_existing_emails_are_counted_as_duplicates(table):
+    table.insert(("ada@example.org", "Ada", "Lovelace"))
+    batch = [("ada@example.org", "Ada", "Lovelace", "1835", None), ("alan@example.org", "Alan", "Turing", "1934", None)]
+    assert transfer.import_batch(batch) == (1, 1, 0)
+
+def test_rows_the_table_rejects_are_counted_as_invalid(table):
+    batch = [
+        ("ada@example.org", "Ada", "Lovelace", "1835", None),
+        ("long@example.org", "x" * 51, "Name", "2001", None),
+        ("null@example.org", "Grace", None, "1928", None),
+        ("alan@example.org", "Alan", "Turing", "1934", None),
+    ]
+    assert transfer.import_batch(batch) == (2, 0, 2)
+    assert sorted(table.committed) == ["ada@example.org", "alan@example.org"]
+
+def test_imported_names_are_indexed_only_once_the_index_is_loaded(table, fake_db, monkeypatch):
+    index = names.NameIndex()
+    monkeypatch.setattr(transfer, "name_index", index)
+    monkeypatch.setattr(names, "name_index", index)
+    transfer.import_batch([("ada@example.org", "Ada", "Lovelace", "1835", None)])
+    assert not any(statement.startswith("SELECT") for statement in fake_db.statements)
+
+    index.loaded = True
+    transfer.import_batch([("alan@example.org", "Alan", "Turing", "1934", None)])
+    assert [alumnus_id for alumnus_id, _ in index.search("Alan Turing")] == [2]
+
+def test_import_stats_include_rejected_rows(table, tmp_path):
+    path = tmp_path / "alumni.csv"
+    path.write_text(
+        "email,first_name,last_name,graduation_year,current_job\n"
+        "ada@example.org,Ada,Lovelace,2015,\n"
+        f"long@example.org,{'x' * 51},Name,2016,\n"
+        "not-an-email,Bad,Row,2016,\n",
+        encoding="utf-8",
+    )
+    stats = transfer.import_alumni_csv(str(path))
+    assert (stats["imported"], stats["invalid"], stats["duplicates"], stats["failed_batches"]) == (1, 2, 0, 0)